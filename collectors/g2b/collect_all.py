@@ -2,8 +2,13 @@
 import os
 import sys
 import time
+import json
+import glob
+import asyncio
+import threading
 import traceback
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 import pytz
 
 # -----------------------------------------------------------
@@ -38,7 +43,24 @@ try:
         upload_progress_json,
         test_drive_connection
     )
-    from utils.g2b_client import G2BClient
+    from utils.g2b_client import G2BClient, FetchSummary, items_to_xml, month_window, INQRY_DIV_CHANGED
+    from utils.g2b_async_client import AsyncG2BClient
+    from utils.transport import get_shared_stats
+    from utils.concurrency import AIMDController
+    from utils.hedging import HedgePolicy
+    from utils.timeouts import AdaptiveTimeout
+    from utils.page_size import PageSizeTuner, parse_sizes, DEFAULT_SIZES
+    from utils.circuit_breaker import CircuitBreaker
+    from utils.response_archive import ResponseArchive
+    from utils.change_feed import ChangeFeed, now_kst, TIMESTAMP_FORMAT, read_items, latest_by_contract
+    from utils.join_index import JoinPipeline, BID, AWARD, CONTRACT
+    from utils.detail_fanout import DetailFanout, parse_rules
+    from utils.operations import get_detail
+    from utils.quota import QuotaLedger, log_quota_usage, today_kst
+    from utils.planner import CollectionPlanner
+    from utils.coverage import CoverageMap
+    from utils.checkpoint import MonthCheckpoint
+    from utils.key_pool import KeyPool, key_id, parse_keys
     from utils.logger import log
     from utils.slack import send_slack_message
     from utils.auth import get_drive_service
@@ -53,7 +75,87 @@ except ImportError as e:
 PROGRESS_FILE_ID = "1_AKg04eOjQy3KBcjhp2xkkm1jzBcAjn-"
 SHARED_DRIVE_ID = "0AOi7Y50vK8xiUk9PVA"
 API_KEY = os.getenv("API_KEY")
-MAX_API_CALLS = 500
+# 추가 서비스키 (쉼표/줄바꿈 구분) - API_KEY와 합쳐 키마다 따로 일일 한도 적용
+API_KEYS = parse_keys(API_KEY, os.getenv("G2B_API_KEYS"))
+# 키 분배 방식 (round_robin/least_used)
+KEY_STRATEGY = os.getenv("G2B_KEY_STRATEGY", "round_robin")
+# 키당 일일 API 호출 한도 (전체 한도는 키 수만큼 늘어남)
+MAX_CALLS_PER_KEY = 500
+MAX_API_CALLS = MAX_CALLS_PER_KEY * max(1, len(API_KEYS))
+# 페이지 동시 수집 워커 수 (1이면 순차 수집)
+MAX_WORKERS = int(os.getenv("G2B_MAX_WORKERS", "1"))
+# asyncio 모드 (AsyncG2BClient, aiohttp 필요)
+USE_ASYNC = os.getenv("G2B_ASYNC", "0") == "1"
+# 적응형(AIMD) 동시성 제어 - G2B_MAX_WORKERS가 상한
+ADAPTIVE_CONCURRENCY = os.getenv("G2B_ADAPTIVE", "0") == "1"
+# 조회 구간 분할 기준 (건수 기본값은 잘림 한도 500×페이지 크기, 지연은 기본 사용 안 함)
+SPLIT_THRESHOLD = int(os.getenv("G2B_SPLIT_THRESHOLD", "0")) or None
+SPLIT_LATENCY = float(os.getenv("G2B_SPLIT_LATENCY", "0")) or None
+# probe 기반 수집 계획 (numOfRows=1로 월별 건수 확인 후 예산 안에서만 수집)
+USE_PLAN = os.getenv("G2B_PLAN", "0") == "1"
+PLAN_LOOKAHEAD = int(os.getenv("G2B_PLAN_LOOKAHEAD", "24"))
+# 구간별 수집 현황 (완료/빈 구간은 다시 호출하지 않음, G2B_COVERAGE=0이면 끔)
+USE_COVERAGE = os.getenv("G2B_COVERAGE", "1") != "0"
+# 업무별 병렬 수집 모드 (물품/공사/용역/외자 각자 커서와 워커 사용)
+PARALLEL_JOBS = os.getenv("G2B_PARALLEL_JOBS", "0") == "1"
+# 응답 스트리밍 파싱 (페이지 응답 전체를 메모리에 올리지 않음)
+STREAMING = os.getenv("G2B_STREAMING", "0") == "1"
+# XML 파서 백엔드 (etree/expat/lxml, 기본 auto)
+XML_PARSER = os.getenv("G2B_XML_PARSER", "auto")
+# 응답 형식 (xml/json/auto) - json은 전송량이 작고 디코딩이 빠름
+RESPONSE_FORMAT = os.getenv("G2B_RESPONSE_FORMAT", "xml")
+# 오퍼레이션별 numOfRows 측정 결과를 자동 사용 (progress.json, G2B_PAGE_SIZE_AUTO=0이면 항상 999)
+AUTO_PAGE_SIZE = os.getenv("G2B_PAGE_SIZE_AUTO", "1") != "0"
+# 페이지 크기 측정 ("1"이면 기본 크기, "500,999,2000"처럼 주면 그 크기로 - 업무별 크기 수 × 반복 수만큼 호출)
+TUNE_PAGE_SIZES = os.getenv("G2B_TUNE_PAGE_SIZES", "")
+TUNE_REPEAT = int(os.getenv("G2B_TUNE_REPEAT", "1"))
+# 측정할 월 (YYYY-MM, 기본 지난달 - 구간 전체 건수가 가장 큰 크기보다 많아야 상한을 확인할 수 있음)
+TUNE_MONTH = os.getenv("G2B_TUNE_MONTH", "")
+# 지연된 페이지 중복 요청 (최근 지연의 G2B_HEDGE_PERCENTILE 분위수를 넘으면 한 번 더 요청)
+USE_HEDGING = os.getenv("G2B_HEDGE", "0") == "1"
+HEDGE_PERCENTILE = float(os.getenv("G2B_HEDGE_PERCENTILE", "0.95"))
+# 실행당 중복 요청 상한 (hedging이 일일 한도에서 쓸 수 있는 호출 수)
+HEDGE_BUDGET = int(os.getenv("G2B_HEDGE_BUDGET", "20"))
+# 오퍼레이션/페이지 크기별 지연 분포(p99 + 여유)로 connect/read 타임아웃 결정 (G2B_ADAPTIVE_TIMEOUT=0이면 고정 30초)
+ADAPTIVE_TIMEOUT = os.getenv("G2B_ADAPTIVE_TIMEOUT", "1") != "0"
+# API 장애 서킷 브레이커 (최근 호출 실패 비율이 기준 이상이면 요청을 멈추고 커서를 그대로 둔 채 종료)
+USE_CIRCUIT_BREAKER = os.getenv("G2B_CIRCUIT_BREAKER", "1") != "0"
+BREAKER_FAILURE_RATE = float(os.getenv("G2B_BREAKER_FAILURE_RATE", "0.5"))
+BREAKER_WINDOW = int(os.getenv("G2B_BREAKER_WINDOW", "10"))
+BREAKER_COOLDOWN = float(os.getenv("G2B_BREAKER_COOLDOWN", "60"))
+# 원본 응답 보관 디렉터리 (지정하면 정상 응답을 gzip으로 보관 - 파싱 수정 시 API 호출 없이 재처리)
+ARCHIVE_DIR = os.getenv("G2B_ARCHIVE_DIR", "")
+# 변경분 수집 (하루 한 번 변경일시 기준으로 최근 구간만 조회해 바뀐 계약만 {업무}_changes.xml에 추가)
+USE_REFRESH = os.getenv("G2B_REFRESH", "0") == "1"
+REFRESH_INQRY_DIVS = [div.strip() for div in os.getenv("G2B_REFRESH_INQRY_DIVS", INQRY_DIV_CHANGED).split(",") if div.strip()]
+# 처음 조회할 때 거슬러 올라갈 일수, 변경분 수집이 쓸 수 있는 실행당 호출 수
+REFRESH_DAYS = int(os.getenv("G2B_REFRESH_DAYS", "7"))
+REFRESH_MAX_CALLS = int(os.getenv("G2B_REFRESH_MAX_CALLS", "40"))
+# 늦게 반영되는 변경을 놓치지 않도록 다음 조회 시작을 앞당기는 시간(분)
+REFRESH_OVERLAP_MINUTES = 60
+# 입찰공고 → 낙찰 → 계약 연결 테이블 (G2B_JOIN_DIR이 있을 때만, 상대 경로는 프로젝트 루트 기준)
+JOIN_DIR = os.getenv("G2B_JOIN_DIR", "")
+# 조인할 입찰공고/낙찰 데이터 파일 (쉼표로 구분한 glob, 계약은 수집한 연도별/변경분 파일)
+JOIN_FILES = {
+    BID: os.getenv("G2B_JOIN_BID_FILES", ""),
+    AWARD: os.getenv("G2B_JOIN_AWARD_FILES", "")
+}
+# 계약별 상세 수집 (G2B_FANOUT_DIR이 있을 때만 - 대기열/재개 커서 저장 위치, 상대 경로는 프로젝트 루트 기준)
+FANOUT_DIR = os.getenv("G2B_FANOUT_DIR", "")
+FANOUT_DETAILS = [name.strip() for name in os.getenv("G2B_FANOUT_DETAILS", "change_history").split(",") if name.strip()]
+# 우선순위 규칙 (예: "totCntrctAmt>=1000000000; cntrctCnclsDate<=30d"), 규칙에 안 맞는 계약도 받을지
+FANOUT_RULES = os.getenv("G2B_FANOUT_RULES", "")
+FANOUT_UNMATCHED = os.getenv("G2B_FANOUT_UNMATCHED", "1") != "0"
+# 상세 수집이 쓸 수 있는 실행당 호출 수
+FANOUT_MAX_CALLS = int(os.getenv("G2B_FANOUT_MAX_CALLS", "100"))
+# 실행 시간 예산 (분) - 워크플로 timeout-minutes(30)에 죽기 전에 페이지 경계에서 멈추고 체크포인트 저장
+TIME_BUDGET_MINUTES = float(os.getenv("G2B_TIME_BUDGET_MINUTES", "25"))
+# 실패 페이지가 남은 월을 체크포인트에서 다시 시도하는 횟수 (넘으면 미완료로 남기고 다음 월로)
+MONTH_RETRY_LIMIT = int(os.getenv("G2B_MONTH_RETRIES", "3"))
+PROGRESS_LOCAL_PATH = "progress.json"
+RUN_STARTED = time.monotonic()
+JOBS = ["물품", "공사", "용역", "외자"]
+LAST_YEAR = 2025
 
 def upload_file_to_shared_drive(local_path, filename):
     """Shared Drive에 파일 업로드"""
@@ -110,44 +212,406 @@ def upload_file_to_shared_drive(local_path, filename):
         log(f"❌ Shared Drive 업로드 실패: {filename} - {e}")
         return False
 
-def append_to_year_file(job, year, xml_content):
-    """XML 내용을 연도별 파일에 추가"""
+def year_file_path(job, year):
+    """연도별 데이터 파일 경로와 이름"""
     filename = f"{job}_{year}.xml"
-    
     # 🔧 데이터 저장 경로도 프로젝트 루트 기준 data 폴더로 고정
-    data_dir = os.path.join(project_root, "data")
-    local_path = os.path.join(data_dir, filename)
+    return os.path.join(project_root, "data", filename), filename
+
+def checkpoint_path(job, year):
+    """연도별 데이터 파일과 함께 커밋되는 로컬 체크포인트 경로"""
+    return os.path.join(project_root, "data", f"{job}_{year}.checkpoint.json")
+
+def detail_file_path(job, detail):
+    """상세 데이터 파일 경로와 이름 (예: 물품_변경이력.xml)"""
+    filename = f"{job}_{detail.label}.xml"
+    return os.path.join(project_root, "data", filename), filename
+
+def changes_file_path(job):
+    """변경분 데이터 파일 경로와 이름"""
+    filename = f"{job}_changes.xml"
+    return os.path.join(project_root, "data", filename), filename
+
+def append_to_year_file(job, year, xml_content):
+    """XML 내용(str 또는 bytes)을 연도별 파일에 추가"""
+    local_path, filename = year_file_path(job, year)
+    return append_to_xml_file(local_path, filename, xml_content)
+
+def append_to_xml_file(local_path, filename, xml_content):
+    """XML 내용(str 또는 bytes)을 <root> 파일 끝에 추가 (없으면 새로 생성)"""
+    data = xml_content.encode('utf-8') if isinstance(xml_content, str) else xml_content
     
     # 디렉토리 생성
-    os.makedirs(data_dir, exist_ok=True)
+    os.makedirs(os.path.dirname(local_path), exist_ok=True)
     
     # XML 헤더 확인 및 추가
     if not os.path.exists(local_path):
         # 새 파일 생성
-        with open(local_path, 'w', encoding='utf-8') as f:
-            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-            f.write('<root>\n')
-            f.write(xml_content)
-            f.write('\n</root>')
+        with open(local_path, 'wb') as f:
+            f.write(b'<?xml version="1.0" encoding="UTF-8"?>\n')
+            f.write(b'<root>\n')
+            f.write(data)
+            f.write(b'\n</root>')
         log(f"📝 새 파일 생성: {filename}")
     else:
-        # 기존 파일에 추가 (</root> 태그 앞에 삽입)
-        with open(local_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # 기존 파일에 추가 (파일 끝의 </root>만 잘라내고 이어 쓰기 - 파일 전체를 다시 쓰지 않음)
+        with open(local_path, 'r+b') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - 64))
+            tail = f.read()
+            closing = tail.rfind(b'</root>')
+            if closing >= 0:
+                f.seek(size - len(tail) + closing)
+                f.truncate()
+            f.write(data + b'\n</root>')
+    
+    return local_path, filename
+
+def merge_changes_file(job, changed):
+    """
+    변경분을 {업무}_changes.xml에 계약번호별 최신 1건으로 합쳐 저장
+    
+    같은 계약이 여러 번 바뀌어도 파일에는 가장 늦은 레코드(변경차수 → 변경/등록일시 순)
+    1건만 남습니다. 파일 전체를 임시 파일에 다시 쓴 뒤 교체합니다.
+    
+    Returns:
+        tuple: (local_path, filename)
+    """
+    local_path, filename = changes_file_path(job)
+    merged = latest_by_contract(read_items(local_path), changed)
+    os.makedirs(os.path.dirname(local_path), exist_ok=True)
+    tmp_path = f"{local_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(b'<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write(b'<root>\n')
+        f.write(items_to_xml(merged).encode('utf-8'))
+        f.write(b'</root>')
+    os.replace(tmp_path, local_path)
+    log(f"📝 파일 업데이트: {filename} (계약 {len(merged):,}건)")
+    return local_path, filename
+
+def store_month(client, job, year, month, summary, checkpoint=None, should_stop=None, fanout=None):
+    """
+    페이지가 도착하는 대로 연도별 파일에 추가 (한 달치를 메모리에 모으지 않음)
+    
+    checkpoint를 넘기면 이미 저장한 페이지는 건너뛰고, 페이지를 파일에 추가할 때마다
+    로컬 체크포인트를 함께 커밋합니다. should_stop()이 멈출 이유를 돌려주면
+    페이지 경계에서 멈춥니다 (summary.completed는 False로 남음).
+    fanout을 넘기면 저장한 페이지의 계약을 상세 수집 대기열에 넣습니다.
+    
+    Returns:
+        tuple: (local_path, filename) - 저장한 데이터가 없으면 (None, None)
+    """
+    local_path = filename = None
+    resume = checkpoint.resume_state() if checkpoint is not None else None
+    pages = client.iter_pages(job, year, month, summary=summary, resume=resume)
+    try:
+        for page in pages:
+            data = items_to_xml(page.items).encode('utf-8')
+            local_path, filename = append_to_year_file(job, year, data)
+            if checkpoint is not None:
+                # 파일 끝은 항상 "\n</root>" - 방금 쓴 페이지는 그 바로 앞
+                file_size = os.path.getsize(local_path)
+                checkpoint.sync_windows(summary.window_report)
+                checkpoint.commit_page(page, data, filename, file_size, file_size - len(data) - 8)
+                checkpoint.save(checkpoint_path(job, year))
+            if fanout is not None:
+                fanout.enqueue(job, page.items)
+            reason = should_stop() if should_stop else None
+            if reason:
+                log(f"⏸️ 수집 중단 ({reason}): {job} {year}년 {month}월 페이지 {page.page_no}까지 저장")
+                break
+    finally:
+        # 중간에 멈춰도 summary가 채워지도록 제너레이터를 바로 정리
+        pages.close()
+    if checkpoint is not None:
+        # 마지막 페이지 뒤에 확인한 빈 구간/분할 구간도 기록
+        checkpoint.sync_windows(summary.window_report)
+        checkpoint.save(checkpoint_path(job, year))
+    if local_path:
+        log(f"📝 파일 업데이트: {filename}")
+    return local_path, filename
+
+def open_checkpoint(progress, client, job, year, month):
+    """
+    이번 월의 페이지 체크포인트 로드 (없으면 새로 시작)
+    
+    같은 실행 환경에 남은 로컬 체크포인트(데이터 파일과 함께 커밋됨)를 먼저 쓰고,
+    없으면 progress.json의 체크포인트(데이터를 Drive에 올린 시점)에서 이어갑니다.
+    """
+    operation = client.OPERATION_MAP[job]
+    # 지난 월에 고정한 페이지 크기를 풀고 이번 월의 크기 결정
+    client.pin_rows(operation, None)
+    rows = client.rows_for(operation)
+    checkpoint = MonthCheckpoint.load(checkpoint_path(job, year))
+    if checkpoint is not None and resumable(checkpoint, job, year, month, rows):
+        if not checkpoint.verify_file(year_file_path(job, year)[0]):
+            log("⚠️ 로컬 체크포인트를 쓸 수 없음 - progress.json 체크포인트 사용")
+            checkpoint = None
+    else:
+        checkpoint = None
+    
+    if checkpoint is None:
+        saved = progress.get('page_checkpoints', {}).get(job)
+        checkpoint = MonthCheckpoint(saved) if saved else None
+        if checkpoint is None or not resumable(checkpoint, job, year, month, rows):
+            checkpoint = MonthCheckpoint.new(job, year, month, rows)
+    
+    if checkpoint.num_of_rows and checkpoint.num_of_rows != rows:
+        # 페이지 번호가 어긋나지 않도록 이 월은 시작할 때의 크기로 마저 수집
+        log(f"📏 {job} {year}년 {month}월: 시작할 때의 numOfRows {checkpoint.num_of_rows}로 이어서 수집 "
+            f"(조정된 크기 {rows}는 다음 월부터)")
+        client.pin_rows(operation, checkpoint.num_of_rows)
+    
+    if checkpoint.started:
+        log(f"⏩ 체크포인트에서 재개: {job} {year}년 {month}월 "
+            f"({checkpoint.pages}페이지, {checkpoint.items:,}건 저장됨, 시도 {checkpoint.attempts}회)")
+    return checkpoint
+
+def saved_checkpoint(progress, job, year, month):
+    """
+    이번 월에 이미 시작한 체크포인트 (로컬 → progress.json 순, 없으면 None)
+    
+    open_checkpoint와 달리 데이터 파일을 확인하거나 페이지 크기를 고정하지 않습니다 (계획 판단용).
+    """
+    for checkpoint in (MonthCheckpoint.load(checkpoint_path(job, year)),
+                       MonthCheckpoint(progress.get('page_checkpoints', {}).get(job))):
+        if checkpoint is not None and checkpoint.started and checkpoint.matches(job, year, month):
+            return checkpoint
+    return None
+
+def resumable(checkpoint, job, year, month, rows):
+    """이어서 받을 수 있는 체크포인트인지 (이미 시작한 월은 시작할 때의 페이지 크기로 이어감)"""
+    if checkpoint.started:
+        return checkpoint.matches(job, year, month)
+    return checkpoint.matches(job, year, month, rows)
+
+def save_progress_locally(progress):
+    """
+    progress.json 로컬 저장 (임시 파일 교체)
+    
+    워크플로가 시간 초과로 수집기를 죽여도 마지막 단계(if: always())에서
+    이 파일을 Drive에 올리므로, 여기까지 커밋된 체크포인트는 남습니다.
+    """
+    tmp_path = f"{PROGRESS_LOCAL_PATH}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(progress, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, PROGRESS_LOCAL_PATH)
+
+def settle_month(progress, checkpoint, summary, error, stop_reason, data_saved, lock=None):
+    """
+    월 수집 결과로 체크포인트 정리
+    
+    progress.json의 체크포인트는 그 체크포인트가 가리키는 데이터가 Drive에
+    올라간 경우(data_saved)에만 갱신합니다. 로컬 체크포인트는 완료/포기한 월이면 지웁니다.
+    
+    Returns:
+        str: "done" (월 완료 - 다음 월로), "stop" (예산/시간 소진 - 다음 실행에서 이어서),
+             "retry" (실패 페이지 남음 - 체크포인트에서 다시 시도),
+             "skip" (재시도 한도 초과 - 미완료로 남기고 다음 월로)
+    """
+    job = checkpoint.job
+    if error is None and summary.completed and not summary.failed_pages:
+        outcome = "done"
+    elif stop_reason:
+        outcome = "stop"
+    else:
+        checkpoint.attempts += 1
+        outcome = "retry" if checkpoint.attempts < MONTH_RETRY_LIMIT else "skip"
+        if outcome == "skip":
+            log(f"⚠️ 재시도 한도 초과: {job} {checkpoint.year}년 {checkpoint.month}월 "
+                f"({checkpoint.attempts}회) → 미완료로 남기고 다음 월로")
+    
+    path = checkpoint_path(job, checkpoint.year)
+    if outcome in ("done", "skip"):
+        if os.path.exists(path):
+            os.remove(path)
+    else:
+        checkpoint.save(path)
+    
+    with lock or threading.Lock():
+        checkpoints = progress.setdefault('page_checkpoints', {})
+        if outcome in ("done", "skip"):
+            checkpoints.pop(job, None)
+        elif data_saved:
+            checkpoints[job] = checkpoint.to_dict()
+            log(f"💾 체크포인트 커밋: {job} {checkpoint.year}년 {checkpoint.month}월 "
+                f"{checkpoint.pages}페이지 / {checkpoint.items:,}건")
+    return outcome
+
+def refresh_changes(progress, client, ledger, should_stop, uploaded_files):
+    """
+    업무별로 지난 조회 이후 변경된 계약만 받아 {업무}_changes.xml에 반영
+    
+    등록일시 기준 월 단위 수집은 지난 달을 다시 보지 않으므로, 변경일시 기준으로
+    최근 구간만 조회해 (계약번호, 변경차수) 키의 내용이 달라진 레코드만 저장합니다.
+    파일에는 계약번호별 최신 레코드 1건만 남깁니다 (merge_changes_file).
+    업무별로 하루 한 번, 실행당 REFRESH_MAX_CALLS회 안에서만 호출합니다.
+    다음 조회 시작 시각은 구간을 빠짐없이 받고 업로드까지 끝난 경우에만 옮깁니다.
+    
+    Returns:
+        int: 저장한 변경 레코드 수
+    """
+    feed = ChangeFeed(progress.get('change_feed'))
+    used_before = ledger.used()
+    total_changed = 0
+    
+    def over_budget():
+        return ledger.used() - used_before >= REFRESH_MAX_CALLS
+    
+    for job in JOBS:
+        if feed.refreshed_today(job):
+            continue
+        reason = should_stop() or (over_budget() and f"변경분 호출 한도 {REFRESH_MAX_CALLS}회 도달")
+        if reason:
+            log(f"⏸️ 변경분 수집 중단 ({reason}) - 남은 업무는 다음 실행에서")
+            break
         
-        # </root> 제거하고 새 데이터 추가
-        content = content.replace('</root>', '')
-        content += xml_content + '\n</root>'
+        end = now_kst()
+        since = feed.since(job) or (
+            datetime.strptime(end, TIMESTAMP_FORMAT) - timedelta(days=REFRESH_DAYS)
+        ).strftime("%Y%m%d0000")
+        items = []
+        complete = True
+        for inqry_div in REFRESH_INQRY_DIVS:
+            summary = FetchSummary()
+            pages = client.iter_changes(job, since, end, inqry_div, summary=summary)
+            try:
+                for page in pages:
+                    items.extend(page.items)
+                    if over_budget():
+                        break
+            finally:
+                pages.close()
+            complete = complete and summary.completed and not summary.failed_pages
         
-        with open(local_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        log(f"📝 파일 업데이트: {filename}")
+        changed, entries = feed.diff(job, items)
+        saved = True
+        if changed:
+            local_path, filename = merge_changes_file(job, changed)
+            saved = upload_file_to_shared_drive(local_path, filename)
+            if saved:
+                uploaded_files.append(filename)
+                log(f"☁️ Shared Drive 업로드 완료: {filename}")
+        if saved:
+            next_since = None
+            if complete:
+                next_since = (
+                    datetime.strptime(end, TIMESTAMP_FORMAT) - timedelta(minutes=REFRESH_OVERLAP_MINUTES)
+                ).strftime(TIMESTAMP_FORMAT)
+            feed.commit(job, entries, next_since)
+            total_changed += len(changed)
+        log(f"🔄 [{job}] 변경분 {len(items):,}건 중 새로 바뀐 계약 {len(changed):,}건"
+            + ("" if complete else " (구간 미완료 - 다음 실행에서 같은 구간부터)"))
     
-    return local_path, filename
+    progress['change_feed'] = feed.to_dict()
+    sync_quota(progress, ledger)
+    return total_changed
+
+def join_source_files():
+    """
+    조인 소스별 데이터 파일 목록 (계약은 업무별 연도별/변경분 파일)
+    
+    같은 data 폴더의 상세 수집 파일({업무}_{상세}.xml)은 계약 레코드가 아니므로 제외합니다.
+    """
+    data_dir = os.path.join(project_root, "data")
+    files = {
+        source: sorted({
+            path for pattern in patterns.split(",") if pattern.strip()
+            for path in glob.glob(os.path.join(project_root, pattern.strip()))
+        })
+        for source, patterns in JOIN_FILES.items()
+    }
+    files[CONTRACT] = sorted(
+        path for job in JOBS
+        for pattern in (f"{job}_[0-9][0-9][0-9][0-9].xml", os.path.basename(changes_file_path(job)[0]))
+        for path in glob.glob(os.path.join(data_dir, pattern))
+    )
+    return files
+
+def update_join_links():
+    """
+    G2B_JOIN_DIR이 있으면 데이터 파일에서 지난 실행 이후 추가된 레코드만 조인 인덱스에 넣고
+    바뀐 공고번호의 입찰공고 → 낙찰 → 계약 연결을 연결 테이블에 추가
+    
+    수집 결과와 무관한 후처리 단계라 실패해도 수집 결과 알림은 그대로 보냅니다.
+    """
+    if not JOIN_DIR:
+        return
+    try:
+        pipeline = JoinPipeline(os.path.join(project_root, JOIN_DIR))
+        for source, paths in join_source_files().items():
+            for path in paths:
+                pipeline.ingest_file(source, path)
+        pipeline.materialize()
+        pipeline.save()
+        pipeline.log_stats()
+    except Exception as e:
+        log(f"⚠️ 연결 테이블 갱신 실패: {e}")
+
+def create_detail_fanout():
+    """G2B_FANOUT_DIR이 있으면 상세 수집 대기열 생성 (모든 워커가 공유)"""
+    if not FANOUT_DIR:
+        return None
+    root = os.path.join(project_root, FANOUT_DIR)
+    details = [get_detail(name) for name in FANOUT_DETAILS]
+    rules = parse_rules(FANOUT_RULES)
+    log(f"🧾 상세 수집 사용: {', '.join(detail.label for detail in details)} "
+        f"(우선순위 {len(rules)}단계{'' if FANOUT_UNMATCHED else ', 규칙에 맞는 계약만'}) - {root}")
+    return DetailFanout(root, details, rules, include_unmatched=FANOUT_UNMATCHED)
+
+def run_detail_fanout(fanout, client, ledger, should_stop, uploaded_files):
+    """
+    상세 수집 대기열을 우선순위대로 받아 {업무}_{상세}.xml에 추가하고 업로드
+    
+    실행당 FANOUT_MAX_CALLS회 (남은 일일 한도 안에서)만 호출하고, 남은 대기열은
+    다음 실행에서 재개 커서부터 이어 받습니다.
+    
+    Returns:
+        int: 받은 (상세 종류, 계약) 수
+    """
+    if fanout is None:
+        return 0
+    budget = min(FANOUT_MAX_CALLS, MAX_API_CALLS - ledger.used())
+    if budget <= 0:
+        return 0
+    changed = {}
+    
+    def store(detail, job, items):
+        local_path, filename = append_to_xml_file(*detail_file_path(job, detail), items_to_xml(items))
+        changed[filename] = local_path
+    
+    fetched = fanout.run(client, store, budget, should_stop)
+    for filename, local_path in changed.items():
+        if upload_file_to_shared_drive(local_path, filename):
+            uploaded_files.append(filename)
+            log(f"☁️ Shared Drive 업로드 완료: {filename}")
+    return fetched
+
+def save_detail_fanout(fanout):
+    """이번 실행에서 대기열에 넣은 키 상태 저장 및 상세 수집 통계 로그 (사용하지 않으면 무시)"""
+    if fanout is not None:
+        fanout.save()
+        fanout.log_stats()
+
+def make_stop_check(ledger, key_pool=None, breaker=None):
+    """페이지 경계에서 수집을 멈춰야 하는 이유 (일일 한도, 남은 키, API 장애, 실행 시간 예산)"""
+    def should_stop():
+        if ledger.used() >= MAX_API_CALLS:
+            return f"일일 API 한도 {MAX_API_CALLS}회 도달"
+        if key_pool is not None and not key_pool.available():
+            return "사용 가능한 API 키 없음"
+        if breaker is not None and breaker.tripped:
+            return "API 장애 (서킷 열림)"
+        if TIME_BUDGET_MINUTES and time.monotonic() - RUN_STARTED > TIME_BUDGET_MINUTES * 60:
+            return f"실행 시간 {TIME_BUDGET_MINUTES:g}분 초과"
+        return None
+    return should_stop
 
 def get_next_period(job, year, month):
     """다음 수집 기간 계산"""
-    jobs = ["물품", "공사", "용역", "외자"]
+    jobs = JOBS
     
     if month < 12:
         return job, year, month + 1
@@ -165,44 +629,367 @@ def get_next_period(job, year, month):
             # 알 수 없는 업무면 물품부터 시작
             return "물품", year, month + 1
 
+def init_job_cursors(progress):
+    """
+    업무별 커서 초기화 (병렬 모드)
+
+    progress['job_cursors']가 없으면 기존 단일 커서(current_job/year/month)에서
+    각 업무의 위치를 계산합니다. 순차 모드에서는 한 해 안에서 물품→공사→용역→외자
+    순서로 진행하므로, 현재 업무보다 앞선 업무는 다음 해부터 시작합니다.
+    """
+    cursors = progress.get('job_cursors')
+    if cursors and all(job in cursors for job in JOBS):
+        return cursors
+    
+    cursors = cursors or {}
+    current_job = progress['current_job']
+    current_year = progress['current_year']
+    current_idx = JOBS.index(current_job) if current_job in JOBS else 0
+    
+    for idx, job in enumerate(JOBS):
+        if job in cursors:
+            continue
+        if idx < current_idx:
+            cursors[job] = {"year": current_year + 1, "month": 1}
+        elif idx == current_idx:
+            cursors[job] = {"year": current_year, "month": progress['current_month']}
+        else:
+            cursors[job] = {"year": current_year, "month": 1}
+    
+    progress['job_cursors'] = cursors
+    log(f"🧭 업무별 커서 초기화: {cursors}")
+    return cursors
+
+def sync_legacy_cursor(progress):
+    """가장 뒤처진 업무 커서를 기존 current_* 필드에 반영 (요약/검증 호환용)"""
+    cursors = progress['job_cursors']
+    job = min(JOBS, key=lambda j: (cursors[j]['year'], cursors[j]['month'], JOBS.index(j)))
+    progress['current_job'] = job
+    progress['current_year'] = cursors[job]['year']
+    progress['current_month'] = cursors[job]['month']
+
+def load_quota_ledger(progress):
+    """
+    progress.json의 요청 장부 로드
+    
+    장부가 없던 이전 버전 progress라면 오늘 이미 쓴 daily_api_calls를 이관합니다.
+    """
+    ledger = QuotaLedger(progress.get('quota_ledger'))
+    if 'quota_ledger' not in progress and progress.get('daily_api_calls', 0) > 0 \
+            and progress.get('last_api_reset_date') == today_kst():
+        ledger.record("legacy", progress['daily_api_calls'])
+    sync_quota(progress, ledger)
+    return ledger
+
+def sync_quota(progress, ledger):
+    """장부(실제 전송 횟수) 기준으로 progress의 일일 사용량 갱신"""
+    progress['quota_ledger'] = ledger.to_dict()
+    progress['daily_api_calls'] = ledger.used()
+    return progress['daily_api_calls']
+
+class QuotaBudget:
+    """여러 워커가 공유하는 일일 API 호출 예산 (QuotaLedger 기준)"""
+    
+    def __init__(self, progress, ledger, limit, lock):
+        self.progress = progress
+        self.ledger = ledger
+        self.limit = limit
+        self.lock = lock
+    
+    def available(self):
+        return self.ledger.used() < self.limit
+    
+    def refresh(self):
+        """장부 사용량을 progress에 반영하고 현재 사용량 반환"""
+        with self.lock:
+            return sync_quota(self.progress, self.ledger)
+
+def load_coverage(progress):
+    """progress.json의 구간별 수집 현황 로드"""
+    if not USE_COVERAGE:
+        return None
+    coverage = CoverageMap(progress.get('coverage'))
+    incomplete = coverage.incomplete()
+    if incomplete:
+        log(f"🧩 미완료 구간 {len(incomplete)}개: {', '.join(sorted(incomplete)[:5])}{' ...' if len(incomplete) > 5 else ''}")
+    return coverage
+
+def is_covered(coverage, planner, job, year, month):
+    """이미 완료됐고 건수가 바뀌지 않은 월이면 True (호출 없이 건너뜀)"""
+    if coverage is None:
+        return False
+    current_total = None
+    if planner is not None:
+        entry = planner.entry(job, year, month)
+        current_total = entry.get("total_count") if entry else None
+    if coverage.can_skip_month(job, year, month, current_total):
+        log(f"⏭️ 이미 수집 완료: {job} {year}년 {month}월 (호출 생략)")
+        return True
+    return False
+
+def upcoming_periods(job, year, month, count):
+    """현재 커서 다음부터 count개월의 (업무, 연, 월)"""
+    for _ in range(count):
+        job, year, month = get_next_period(job, year, month)
+        if year > LAST_YEAR:
+            return
+        yield job, year, month
+
+def load_progress():
+    """Drive 연결 확인 후 progress.json 로드 및 한국시간 기준 일일 카운트 리셋"""
+    # Google Drive 연결 테스트
+    if not test_drive_connection():
+        raise Exception("Google Drive 연결 실패")
+    
+    # Progress 파일 다운로드
+    progress = download_progress_json(PROGRESS_FILE_ID)
+    if not progress:
+        log("❌ progress.json 로드 실패")
+        return None
+    
+    # ✅ 한국시간 기준 자동 API 리셋 로직
+    korea_tz = pytz.timezone('Asia/Seoul')
+    today_korea = datetime.now(korea_tz).strftime('%Y-%m-%d')
+    
+    if progress.get('last_api_reset_date') != today_korea:
+        progress['daily_api_calls'] = 0
+        progress['last_api_reset_date'] = today_korea
+        log(f"🔄 일일 API 카운트 자동 리셋: {today_korea}")
+    
+    log(f"📋 현재 진행상황: {progress['current_job']} {progress['current_year']}년 {progress['current_month']}월")
+    log(f"📊 API 사용량: {progress['daily_api_calls']}/{MAX_API_CALLS}")
+    
+    # API 키 확인 (로그에는 키 대신 지문만)
+    log(f"🔑 API 키 {len(API_KEYS)}개: {', '.join(key_id(key) for key in API_KEYS) or 'None'} "
+        f"(키당 {MAX_CALLS_PER_KEY}회, {KEY_STRATEGY})")
+
+    if not API_KEYS:
+        raise Exception("API_KEY 환경변수가 설정되지 않았습니다!")
+    
+    return progress
+
+def advance_progress(progress, job, year, month):
+    """다음 기간으로 커서 이동 후 다음 연도 반환"""
+    next_job, next_year, next_month = get_next_period(job, year, month)
+    progress['current_job'] = next_job
+    progress['current_year'] = next_year
+    progress['current_month'] = next_month
+    return next_year
+
+def create_concurrency_controller():
+    """G2B_ADAPTIVE=1이면 AIMD 제어기 생성 (상한은 G2B_MAX_WORKERS)"""
+    if not ADAPTIVE_CONCURRENCY:
+        return None
+    max_limit = max(MAX_WORKERS, 2)
+    log(f"🎛️ 적응형 동시성 제어 사용 (1 ~ {max_limit})")
+    return AIMDController(initial=min(2, max_limit), max_limit=max_limit)
+
+def load_key_pool(progress, ledger):
+    """
+    progress.json의 키별 장부로 서비스키 풀 생성
+    
+    키별 장부가 없던 이전 버전 progress라면 오늘 이미 쓴 요청은 기본 키(API_KEY) 몫으로 이관합니다.
+    """
+    key_pool = KeyPool(API_KEYS, MAX_CALLS_PER_KEY, progress.get('key_pool'), KEY_STRATEGY)
+    if 'key_pool' not in progress and API_KEYS and ledger.used() > 0:
+        key_pool.record(API_KEYS[0], "legacy", ledger.used())
+    return key_pool
+
+def create_hedge_policy():
+    """G2B_HEDGE=1이면 중복 요청 정책 생성 (모든 클라이언트가 상한/통계 공유)"""
+    if not USE_HEDGING:
+        return None
+    log(f"🪝 중복 요청 사용 (p{HEDGE_PERCENTILE * 100:g} 초과 시, 실행당 최대 {HEDGE_BUDGET}회)")
+    return HedgePolicy(percentile=HEDGE_PERCENTILE, max_hedges=HEDGE_BUDGET)
+
+def load_latency_profile(progress):
+    """progress.json의 지연 표본으로 적응형 타임아웃 생성 (G2B_ADAPTIVE_TIMEOUT=0이면 None)"""
+    if not ADAPTIVE_TIMEOUT:
+        return None
+    return AdaptiveTimeout(progress.get('latency_profile'))
+
+def save_latency_profile(progress, timeouts):
+    """지연 표본을 progress에 저장하고 키별 타임아웃 로그"""
+    if timeouts is None:
+        return
+    progress['latency_profile'] = timeouts.to_dict()
+    timeouts.log_profile()
+
+def load_page_sizes(progress):
+    """progress.json의 오퍼레이션별 페이지 크기 측정 결과"""
+    return PageSizeTuner(progress.get('page_sizes'))
+
+def save_page_sizes(progress, page_sizes):
+    """페이지 크기 측정 결과를 progress에 저장하고 사용 중인 크기 로그"""
+    progress['page_sizes'] = page_sizes.to_dict()
+    if AUTO_PAGE_SIZE:
+        page_sizes.log_stats()
+
+def tune_month():
+    """페이지 크기를 측정할 (연, 월) - G2B_TUNE_MONTH 또는 지난달"""
+    if TUNE_MONTH:
+        year, month = TUNE_MONTH.split("-")
+        return int(year), int(month)
+    now = datetime.strptime(now_kst(), TIMESTAMP_FORMAT)
+    return (now.year, now.month - 1) if now.month > 1 else (now.year - 1, 12)
+
+def tune_page_sizes(page_sizes, client, should_stop):
+    """
+    G2B_TUNE_PAGE_SIZES가 있으면 업무별로 같은 월의 1페이지를 크기별로 받아 최적 numOfRows 갱신
+    
+    Returns:
+        int: 측정에 쓴 API 호출 수
+    """
+    if not TUNE_PAGE_SIZES:
+        return 0
+    sizes = DEFAULT_SIZES if TUNE_PAGE_SIZES in ("1", "auto") else parse_sizes(TUNE_PAGE_SIZES)
+    year, month = tune_month()
+    start_date, end_date = month_window(year, month)
+    log(f"📏 페이지 크기 측정: {year}년 {month}월, numOfRows {', '.join(map(str, sizes))} "
+        f"(업무별 {len(sizes) * TUNE_REPEAT}회)")
+    api_calls_used = 0
+    for job, operation in client.OPERATION_MAP.items():
+        reason = should_stop()
+        if reason:
+            log(f"⏸️ 페이지 크기 측정 중단: {reason}")
+            break
+        _, calls = page_sizes.sweep(client, operation, start_date, end_date, sizes, TUNE_REPEAT, should_stop)
+        api_calls_used += calls
+    log(f"📏 페이지 크기 측정 완료 (API 호출 {api_calls_used}회)")
+    return api_calls_used
+
+def create_circuit_breaker():
+    """G2B_CIRCUIT_BREAKER=0이 아니면 서킷 브레이커 생성 (모든 클라이언트가 공유)"""
+    if not USE_CIRCUIT_BREAKER:
+        return None
+    return CircuitBreaker(
+        failure_rate=BREAKER_FAILURE_RATE, window=BREAKER_WINDOW, cooldown=BREAKER_COOLDOWN
+    )
+
+def create_response_archive():
+    """G2B_ARCHIVE_DIR이 있으면 원본 응답 보관소 생성 (상대 경로는 프로젝트 루트 기준)"""
+    if not ARCHIVE_DIR:
+        return None
+    root = os.path.join(project_root, ARCHIVE_DIR)
+    log(f"🗄️ 원본 응답 보관: {root}")
+    return ResponseArchive(root)
+
+def log_archive_stats(archive):
+    """응답 보관 통계 로그 (사용하지 않으면 무시)"""
+    if archive is not None:
+        archive.log_stats()
+
+def create_client(controller=None, ledger=None, key_pool=None, hedging=None, timeouts=None,
+                  breaker=None, archive=None, page_sizes=None):
+    """환경변수 설정을 반영한 G2BClient 생성 (G2B_PAGE_SIZE_AUTO=0이면 측정 결과를 쓰지 않음)"""
+    return G2BClient(
+        API_KEY,
+        key_pool=key_pool,
+        hedging=hedging,
+        timeouts=timeouts,
+        breaker=breaker,
+        archive=archive,
+        page_sizes=page_sizes if AUTO_PAGE_SIZE else None,
+        max_workers=MAX_WORKERS,
+        concurrency=controller,
+        ledger=ledger,
+        split_threshold=SPLIT_THRESHOLD,
+        split_latency=SPLIT_LATENCY,
+        streaming=STREAMING,
+        parser=XML_PARSER,
+        response_format=RESPONSE_FORMAT
+    )
+
+def log_hedging_stats(hedging):
+    """중복 요청 통계 로그 (사용하지 않으면 무시)"""
+    if hedging is not None:
+        hedging.log_stats()
+
+def log_concurrency_metrics(controller):
+    """AIMD 제어기 최종 상태 로그"""
+    if controller is None:
+        return
+    metrics = controller.metrics()
+    log(
+        f"🎛️ 동시성 제어 결과: 한도 {metrics['limit']} "
+        f"(증가 {metrics['increases']}회 / 감소 {metrics['decreases']}회, "
+        f"실패 {metrics['failures']}/{metrics['requests']})"
+    )
+
+def finish_run(progress, total_new_items, uploaded_files, breaker=None):
+    """
+    Progress 업로드 및 결과 슬랙 전송
+    
+    API 장애로 서킷이 열린 채 끝났으면 완료 알림 대신 중단 알림 하나만 보냅니다.
+    """
+    # Progress 업데이트
+    progress['last_run_date'] = datetime.now().strftime('%Y-%m-%d')
+    
+    # Progress 파일 업로드
+    upload_success = upload_progress_json(progress, PROGRESS_FILE_ID)
+    
+    # 결과 슬랙 전송 (안전한 포맷팅)
+    outage = breaker is not None and breaker.tripped
+    title = "⛔ **G2B 수집 중단 (API 장애)**" if outage else "🎯 **G2B 수집 완료**"
+    message = (
+        f"{title}\n"
+        f"```\n"
+        f"• 진행: {progress['current_job']} {progress['current_year']}년 {progress['current_month']}월\n"
+        f"• 오늘 수집: {total_new_items:,}건\n"
+        f"• API 호출: {progress['daily_api_calls']}/{MAX_API_CALLS}\n"
+        f"• 누적: {progress['total_collected']:,}건\n"
+        f"• 업로드 파일: {len(uploaded_files)}개\n"
+        + (f"• API 장애: {breaker.summary()}\n" if breaker is not None and breaker.opened else "")
+        + f"```"
+    )
+    
+    # 병렬 모드면 업무별 커서도 표시
+    cursors = progress.get('job_cursors')
+    if cursors:
+        message += "\n" + "\n".join(
+            f"• {job}: {c['year']}년 {c['month']}월" for job, c in cursors.items()
+        )
+    
+    send_slack_message(message)
+    if outage:
+        log(f"⛔ API 장애로 수집 중단 - 다음 실행에서 같은 위치부터 이어서 수집 ({breaker.summary()})")
+    else:
+        log("🎉 수집 작업 완료")
+
 def main():
     try:
         log("🚀 G2B 데이터 수집 시작")
         
-        # Google Drive 연결 테스트
-        if not test_drive_connection():
-            raise Exception("Google Drive 연결 실패")
-        
-        # Progress 파일 다운로드
-        progress = download_progress_json(PROGRESS_FILE_ID)
+        progress = load_progress()
         if not progress:
-            log("❌ progress.json 로드 실패")
             return False
-        
-        # ✅ 한국시간 기준 자동 API 리셋 로직
-        korea_tz = pytz.timezone('Asia/Seoul')
-        today_korea = datetime.now(korea_tz).strftime('%Y-%m-%d')
-        
-        if progress.get('last_api_reset_date') != today_korea:
-            progress['daily_api_calls'] = 0
-            progress['last_api_reset_date'] = today_korea
-            log(f"🔄 일일 API 카운트 자동 리셋: {today_korea}")
-        
-        log(f"📋 현재 진행상황: {progress['current_job']} {progress['current_year']}년 {progress['current_month']}월")
-        log(f"📊 API 사용량: {progress['daily_api_calls']}/{MAX_API_CALLS}")
-        
-        # API 클라이언트 초기화
-        log(f"🔑 API_KEY 상태: {len(API_KEY) if API_KEY else 'None'}글자")
-        log(f"🔑 API_KEY 앞자리: {API_KEY[:10] if API_KEY else 'None'}...")
-
-        if not API_KEY:
-            raise Exception("API_KEY 환경변수가 설정되지 않았습니다!")
 
-        client = G2BClient(API_KEY)
+        controller = create_concurrency_controller()
+        ledger = load_quota_ledger(progress)
+        key_pool = load_key_pool(progress, ledger)
+        hedging = create_hedge_policy()
+        timeouts = load_latency_profile(progress)
+        breaker = create_circuit_breaker()
+        archive = create_response_archive()
+        page_sizes = load_page_sizes(progress)
+        client = create_client(controller, ledger, key_pool, hedging, timeouts, breaker, archive, page_sizes)
+        planner = CollectionPlanner(client, progress.get('collection_plan')) if USE_PLAN else None
+        coverage = load_coverage(progress)
+        should_stop = make_stop_check(ledger, key_pool, breaker)
+        fanout = create_detail_fanout()
         
         # 수집할 데이터 계산
         total_new_items = 0
         uploaded_files = []
+        fetched_months = 0
+        
+        # 수집 계획/체크포인트보다 먼저 페이지 크기 측정 (요청한 경우만)
+        tune_page_sizes(page_sizes, client, should_stop)
+        if USE_REFRESH:
+            # 최근 변경된 계약을 먼저 반영 (몇 번의 호출로 끝남)
+            refresh_changes(progress, client, ledger, should_stop, uploaded_files)
+        # 지난 실행까지 쌓인 상세 수집 대기열을 정해진 호출 수만큼 먼저 처리
+        run_detail_fanout(fanout, client, ledger, should_stop, uploaded_files)
         
         # API 한도까지 계속 수집
         while progress['daily_api_calls'] < MAX_API_CALLS:
@@ -210,26 +997,477 @@ def main():
             year = progress['current_year']
             month = progress['current_month']
             
+            if is_covered(coverage, planner, job, year, month):
+                if advance_progress(progress, job, year, month) > LAST_YEAR:
+                    log("🎉 모든 데이터 수집 완료! (2024-2025)")
+                    break
+                continue
+            
+            if planner is not None:
+                decision = check_plan(planner, progress, ledger, job, year, month, fetched_months)
+                if decision == "stop":
+                    break
+                if decision == "skip":
+                    if advance_progress(progress, job, year, month) > LAST_YEAR:
+                        log("🎉 모든 데이터 수집 완료! (2024-2025)")
+                        break
+                    continue
+            
             log(f"📥 수집 시작: {job} {year}년 {month}월")
+            fetched_months += 1
             
+            checkpoint = open_checkpoint(progress, client, job, year, month)
+            stored_before = checkpoint.items
+            summary = FetchSummary()
+            error = None
             try:
-                # 데이터 수집
-                xml_content, item_count, api_calls_used = client.fetch_data(job, year, month)
+                # 데이터 수집 (페이지 단위로 바로 연도별 파일에 저장, 페이지마다 체크포인트 커밋)
+                store_month(client, job, year, month, summary, checkpoint, should_stop, fanout)
+            except Exception as e:
+                error = str(e)
+                log(f"⚠️ 수집 실패: {job} {year}년 {month}월 - {e}")
+            # 이번 실행에서 파일에 커밋한 건수 (실패/중단한 월도 저장한 페이지까지는 업로드)
+            item_count = checkpoint.items - stored_before
+            
+            # API 사용량 업데이트 (재시도 포함 실제 요청 수)
+            sync_quota(progress, ledger)
+            log(f"📊 API 사용: +{summary.api_calls_used} (총 {progress['daily_api_calls']}/{MAX_API_CALLS})")
+            
+            # 데이터가 있으면 업로드
+            upload_success = False
+            if item_count > 0:
+                # ✅ Shared Drive에 업로드
+                local_path, filename = year_file_path(job, year)
+                upload_success = upload_file_to_shared_drive(local_path, filename)
+                if upload_success:
+                    uploaded_files.append(filename)
+                    log(f"☁️ Shared Drive 업로드 완료: {filename}")
                 
-                # API 사용량 업데이트
-                progress['daily_api_calls'] += api_calls_used
-                log(f"📊 API 사용: +{api_calls_used} (총 {progress['daily_api_calls']}/{MAX_API_CALLS})")
+                total_new_items += item_count
+                progress['total_collected'] += item_count
                 
-                # 데이터가 있으면 저장
-                if xml_content and item_count > 0:
-                    # 연도별 파일에 저장
-                    local_path, filename = append_to_year_file(job, year, xml_content)
-                    
-                    # ✅ Shared Drive에 업로드
-                    upload_success = upload_file_to_shared_drive(local_path, filename)
-                    if upload_success:
-                        uploaded_files.append(filename)
-                        log(f"☁️ Shared Drive 업로드 완료: {filename}")
+                log(f"✅ 수집 완료: {item_count:,}건")
+            else:
+                log(f"ℹ️ 데이터 없음: {job} {year}년 {month}월")
+            
+            outcome = settle_month(
+                progress, checkpoint, summary, error, should_stop(),
+                data_saved=item_count == 0 or upload_success
+            )
+            next_year = year
+            if outcome in ("done", "skip"):
+                if planner is not None:
+                    planner.mark_fetched(job, year, month, checkpoint.items)
+                if coverage is not None:
+                    coverage.record_month(job, year, month, client, checkpoint.items, error=error)
+                # 다음 기간으로 이동
+                next_year = advance_progress(progress, job, year, month)
+            save_progress_locally(progress)
+            
+            if outcome == "stop":
+                log(f"⏸️ 다음 실행에서 이어서 수집: {job} {year}년 {month}월")
+                break
+            
+            # 2025년을 넘어가면 중단
+            if next_year > LAST_YEAR:
+                log("🎉 모든 데이터 수집 완료! (2024-2025)")
+                break
+            
+            # API 한도 도달 확인
+            if sync_quota(progress, ledger) >= MAX_API_CALLS:
+                log(f"📊 일일 API 한도 도달: {progress['daily_api_calls']}/{MAX_API_CALLS}")
+                break
+            reason = should_stop()
+            if reason:
+                log(f"⏸️ 수집 종료: {reason}")
+                break
+        
+        if planner is not None:
+            # 남은 예산은 다음 실행을 위한 probe에 사용 (API 장애 중이면 생략)
+            remaining = MAX_API_CALLS - sync_quota(progress, ledger)
+            if remaining > 0 and progress['current_year'] <= LAST_YEAR and not should_stop():
+                planner.prefetch(
+                    upcoming_periods(progress['current_job'], progress['current_year'],
+                                     progress['current_month'], PLAN_LOOKAHEAD),
+                    remaining
+                )
+                sync_quota(progress, ledger)
+            progress['collection_plan'] = planner.to_dict()
+        if coverage is not None:
+            progress['coverage'] = coverage.to_dict()
+        progress['key_pool'] = key_pool.to_dict()
+        save_latency_profile(progress, timeouts)
+        save_page_sizes(progress, page_sizes)
+        
+        log_concurrency_metrics(controller)
+        log_hedging_stats(hedging)
+        log_archive_stats(archive)
+        get_shared_stats().log_stats()
+        log_quota_usage(ledger, MAX_API_CALLS)
+        key_pool.log_usage()
+        save_detail_fanout(fanout)
+        update_join_links()
+        finish_run(progress, total_new_items, uploaded_files, breaker)
+        
+        return True
+        
+    except Exception as e:
+        error_msg = f"❌ G2B 수집 실패: {str(e)}\n```{traceback.format_exc()}```"
+        log(error_msg)
+        send_slack_message(error_msg)
+        return False
+
+def check_plan(planner, progress, ledger, job, year, month, fetched_months):
+    """
+    수집 계획으로 이번 달을 어떻게 할지 결정
+    
+    예상 호출 수는 체크포인트에 이미 저장한 페이지를 뺀 값입니다. 이미 시작한 월과
+    이번 실행의 첫 월은 예산이 모자라도 수집합니다 (페이지 체크포인트로 다음 실행에서
+    이어가므로). 그렇지 않으면 변경분/상세/측정 단계가 예산을 먼저 쓰는 날마다
+    같은 월에서 멈춰 수집이 진행되지 않습니다.
+    
+    Returns:
+        str: "fetch" (수집), "skip" (계획상 0건 - 호출 없이 건너뜀),
+             "stop" (남은 예산으로 끝까지 못 받음 - 다음 실행에서 이 월부터)
+    """
+    entry, _ = planner.ensure(job, year, month)
+    remaining = MAX_API_CALLS - sync_quota(progress, ledger)
+    if entry is None:
+        # probe 실패 시에는 기존 방식대로 수집
+        return "fetch" if remaining > 0 else "stop"
+    
+    checkpoint = saved_checkpoint(progress, job, year, month)
+    committed = checkpoint.pages if checkpoint is not None else 0
+    cost = planner.estimated_calls(entry, committed)
+    if cost == 0:
+        log(f"ℹ️ 계획상 데이터 없음: {job} {year}년 {month}월 (호출 생략)")
+        planner.mark_fetched(job, year, month, 0)
+        return "skip"
+    
+    if cost > remaining:
+        if remaining > 0 and checkpoint is not None:
+            log(f"⏩ 예산 부족이지만 이미 시작한 월: {job} {year}년 {month}월 "
+                f"(남은 예상 {cost}회 > 남은 {remaining}회, {committed}페이지 저장됨) → 이어서 수집")
+            return "fetch"
+        if remaining > 0 and fetched_months == 0:
+            log(f"⚠️ 남은 예산을 넘는 월: {job} {year}년 {month}월 (예상 {cost}회 > 남은 {remaining}회) "
+                f"→ 체크포인트로 나눠서 수집")
+            return "fetch"
+        log(f"⏸️ 예산 부족: {job} {year}년 {month}월 예상 {cost}회 > 남은 {remaining}회 → 다음 실행에서 수집")
+        return "stop"
+    
+    log(f"🗺️ 계획: {job} {year}년 {month}월 {entry['total_count']:,}건, 예상 {cost}회 "
+        f"(남은 {remaining}회{f', {committed}페이지 저장됨' if committed else ''})")
+    return "fetch"
+
+def collect_job_worker(job, progress, budget, lock, uploaded_files, controller=None,
+                       coverage=None, key_pool=None, hedging=None, timeouts=None,
+                       breaker=None, archive=None, fanout=None, page_sizes=None):
+    """
+    한 업무의 커서를 따라 월 단위로 수집 (병렬 모드 워커)
+    
+    controller를 넘기면 모든 워커가 같은 동시성 한도를, key_pool을 넘기면
+    같은 서비스키 풀(키별 장부/퇴출)을 공유합니다.
+    
+    Returns:
+        int: 이 워커가 수집한 건수
+    """
+    client = create_client(controller, budget.ledger, key_pool, hedging, timeouts, breaker, archive,
+                           page_sizes)
+    cursor = progress['job_cursors'][job]
+    should_stop = make_stop_check(budget.ledger, client.key_pool, breaker)
+    collected = 0
+    
+    while budget.available():
+        year, month = cursor['year'], cursor['month']
+        if year > LAST_YEAR:
+            log(f"🎉 [{job}] 모든 데이터 수집 완료")
+            break
+        
+        if is_covered(coverage, None, job, year, month):
+            with lock:
+                advance_job_cursor(progress, cursor, year, month)
+            continue
+        
+        log(f"📥 [{job}] 수집 시작: {year}년 {month}월")
+        
+        checkpoint = open_checkpoint(progress, client, job, year, month)
+        stored_before = checkpoint.items
+        summary = FetchSummary()
+        error = None
+        try:
+            # 업무별로 파일이 분리되어 있으므로 워커 간 충돌 없음
+            store_month(client, job, year, month, summary, checkpoint, should_stop, fanout)
+        except Exception as e:
+            error = str(e)
+            log(f"⚠️ [{job}] 수집 실패: {year}년 {month}월 - {e}")
+        item_count = checkpoint.items - stored_before
+        total_calls = budget.refresh()
+        log(f"📊 [{job}] API 사용: +{summary.api_calls_used} (총 {total_calls}/{MAX_API_CALLS})")
+        
+        upload_success = False
+        if item_count > 0:
+            local_path, filename = year_file_path(job, year)
+            upload_success = upload_file_to_shared_drive(local_path, filename)
+            if upload_success:
+                with lock:
+                    uploaded_files.append(filename)
+                log(f"☁️ Shared Drive 업로드 완료: {filename}")
+            
+            collected += item_count
+            with lock:
+                progress['total_collected'] += item_count
+            log(f"✅ [{job}] 수집 완료: {item_count:,}건")
+        else:
+            log(f"ℹ️ [{job}] 데이터 없음: {year}년 {month}월")
+        
+        outcome = settle_month(
+            progress, checkpoint, summary, error, should_stop(),
+            data_saved=item_count == 0 or upload_success, lock=lock
+        )
+        if outcome in ("done", "skip") and coverage is not None:
+            coverage.record_month(job, year, month, client, checkpoint.items, error=error)
+        
+        with lock:
+            if outcome in ("done", "skip"):
+                advance_job_cursor(progress, cursor, year, month)
+            save_progress_locally(progress)
+        
+        if outcome == "stop":
+            log(f"⏸️ [{job}] 다음 실행에서 이어서 수집: {year}년 {month}월")
+            break
+    
+    return collected
+
+def advance_job_cursor(progress, cursor, year, month):
+    """업무 내에서만 다음 달로 이동 (호출 측에서 lock 보유)"""
+    if month < 12:
+        cursor['month'] = month + 1
+    else:
+        cursor['year'], cursor['month'] = year + 1, 1
+    sync_legacy_cursor(progress)
+
+def main_parallel():
+    """업무별 커서/워커로 병렬 수집 (일일 예산은 공유)"""
+    try:
+        log("🚀 G2B 데이터 수집 시작 (업무별 병렬 모드)")
+        
+        progress = load_progress()
+        if not progress:
+            return False
+        
+        init_job_cursors(progress)
+        lock = threading.Lock()
+        ledger = load_quota_ledger(progress)
+        key_pool = load_key_pool(progress, ledger)
+        budget = QuotaBudget(progress, ledger, MAX_API_CALLS, lock)
+        controller = create_concurrency_controller()
+        hedging = create_hedge_policy()
+        timeouts = load_latency_profile(progress)
+        breaker = create_circuit_breaker()
+        archive = create_response_archive()
+        coverage = load_coverage(progress)
+        fanout = create_detail_fanout()
+        page_sizes = load_page_sizes(progress)
+        uploaded_files = []
+        
+        if USE_REFRESH or fanout is not None or TUNE_PAGE_SIZES:
+            # 워커를 시작하기 전에 페이지 크기 측정, 최근 변경된 계약과 쌓인 상세 수집 대기열을 먼저 처리
+            client = create_client(controller, ledger, key_pool, hedging, timeouts, breaker, archive,
+                                   page_sizes)
+            should_stop = make_stop_check(ledger, key_pool, breaker)
+            tune_page_sizes(page_sizes, client, should_stop)
+            if USE_REFRESH:
+                refresh_changes(progress, client, ledger, should_stop, uploaded_files)
+            run_detail_fanout(fanout, client, ledger, should_stop, uploaded_files)
+        
+        with ThreadPoolExecutor(max_workers=len(JOBS)) as executor:
+            futures = {
+                job: executor.submit(
+                    collect_job_worker, job, progress, budget, lock, uploaded_files,
+                    controller, coverage, key_pool, hedging, timeouts, breaker, archive, fanout,
+                    page_sizes
+                )
+                for job in JOBS
+            }
+            total_new_items = 0
+            for job, future in futures.items():
+                try:
+                    total_new_items += future.result()
+                except Exception as e:
+                    log(f"⚠️ [{job}] 워커 오류: {e}")
+        
+        sync_legacy_cursor(progress)
+        if coverage is not None:
+            progress['coverage'] = coverage.to_dict()
+        progress['key_pool'] = key_pool.to_dict()
+        save_latency_profile(progress, timeouts)
+        save_page_sizes(progress, page_sizes)
+        if sync_quota(progress, ledger) >= MAX_API_CALLS:
+            log(f"📊 일일 API 한도 도달: {progress['daily_api_calls']}/{MAX_API_CALLS}")
+        
+        log_concurrency_metrics(controller)
+        log_hedging_stats(hedging)
+        log_archive_stats(archive)
+        get_shared_stats().log_stats()
+        log_quota_usage(ledger, MAX_API_CALLS)
+        key_pool.log_usage()
+        save_detail_fanout(fanout)
+        update_join_links()
+        finish_run(progress, total_new_items, uploaded_files, breaker)
+        
+        return True
+        
+    except Exception as e:
+        error_msg = f"❌ G2B 수집 실패: {str(e)}\n```{traceback.format_exc()}```"
+        log(error_msg)
+        send_slack_message(error_msg)
+        return False
+
+async def _upload_in_background(local_path, filename, uploaded_files):
+    """Drive 업로드를 스레드에서 실행 (이벤트 루프는 다음 수집 진행)"""
+    upload_success = await asyncio.to_thread(upload_file_to_shared_drive, local_path, filename)
+    if upload_success:
+        uploaded_files.append(filename)
+        log(f"☁️ Shared Drive 업로드 완료: {filename}")
+    return upload_success
+
+async def store_month_async(client, job, year, month, summary, checkpoint, should_stop,
+                            fanout=None, pending_upload=None):
+    """
+    store_month의 asyncio 버전 (페이지마다 연도별 파일에 추가하고 체크포인트 커밋)
+    
+    pending_upload를 넘기면 첫 페이지를 쓰기 전에 직전 월 업로드가 끝나기를 기다립니다.
+    """
+    local_path = filename = None
+    pages = client.iter_batches(job, year, month, summary=summary, resume=checkpoint.resume_state())
+    try:
+        async for page in pages:
+            if local_path is None and pending_upload is not None:
+                # 이전 업로드가 끝나야 파일을 다시 쓸 수 있음
+                await pending_upload
+            data = items_to_xml(page.items).encode('utf-8')
+            local_path, filename = append_to_year_file(job, year, data)
+            file_size = os.path.getsize(local_path)
+            checkpoint.sync_windows(summary.window_report)
+            checkpoint.commit_page(page, data, filename, file_size, file_size - len(data) - 8)
+            checkpoint.save(checkpoint_path(job, year))
+            if fanout is not None:
+                fanout.enqueue(job, page.items)
+            log(f"✅ 페이지 {page.page_no}: {len(page.items)}건 수집 (총 {summary.item_count}건)")
+            reason = should_stop()
+            if reason:
+                log(f"⏸️ 수집 중단 ({reason}): {job} {year}년 {month}월 페이지 {page.page_no}까지 저장")
+                break
+    finally:
+        await pages.aclose()
+    checkpoint.sync_windows(summary.window_report)
+    checkpoint.save(checkpoint_path(job, year))
+    if local_path:
+        log(f"📝 파일 업데이트: {filename}")
+    return local_path, filename
+
+async def main_async():
+    """
+    AsyncG2BClient로 하나의 이벤트 루프에서 수집
+
+    월 단위 페이지는 동시에 요청하고, 직전 월의 Drive 업로드는
+    다음 월 수집과 겹쳐서 진행합니다. (같은 파일을 다시 쓰기 전에 업로드 완료를 기다림)
+    main()과 같이 페이지마다 체크포인트를 커밋하고, 멈추거나 실패한 월은
+    커서를 옮기지 않고 다음 실행에서 체크포인트부터 이어서 수집합니다.
+    페이지 크기 측정/변경분/상세 수집/수집 계획 probe는 단건 요청이라 같은 장부/키 풀/서킷을
+    공유하는 동기 클라이언트로 실행하고, 중복 요청(G2B_HEDGE)은 이 모드에서 쓰지 않습니다.
+    """
+    try:
+        log("🚀 G2B 데이터 수집 시작 (asyncio 모드)")
+        
+        progress = await asyncio.to_thread(load_progress)
+        if not progress:
+            return False
+        
+        total_new_items = 0
+        uploaded_files = []
+        pending_upload = None
+        
+        if USE_HEDGING:
+            log("ℹ️ asyncio 모드에서는 중복 요청(G2B_HEDGE)을 사용하지 않음 - 페이지를 이미 동시에 요청")
+        controller = create_concurrency_controller()
+        ledger = load_quota_ledger(progress)
+        key_pool = load_key_pool(progress, ledger)
+        timeouts = load_latency_profile(progress)
+        breaker = create_circuit_breaker()
+        archive = create_response_archive()
+        fanout = create_detail_fanout()
+        page_sizes = load_page_sizes(progress)
+        coverage = load_coverage(progress)
+        should_stop = make_stop_check(ledger, key_pool, breaker)
+        # 단건 요청 단계용 동기 클라이언트 (같은 장부/키 풀/서킷 공유)
+        sync_client = create_client(controller, ledger, key_pool, None, timeouts, breaker, archive, page_sizes)
+        planner = CollectionPlanner(sync_client, progress.get('collection_plan')) if USE_PLAN else None
+        fetched_months = 0
+        
+        await asyncio.to_thread(tune_page_sizes, page_sizes, sync_client, should_stop)
+        if USE_REFRESH:
+            await asyncio.to_thread(refresh_changes, progress, sync_client, ledger, should_stop, uploaded_files)
+        await asyncio.to_thread(run_detail_fanout, fanout, sync_client, ledger, should_stop, uploaded_files)
+        async with AsyncG2BClient(
+            API_KEY, max_concurrency=MAX_WORKERS, concurrency=controller, ledger=ledger,
+            parser=XML_PARSER, response_format=RESPONSE_FORMAT, key_pool=key_pool,
+            timeouts=timeouts, breaker=breaker, page_sizes=page_sizes if AUTO_PAGE_SIZE else None,
+            split_threshold=SPLIT_THRESHOLD, split_latency=SPLIT_LATENCY, archive=archive
+        ) as client:
+            while progress['daily_api_calls'] < MAX_API_CALLS:
+                job = progress['current_job']
+                year = progress['current_year']
+                month = progress['current_month']
+                
+                if is_covered(coverage, planner, job, year, month):
+                    if advance_progress(progress, job, year, month) > LAST_YEAR:
+                        log("🎉 모든 데이터 수집 완료! (2024-2025)")
+                        break
+                    continue
+                
+                if planner is not None:
+                    decision = await asyncio.to_thread(
+                        check_plan, planner, progress, ledger, job, year, month, fetched_months
+                    )
+                    if decision == "stop":
+                        break
+                    if decision == "skip":
+                        if advance_progress(progress, job, year, month) > LAST_YEAR:
+                            log("🎉 모든 데이터 수집 완료! (2024-2025)")
+                            break
+                        continue
+                
+                log(f"📥 수집 시작: {job} {year}년 {month}월")
+                fetched_months += 1
+                
+                checkpoint = open_checkpoint(progress, client, job, year, month)
+                stored_before = checkpoint.items
+                summary = FetchSummary()
+                error = None
+                try:
+                    # 페이지가 도착하는 대로 연도별 파일에 저장하고 페이지마다 체크포인트 커밋
+                    await store_month_async(client, job, year, month, summary, checkpoint,
+                                            should_stop, fanout, pending_upload)
+                except Exception as e:
+                    error = str(e)
+                    log(f"⚠️ 수집 실패: {job} {year}년 {month}월 - {e}")
+                item_count = checkpoint.items - stored_before
+                
+                sync_quota(progress, ledger)
+                log(f"📊 API 사용: +{summary.api_calls_used} (총 {progress['daily_api_calls']}/{MAX_API_CALLS})")
+                
+                finished = error is None and summary.completed and not summary.failed_pages
+                upload_success = False
+                if item_count > 0:
+                    local_path, filename = year_file_path(job, year)
+                    pending_upload = asyncio.create_task(
+                        _upload_in_background(local_path, filename, uploaded_files)
+                    )
+                    if not finished:
+                        # 이어서 받을 월은 업로드가 끝나야 progress.json 체크포인트를 옮길 수 있음
+                        upload_success = await pending_upload
                     
                     total_new_items += item_count
                     progress['total_collected'] += item_count
@@ -238,59 +1476,77 @@ def main():
                 else:
                     log(f"ℹ️ 데이터 없음: {job} {year}년 {month}월")
                 
-                # 다음 기간으로 이동
-                next_job, next_year, next_month = get_next_period(job, year, month)
-                progress['current_job'] = next_job
-                progress['current_year'] = next_year
-                progress['current_month'] = next_month
+                outcome = settle_month(
+                    progress, checkpoint, summary, error, should_stop(),
+                    data_saved=item_count == 0 or upload_success
+                )
+                next_year = year
+                if outcome in ("done", "skip"):
+                    if planner is not None:
+                        planner.mark_fetched(job, year, month, checkpoint.items)
+                    if coverage is not None:
+                        coverage.record_month(job, year, month, client, checkpoint.items, error=error)
+                    next_year = advance_progress(progress, job, year, month)
+                save_progress_locally(progress)
                 
-                # 2025년을 넘어가면 중단
-                if next_year > 2025:
+                if outcome == "stop":
+                    log(f"⏸️ 다음 실행에서 이어서 수집: {job} {year}년 {month}월")
+                    break
+                
+                if next_year > LAST_YEAR:
                     log("🎉 모든 데이터 수집 완료! (2024-2025)")
                     break
-                    
-            except Exception as e:
-                log(f"⚠️ 수집 실패: {job} {year}년 {month}월 - {e}")
-                # 실패해도 다음으로 이동 (무한 루프 방지)
-                next_job, next_year, next_month = get_next_period(job, year, month)
-                progress['current_job'] = next_job
-                progress['current_year'] = next_year
-                progress['current_month'] = next_month
-            
-            # API 한도 도달 확인
-            if progress['daily_api_calls'] >= MAX_API_CALLS:
-                log(f"📊 일일 API 한도 도달: {progress['daily_api_calls']}/{MAX_API_CALLS}")
-                break
+                
+                if sync_quota(progress, ledger) >= MAX_API_CALLS:
+                    log(f"📊 일일 API 한도 도달: {progress['daily_api_calls']}/{MAX_API_CALLS}")
+                    break
+                reason = should_stop()
+                if reason:
+                    log(f"⏸️ 수집 종료: {reason}")
+                    break
         
-        # Progress 업데이트
-        progress['last_run_date'] = datetime.now().strftime('%Y-%m-%d')
-        
-        # Progress 파일 업로드
-        upload_success = upload_progress_json(progress, PROGRESS_FILE_ID)
-        
-        # 결과 슬랙 전송 (안전한 포맷팅)
-        message = (
-            f"🎯 **G2B 수집 완료**\n"
-            f"```\n"
-            f"• 진행: {progress['current_job']} {progress['current_year']}년 {progress['current_month']}월\n"
-            f"• 오늘 수집: {total_new_items:,}건\n"
-            f"• API 호출: {progress['daily_api_calls']}/{MAX_API_CALLS}\n"
-            f"• 누적: {progress['total_collected']:,}건\n"
-            f"• 업로드 파일: {len(uploaded_files)}개\n"
-            f"```"
-        )
+        if pending_upload:
+            await pending_upload
+        if planner is not None:
+            # 남은 예산은 다음 실행을 위한 probe에 사용 (API 장애 중이면 생략)
+            remaining = MAX_API_CALLS - sync_quota(progress, ledger)
+            if remaining > 0 and progress['current_year'] <= LAST_YEAR and not should_stop():
+                await asyncio.to_thread(
+                    planner.prefetch,
+                    upcoming_periods(progress['current_job'], progress['current_year'],
+                                     progress['current_month'], PLAN_LOOKAHEAD),
+                    remaining
+                )
+                sync_quota(progress, ledger)
+            progress['collection_plan'] = planner.to_dict()
+        if coverage is not None:
+            progress['coverage'] = coverage.to_dict()
+        progress['key_pool'] = key_pool.to_dict()
+        save_latency_profile(progress, timeouts)
+        save_page_sizes(progress, page_sizes)
         
-        send_slack_message(message)
-        log("🎉 수집 작업 완료")
+        log_concurrency_metrics(controller)
+        log_archive_stats(archive)
+        get_shared_stats().log_stats()
+        log_quota_usage(ledger, MAX_API_CALLS)
+        key_pool.log_usage()
+        save_detail_fanout(fanout)
+        await asyncio.to_thread(update_join_links)
+        await asyncio.to_thread(finish_run, progress, total_new_items, uploaded_files, breaker)
         
         return True
         
     except Exception as e:
         error_msg = f"❌ G2B 수집 실패: {str(e)}\n```{traceback.format_exc()}```"
         log(error_msg)
-        send_slack_message(error_msg)
+        await asyncio.to_thread(send_slack_message, error_msg)
         return False
 
 if __name__ == "__main__":
-    success = main()
+    if PARALLEL_JOBS:
+        success = main_parallel()
+    elif USE_ASYNC:
+        success = asyncio.run(main_async())
+    else:
+        success = main()
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -1,7 +1,11 @@
 import os
-import requests
+import sys
 from dotenv import load_dotenv
 
+# 프로젝트 루트(utils가 있는 곳)를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from utils.transport import create_session
+
 # .env 파일 로드
 load_dotenv()
 
@@ -29,7 +33,8 @@ params = {
 try:
     print("📡 2024년 데이터(물품 계약) 요청 중... (Timeout 30초)")
     # 타임아웃을 넉넉하게 30초 줌 (본 코드는 180초로 설정했음)
-    response = requests.get(url, params=params, timeout=30)
+    # 수집기와 같은 전송 설정 (keep-alive, 압축, DNS 캐시)
+    response = create_session(pool_size=1).get(url, params=params, timeout=30)
 
     print(f"✅ 응답 코드: {response.status_code}")
 
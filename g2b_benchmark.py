@@ -0,0 +1,435 @@
+"""
+G2B 수집 성능 벤치마크
+
+사용법:
+    python g2b_benchmark.py parsers [응답.xml ...]   # XML 파서 백엔드 비교
+    python g2b_benchmark.py formats [--live]         # XML/JSON 응답 형식 비교
+    python g2b_benchmark.py replay data/raw          # 보관한 원본 응답으로 월 재처리 (API 호출 없음)
+    python g2b_benchmark.py transport [--live]       # 커넥션 재사용 비교 (요청마다 연결 vs 공용 세션)
+    python g2b_benchmark.py pagesize --archive data/raw [--live]  # numOfRows별 호출당 item/바이트/지연/오류율
+
+응답 파일을 주지 않으면 실제 계약정보 응답과 같은 모양의 999건 페이지를 만들어 사용합니다.
+실제 응답은 예) curl "...&numOfRows=999&type=xml" -o page.xml 로 저장해 두면 됩니다.
+"""
+import os
+import sys
+import gzip
+import json
+import time
+import hashlib
+import argparse
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.g2b_client import G2BClient, parse_response, parse_response_stream, parse_page, month_window
+from utils.xml_parsers import BACKENDS
+from utils.response_archive import ResponseArchive
+from utils.transport import TransportStats, create_session
+from utils.page_size import PageSizeTuner, parse_sizes
+
+# 계약정보 item의 대표 필드
+SAMPLE_FIELDS = [
+    "untyCntrctNo", "bsnsDivNm", "dcsnCntrctNo", "cntrctRefNo", "cntrctNm",
+    "cmmnCntrctYn", "lngtrmCtnuDivNm", "cntrctCnclsDate", "cntrctPrd",
+    "baseLawNm", "totCntrctAmt", "thtmCntrctAmt", "grntymnyRate", "cntrctInfoUrl",
+    "payDivNm", "reqNo", "ntceNo", "cntrctInsttCd", "cntrctInsttNm",
+    "cntrctInsttJrsdctnDivNm", "cntrctInsttChrgDeptNm", "cntrctInsttOfclNm",
+    "dminsttList", "corpList", "cntrctDtlInfoUrl", "crdtrNm", "baseDtls",
+    "cntrctDate", "rgstDt", "chgDt"
+]
+
+
+def _sample_value(name, i):
+    return f"{name}-{i} 나라장터 계약 & 조달 {i * 1000}"
+
+
+def make_sample_page(rows=999, total_count=48211):
+    """999건짜리 계약정보 응답과 같은 모양의 XML(bytes) 생성"""
+    items = []
+    for i in range(rows):
+        fields = "".join(
+            f"<{name}>{_sample_value(name, i).replace('&', '&amp;')}</{name}>"
+            for name in SAMPLE_FIELDS
+        )
+        items.append(f"<item>{fields}</item>")
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        "<response><header><resultCode>00</resultCode><resultMsg>정상</resultMsg></header>"
+        f"<body><items>{''.join(items)}</items><numOfRows>{rows}</numOfRows>"
+        f"<pageNo>1</pageNo><totalCount>{total_count}</totalCount></body></response>"
+    ).encode("utf-8")
+
+
+def make_sample_json_page(rows=999, total_count=48211):
+    """make_sample_page와 같은 내용의 type=json 응답(bytes) 생성"""
+    items = [{name: _sample_value(name, i) for name in SAMPLE_FIELDS} for i in range(rows)]
+    return json.dumps({
+        "response": {
+            "header": {"resultCode": "00", "resultMsg": "정상"},
+            "body": {"items": items, "numOfRows": rows, "pageNo": 1, "totalCount": total_count}
+        }
+    }, ensure_ascii=False).encode("utf-8")
+
+
+def load_pages(paths):
+    if not paths:
+        return [make_sample_page()]
+    pages = []
+    for path in paths:
+        with open(path, "rb") as f:
+            pages.append(f.read())
+    return pages
+
+
+def peak_rss_mb():
+    """프로세스 최대 RSS (MB)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _run_parser(backend, paths, repeat, streaming, queue):
+    """자식 프로세스에서 한 백엔드만 실행 (RSS를 백엔드별로 분리 측정)"""
+    pages = load_pages(paths)
+    baseline = peak_rss_mb()
+    items = 0
+    records = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            if streaming:
+                chunks = (page[i:i + 65536] for i in range(0, len(page), 65536))
+                parsed, _, error = parse_response_stream(chunks, backend)
+            else:
+                parsed, _, error = parse_response(page, backend)
+            if error:
+                raise RuntimeError(error)
+            items += len(parsed)
+            if not records:
+                records = parsed
+    elapsed = time.perf_counter() - started
+    queue.put({
+        "backend": backend,
+        "items": items,
+        "seconds": elapsed,
+        "baseline_mb": baseline,
+        "peak_mb": peak_rss_mb(),
+        "checksum": hashlib.sha256("\n".join(records).encode("utf-8")).hexdigest()
+    })
+
+
+def benchmark_parsers(paths, repeat, streaming):
+    pages = load_pages(paths)
+    total_bytes = sum(len(page) for page in pages)
+    print(f"📄 페이지 {len(pages)}개 ({total_bytes / 1024:.0f} KB) × {repeat}회, "
+          f"{'스트리밍' if streaming else '전체 본문'} 파싱")
+    print(f"🧩 사용 가능한 백엔드: {', '.join(BACKENDS)}")
+
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for backend in BACKENDS:
+        queue = context.Queue()
+        process = context.Process(target=_run_parser, args=(backend, paths, repeat, streaming, queue))
+        process.start()
+        results.append(queue.get())
+        process.join()
+
+    print(f"\n{'백엔드':<8} {'items/sec':>12} {'초':>8} {'최대 RSS(MB)':>14} {'증가(MB)':>10}")
+    for result in results:
+        rate = result["items"] / result["seconds"] if result["seconds"] else 0
+        peak = result["peak_mb"]
+        growth = peak - result["baseline_mb"] if peak is not None else None
+        print(f"{result['backend']:<8} {rate:>12,.0f} {result['seconds']:>8.2f} "
+              f"{peak if peak is not None else float('nan'):>14.1f} "
+              f"{growth if growth is not None else float('nan'):>10.1f}")
+
+    checksums = {result["checksum"] for result in results}
+    print("\n✅ 모든 백엔드의 item 레코드 동일" if len(checksums) == 1
+          else "\n❌ 백엔드별 item 레코드가 다릅니다")
+
+
+def _time_decode(body, response_format, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        items, _, error = parse_page((body,), response_format)
+        if error:
+            raise RuntimeError(error)
+    return (time.perf_counter() - started) / repeat, items
+
+
+def _fetch_live(response_format, job, year, month):
+    """실제 API에서 1페이지를 받아 (본문, 전송 바이트) 반환"""
+    client = G2BClient(os.getenv("API_KEY"), response_format=response_format)
+    start_date, end_date = month_window(year, month)
+    params = {
+        "serviceKey": client.api_key,
+        "numOfRows": client.NUM_OF_ROWS,
+        "pageNo": 1,
+        "inqryDiv": "1",
+        "inqryBgnDt": start_date,
+        "inqryEndDt": end_date,
+        "type": response_format
+    }
+    client.rate_limiter.acquire()
+    response = client.session.get(
+        f"{client.BASE_URL}/{client.OPERATION_MAP[job]}", params=params, timeout=60, stream=True
+    )
+    body = response.content
+    # 압축 해제 전 실제 수신 바이트
+    wire_bytes = response.raw.tell() or len(body)
+    response.close()
+    return body, wire_bytes
+
+
+def benchmark_formats(live, job, year, month, repeat):
+    if live:
+        if not os.getenv("API_KEY"):
+            print("❌ API_KEY 환경변수가 없습니다")
+            return
+        print(f"🌐 실제 API 응답: {job} {year}년 {month}월 1페이지")
+        bodies = {fmt: _fetch_live(fmt, job, year, month) for fmt in ("xml", "json")}
+    else:
+        print("📄 999건 예시 페이지 (전송 바이트는 gzip 압축 크기로 추정)")
+        bodies = {}
+        for fmt, body in (("xml", make_sample_page()), ("json", make_sample_json_page())):
+            bodies[fmt] = (body, len(gzip.compress(body)))
+
+    print(f"\n{'형식':<6} {'본문(KB)':>10} {'전송(KB)':>10} {'디코딩(ms)':>12} {'items':>7}")
+    records = {}
+    for fmt, (body, wire_bytes) in bodies.items():
+        seconds, items = _time_decode(body, fmt, repeat)
+        records[fmt] = items
+        print(f"{fmt:<6} {len(body) / 1024:>10.0f} {wire_bytes / 1024:>10.0f} "
+              f"{seconds * 1000:>12.1f} {len(items):>7}")
+
+    if not live:
+        print("\n✅ 두 형식의 item 레코드 동일" if records["xml"] == records["json"]
+              else "\n❌ 형식별 item 레코드가 다릅니다")
+
+
+def benchmark_replay(archive_dir, job, year, month, parser, response_format):
+    """G2B_ARCHIVE_DIR에 보관한 응답만으로 fetch_data 재처리 (CPU만 사용)"""
+    archive = ResponseArchive(archive_dir)
+    client = G2BClient(None, archive=archive, replay=True, parser=parser,
+                       response_format=response_format)
+    print(f"🗄️ {archive_dir}에서 재처리: {job} {year}년 {month}월 (파서 {client.parser})")
+    started = time.perf_counter()
+    xml_content, count, api_calls = client.fetch_data(job, year, month)
+    elapsed = time.perf_counter() - started
+
+    print(f"\n{'items':>7} {'초':>8} {'items/sec':>12} {'API 호출':>9} {'보관 응답':>9} {'없음':>5}")
+    print(f"{count:>7} {elapsed:>8.2f} {count / elapsed if elapsed else 0:>12,.0f} "
+          f"{api_calls:>9} {archive.hits:>9} {archive.misses:>5}")
+    print(f"🔑 XML sha256: {hashlib.sha256(xml_content.encode('utf-8')).hexdigest()[:16]}")
+    if client.last_failed_pages:
+        print(f"❌ 보관되지 않은 페이지: {client.last_failed_pages}")
+
+
+def benchmark_page_sizes(archive_dir, live, job, year, month, sizes, repeat):
+    """
+    같은 월 1페이지를 numOfRows별로 받아 비교 (PageSizeTuner.sweep과 같은 측정)
+
+    --live면 실제 API로 측정하고 --archive가 있으면 응답을 보관해 두며,
+    --live 없이 --archive만 주면 보관한 응답으로 다시 측정합니다 (지연은 파싱 시간만).
+    """
+    archive = ResponseArchive(archive_dir) if archive_dir else None
+    if live:
+        if not os.getenv("API_KEY"):
+            print("❌ API_KEY 환경변수가 없습니다")
+            return
+        client = G2BClient(os.getenv("API_KEY"), archive=archive)
+        print(f"🌐 실제 API: {job} {year}년 {month}월 1페이지 × 크기 {len(sizes)}개 × {repeat}회 "
+              f"(최대 API 호출 {len(sizes) * repeat}회)")
+    elif archive is not None:
+        client = G2BClient(None, archive=archive, replay=True)
+        print(f"🗄️ {archive_dir}의 보관 응답: {job} {year}년 {month}월 1페이지 (지연은 파싱 시간)")
+    else:
+        print("❌ --live 또는 --archive가 필요합니다")
+        return
+
+    operation = client.OPERATION_MAP[job]
+    tuner = PageSizeTuner()
+    start_date, end_date = month_window(year, month)
+    rows, api_calls = tuner.sweep(client, operation, start_date, end_date, sizes, repeat)
+
+    print(f"\n{'numOfRows':>9} {'호출':>5} {'오류율':>7} {'items/호출':>11} {'KB/호출':>9} {'지연(s)':>8}")
+    for size, calls, error_rate, per_call, kilobytes, latency in tuner.report(operation):
+        print(f"{size:>9} {calls:>5} {error_rate:>7.0%} {per_call:>11,.0f} {kilobytes:>9,.0f} "
+              f"{latency if latency is not None else float('nan'):>8.2f}")
+    print(f"\n📏 선택: {rows if rows is not None else '없음 (측정 가능한 크기 없음)'} (API 호출 {api_calls}회)")
+    print("   수집에 반영하려면 G2B_TUNE_PAGE_SIZES로 실행해 progress.json에 저장하세요")
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    """keep-alive로 예시 페이지를 돌려주는 로컬 서버 (연결 수를 서버 쪽에서 셈)"""
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        body = self.server.body
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = self.server.gzipped
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _start_page_server(body):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PageHandler)
+    server.daemon_threads = True
+    server.body = body
+    server.gzipped = gzip.compress(body)
+    server.lock = threading.Lock()
+    server.connections = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _run_requests(get, url, params, count, workers):
+    """count개 요청을 workers개 스레드로 보내고 걸린 시간(초) 반환"""
+    def call(_):
+        response = get(url, params=params, timeout=30)
+        response.raise_for_status()
+        response.content
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(call, range(count)))
+    return time.perf_counter() - started
+
+
+def benchmark_transport(live, job, count, workers):
+    """요청마다 새로 연결할 때와 공용 세션(create_session)의 커넥션 재사용 비교"""
+    if live:
+        if not os.getenv("API_KEY"):
+            print("❌ API_KEY 환경변수가 없습니다")
+            return
+        client = G2BClient(os.getenv("API_KEY"))
+        start_date, end_date = month_window(2024, 1)
+        url = f"{client.BASE_URL}/{client.OPERATION_MAP[job]}"
+        params = {
+            "serviceKey": client.api_key, "numOfRows": 1, "pageNo": 1, "inqryDiv": "1",
+            "inqryBgnDt": start_date, "inqryEndDt": end_date
+        }
+        print(f"🌐 실제 API: {job} numOfRows=1 × {count}회 (API 호출 {count * 3}회 사용)")
+        server = None
+    else:
+        server = _start_page_server(make_sample_page(rows=10))
+        url = f"http://127.0.0.1:{server.server_address[1]}/getCntrctInfoListThng"
+        params = {"numOfRows": 10, "pageNo": 1}
+        print(f"📄 로컬 keep-alive 서버: 10건 페이지 × {count}회, 워커 {workers}개")
+
+    def one_shot(stats):
+        # requests.get과 같이 요청마다 세션(=커넥션)을 새로 만듦
+        def get(*args, **kwargs):
+            with create_session(pool_size=1, stats=stats) as session:
+                return session.get(*args, **kwargs)
+        return get
+
+    def default_pool(stats):
+        # 풀 크기를 맞추지 않은 세션 (requests 기본 10개)
+        return create_session(pool_size=requests.adapters.DEFAULT_POOLSIZE, stats=stats).get
+
+    def shared(stats):
+        return create_session(pool_size=workers, stats=stats).get
+
+    print(f"\n{'방식':<22} {'요청':>6} {'새 커넥션':>10} {'재사용률':>9} {'초':>8} {'req/s':>8}")
+    for name, factory in (("요청마다 연결", one_shot),
+                          (f"세션 (풀 {requests.adapters.DEFAULT_POOLSIZE})", default_pool),
+                          (f"공용 세션 (풀 {workers})", shared)):
+        stats = TransportStats()
+        before = server.connections if server else 0
+        seconds = _run_requests(factory(stats), url, params, count, workers)
+        if server:
+            # 로컬 서버가 실제로 받은 연결 수 (클라이언트 통계와 교차 확인)
+            connections = server.connections - before
+        else:
+            connections = sum(counts["connections"] for counts in stats.metrics()["hosts"].values())
+        reuse = max(0.0, 1 - connections / count)
+        print(f"{name:<22} {count:>6} {connections:>10} {reuse:>9.0%} {seconds:>8.2f} {count / seconds:>8.0f}")
+
+    if server:
+        server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="G2B 수집 성능 벤치마크")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    parsers_cmd = sub.add_parser("parsers", help="XML 파서 백엔드 비교 (items/sec, 최대 RSS)")
+    parsers_cmd.add_argument("pages", nargs="*", help="저장해 둔 999건 응답 XML 파일")
+    parsers_cmd.add_argument("--repeat", type=int, default=20)
+    parsers_cmd.add_argument("--streaming", action="store_true", help="64KB 청크 스트리밍 파싱으로 측정")
+
+    formats_cmd = sub.add_parser("formats", help="XML/JSON 응답 형식 비교 (전송 바이트, 디코딩 시간)")
+    formats_cmd.add_argument("--live", action="store_true", help="실제 API 응답으로 측정 (API_KEY 필요)")
+    formats_cmd.add_argument("--job", default="물품", choices=list(G2BClient.OPERATION_MAP))
+    formats_cmd.add_argument("--year", type=int, default=2024)
+    formats_cmd.add_argument("--month", type=int, default=1)
+    formats_cmd.add_argument("--repeat", type=int, default=10)
+
+    replay_cmd = sub.add_parser("replay", help="보관한 원본 응답으로 월 재처리 (할당량 사용 없음)")
+    replay_cmd.add_argument("archive", help="G2B_ARCHIVE_DIR로 보관한 디렉터리")
+    replay_cmd.add_argument("--job", default="물품", choices=list(G2BClient.OPERATION_MAP))
+    replay_cmd.add_argument("--year", type=int, default=2024)
+    replay_cmd.add_argument("--month", type=int, default=1)
+    replay_cmd.add_argument("--parser", default="auto", help="XML 파서 백엔드 (etree/expat/lxml)")
+    replay_cmd.add_argument("--format", default="xml", choices=["xml", "json", "auto"],
+                            help="보관할 때 쓴 응답 형식 (요청 파라미터가 달라 키도 다름)")
+
+    transport_cmd = sub.add_parser("transport", help="커넥션 재사용 비교 (새 커넥션 수, 재사용률, req/s)")
+    transport_cmd.add_argument("--live", action="store_true", help="실제 API로 측정 (API_KEY 필요, 호출 할당량 사용)")
+    transport_cmd.add_argument("--job", default="물품", choices=list(G2BClient.OPERATION_MAP))
+    transport_cmd.add_argument("--count", type=int, default=200, help="방식별 요청 수 (--live면 작게)")
+    transport_cmd.add_argument("--workers", type=int, default=16, help="동시 요청 스레드 수")
+
+    pagesize_cmd = sub.add_parser("pagesize", help="numOfRows별 호출당 item 수, 바이트, 지연, 오류율 비교")
+    pagesize_cmd.add_argument("--archive", help="응답 보관 디렉터리 (--live 없으면 보관 응답으로 측정)")
+    pagesize_cmd.add_argument("--live", action="store_true", help="실제 API로 측정 (API_KEY 필요, 호출 할당량 사용)")
+    pagesize_cmd.add_argument("--job", default="물품", choices=list(G2BClient.OPERATION_MAP))
+    pagesize_cmd.add_argument("--year", type=int, default=2024)
+    pagesize_cmd.add_argument("--month", type=int, default=1)
+    pagesize_cmd.add_argument("--sizes", default="", help="쉼표로 구분한 numOfRows (기본 100,500,999,1000,2000,5000)")
+    pagesize_cmd.add_argument("--repeat", type=int, default=1)
+
+    args = parser.parse_args()
+    if args.command == "parsers":
+        benchmark_parsers(args.pages, args.repeat, args.streaming)
+    elif args.command == "formats":
+        benchmark_formats(args.live, args.job, args.year, args.month, args.repeat)
+    elif args.command == "replay":
+        benchmark_replay(args.archive, args.job, args.year, args.month, args.parser, args.format)
+    elif args.command == "pagesize":
+        benchmark_page_sizes(args.archive, args.live, args.job, args.year, args.month,
+                             parse_sizes(args.sizes), args.repeat)
+    elif args.command == "transport":
+        benchmark_transport(args.live, args.job, args.count, args.workers)
+
+
+if __name__ == "__main__":
+    main()
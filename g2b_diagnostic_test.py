@@ -3,6 +3,8 @@ import requests
 import time
 from datetime import datetime
 
+from utils.transport import create_session
+
 
 # .env 파일 로드 추가
 from dotenv import load_dotenv
@@ -26,6 +28,9 @@ def test_g2b_api():
 
     print(f"🌐 테스트 URL: {url}")
 
+    # 수집기와 같은 전송 설정 (keep-alive, 압축, DNS 캐시) - 요청끼리 커넥션 재사용
+    session = create_session(pool_size=1)
+
     # 2. API 명세에 맞는 정확한 파라미터
     params = {
         "ServiceKey": api_key,  # serviceKey → ServiceKey (대문자 S)
@@ -52,7 +57,7 @@ def test_g2b_api():
         start_time = time.time()
 
         try:
-            response = requests.get(url, params=params, timeout=timeout)
+            response = session.get(url, params=params, timeout=timeout)
             end_time = time.time()
 
             print(f"✅ 응답 성공! ({end_time - start_time:.1f}초)")
@@ -90,12 +95,16 @@ def test_g2b_api():
         params["inqryEndDt"] = end_date
 
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = session.get(url, params=params, timeout=30)
             print(
                 f"✅ {start_date[:8]}: HTTP {response.status_code}, {len(response.text)} bytes")
         except:
             print(f"❌ {start_date[:8]}: 실패")
 
+    # 5. 커넥션 재사용 확인
+    print("\n🔌 전송 통계")
+    session.transport_stats.log_stats()
+
 
 if __name__ == "__main__":
     print("🧪 G2B API 진단 테스트 시작")
@@ -0,0 +1,218 @@
+"""
+테스트 공용 fixture
+
+- fake_api: 로컬 HTTP 서버로 띄운 가짜 계약정보 API (XML 응답, 하루 per_day건씩 고정)
+- collector: Drive/Slack 대신 임시 폴더를 쓰도록 바꾼 collectors/g2b/collect_all 모듈
+"""
+import os
+import sys
+import json
+import types
+import asyncio
+import threading
+import importlib.util
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+# collect_all은 import 시점에 환경변수를 읽음 (속도 제한 없음, 테스트용 키 1개)
+os.environ.setdefault("API_KEY", "test-key")
+os.environ["G2B_RATE_LIMIT"] = "0"
+
+from utils.g2b_client import G2BClient  # noqa: E402
+from utils.g2b_async_client import AsyncG2BClient  # noqa: E402
+
+SERVICE_PATH = "/1230000/ao/CntrctInfoService"
+
+
+class FakeApi:
+    """
+    가짜 계약정보 API 상태
+
+    조회 구간의 날짜마다 per_day[오퍼레이션]건이 있고, item 키는 {오퍼레이션}-{YYYYMMDD}-{순번}이라
+    구간을 어떻게 나눠 받아도 같은 레코드는 같은 키로 돌아옵니다.
+    """
+
+    def __init__(self):
+        self.base_url = None
+        self.reset()
+
+    def reset(self):
+        self.per_day = {}
+        # {(구간 시작, 페이지 번호): HTTP 상태} - 이 페이지만 실패
+        self.fail_pages = {}
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def window_items(self, operation, start_date, end_date):
+        per_day = self.per_day.get(operation, 0)
+        day = datetime.strptime(start_date[:8], "%Y%m%d")
+        last = datetime.strptime(end_date[:8], "%Y%m%d")
+        keys = []
+        while day <= last:
+            keys.extend(f"{operation}-{day:%Y%m%d}-{i}" for i in range(per_day))
+            day += timedelta(days=1)
+        return keys
+
+    def requested_pages(self, operation, start_date, end_date):
+        """구간별로 요청된 페이지 번호 목록 (요청 순서)"""
+        return [
+            page for op, start, end, page in self.requests
+            if (op, start, end) == (operation, start_date, end_date)
+        ]
+
+    def respond(self, path):
+        url = urlparse(path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        operation = url.path.rsplit("/", 1)[-1]
+        start_date, end_date = query["inqryBgnDt"], query["inqryEndDt"]
+        rows, page = int(query["numOfRows"]), int(query["pageNo"])
+        with self._lock:
+            self.requests.append((operation, start_date, end_date, page))
+        status = self.fail_pages.get((start_date, page))
+        if status:
+            return status, b""
+
+        keys = self.window_items(operation, start_date, end_date)
+        items = "".join(
+            f"<item><untyCntrctNo>{key}</untyCntrctNo><cntrctNm>계약 {key}</cntrctNm></item>"
+            for key in keys[(page - 1) * rows:page * rows]
+        )
+        body = (
+            '<?xml version="1.0" encoding="UTF-8"?><response><header><resultCode>00</resultCode>'
+            f"<resultMsg>NORMAL SERVICE.</resultMsg></header><body><items>{items}</items>"
+            f"<numOfRows>{rows}</numOfRows><pageNo>{page}</pageNo><totalCount>{len(keys)}</totalCount>"
+            "</body></response>"
+        )
+        return 200, body.encode("utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    api = None
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        status, body = self.api.respond(self.path)
+        self.send_response(status)
+        self.send_header("Content-Type", "text/xml")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture(scope="session")
+def _fake_server():
+    api = FakeApi()
+    handler = type("Handler", (_Handler,), {"api": api})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api.base_url = f"http://127.0.0.1:{server.server_address[1]}{SERVICE_PATH}"
+    yield api
+    server.shutdown()
+
+
+@pytest.fixture
+def fake_api(_fake_server, monkeypatch):
+    _fake_server.reset()
+    monkeypatch.setattr(G2BClient, "BASE_URL", _fake_server.base_url)
+    monkeypatch.setattr(AsyncG2BClient, "BASE_URL", _fake_server.base_url)
+    return _fake_server
+
+
+@pytest.fixture(scope="session")
+def _collect_all_module():
+    # Drive 인증 모듈은 저장소 밖(배포 환경)에만 있음 - 업로드/다운로드는 아래에서 바꿔 끼움
+    auth = types.ModuleType("utils.auth")
+    auth.get_drive_service = lambda: None
+    sys.modules.setdefault("utils.auth", auth)
+    path = os.path.join(PROJECT_ROOT, "collectors", "g2b", "collect_all.py")
+    spec = importlib.util.spec_from_file_location("collect_all", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class Collector:
+    """collect_all 실행 도우미 (progress.json은 메모리의 drive dict에 올리고 내림)"""
+
+    def __init__(self, module, root):
+        self.module = module
+        self.root = root
+        self.drive = {
+            "progress": {
+                "current_job": "물품", "current_year": 2014, "current_month": 1,
+                "daily_api_calls": 0, "total_collected": 0, "last_api_reset_date": None
+            }
+        }
+        self.upload_ok = True
+
+    @property
+    def progress(self):
+        return self.drive["progress"]
+
+    def run(self, mode="sequential", max_calls=None):
+        """
+        한 번 실행 (매 실행은 새 프로세스처럼 Drive의 progress.json에서 시작)
+
+        mode: sequential (main, 워커 1개), concurrent (main, 워커 3개), async (main_async)
+        """
+        ca = self.module
+        if max_calls is not None:
+            ca.MAX_API_CALLS = max_calls
+        ca.MAX_WORKERS = 1 if mode == "sequential" else 3
+        if mode == "async":
+            ok = asyncio.run(ca.main_async())
+        else:
+            ok = ca.main()
+        assert ok
+        return self.progress
+
+    def data_path(self, job, year):
+        return os.path.join(self.root, "data", f"{job}_{year}.xml")
+
+    def keys(self, job, year):
+        """연도별 데이터 파일의 계약번호 목록 (파일 순서)"""
+        path = self.data_path(job, year)
+        if not os.path.exists(path):
+            return []
+        return [item.findtext("untyCntrctNo") for item in ET.parse(path).getroot().iter("item")]
+
+
+@pytest.fixture
+def collector(_collect_all_module, fake_api, tmp_path, monkeypatch):
+    ca = _collect_all_module
+    runner = Collector(ca, str(tmp_path))
+
+    def download(file_id):
+        return json.loads(json.dumps(runner.drive["progress"]))
+
+    def upload(progress, file_id):
+        runner.drive["progress"] = json.loads(json.dumps(progress))
+        return True
+
+    monkeypatch.setattr(ca, "project_root", str(tmp_path))
+    monkeypatch.setattr(ca, "PROGRESS_LOCAL_PATH", str(tmp_path / "progress.json"))
+    monkeypatch.setattr(ca, "test_drive_connection", lambda: True)
+    monkeypatch.setattr(ca, "download_progress_json", download)
+    monkeypatch.setattr(ca, "upload_progress_json", upload)
+    monkeypatch.setattr(ca, "upload_file_to_shared_drive", lambda path, name: runner.upload_ok)
+    monkeypatch.setattr(ca, "send_slack_message", lambda message: None)
+    # 수집 흐름만 보도록 부가 기능은 끔 (각 테스트에서 필요하면 다시 켬)
+    for name, value in {
+        "MAX_API_CALLS": 500, "MAX_WORKERS": 1, "USE_COVERAGE": False, "USE_PLAN": False,
+        "USE_REFRESH": False, "USE_HEDGING": False, "USE_CIRCUIT_BREAKER": False,
+        "ADAPTIVE_CONCURRENCY": False, "SPLIT_THRESHOLD": None, "SPLIT_LATENCY": None,
+        "JOIN_DIR": "", "FANOUT_DIR": "", "ARCHIVE_DIR": "", "TUNE_PAGE_SIZES": "",
+        "TIME_BUDGET_MINUTES": 0, "MONTH_RETRY_LIMIT": 3
+    }.items():
+        monkeypatch.setattr(ca, name, value)
+    return runner
@@ -0,0 +1,122 @@
+"""
+페이지 체크포인트 재개 흐름 (collect_all → store_month/store_month_async → settle_month)
+
+가짜 API는 하루 100건이라 2014년 1월은 3,100건 = 999건 × 4페이지입니다.
+"""
+import os
+import shutil
+
+import pytest
+
+from utils.checkpoint import MonthCheckpoint
+
+THNG = "getCntrctInfoListThng"
+JAN = ("201401010000", "201401312359")
+JAN_FIRST_HALF = ("201401010000", "201401152359")
+
+
+@pytest.fixture
+def api(fake_api):
+    fake_api.per_day[THNG] = 100
+    return fake_api
+
+
+def jan_keys(api):
+    return api.window_items(THNG, *JAN)
+
+
+def saved_checkpoint(progress):
+    data = progress.get("page_checkpoints", {}).get("물품")
+    return MonthCheckpoint(data) if data else None
+
+
+def local_checkpoint(collector, year=2014):
+    return MonthCheckpoint.load(os.path.join(collector.root, "data", f"물품_{year}.checkpoint.json"))
+
+
+@pytest.mark.parametrize("fresh_runner", [False, True], ids=["same-runner", "fresh-runner"])
+@pytest.mark.parametrize("mode", ["sequential", "concurrent", "async"])
+def test_budget_stop_resumes_at_next_page(api, collector, mode, fresh_runner):
+    progress = collector.run(mode, max_calls=2)
+    checkpoint = saved_checkpoint(progress)
+    assert (progress["current_job"], progress["current_month"]) == ("물품", 1)
+    assert checkpoint is not None and checkpoint.month == 1
+    committed = checkpoint.windows["-".join(JAN)]["last_page"]
+    assert 1 <= committed < 4
+    first_run = collector.keys("물품", 2014)
+    assert len(first_run) == checkpoint.items
+
+    if fresh_runner:
+        # 새 러너: 로컬 data 폴더 없이 Drive의 progress.json 체크포인트에서 이어감
+        shutil.rmtree(os.path.join(collector.root, "data"))
+    api.requests.clear()
+    progress = collector.run(mode, max_calls=12)
+
+    resumed = api.requested_pages(THNG, *JAN)
+    assert resumed and min(resumed) == committed + 1
+    keys = collector.keys("물품", 2014)
+    if fresh_runner:
+        keys = first_run + keys
+    january = [key for key in keys if "-201401" in key]
+    assert sorted(january) == sorted(jan_keys(api))
+    assert (progress["current_job"], progress["current_month"]) != ("물품", 1)
+
+
+@pytest.mark.parametrize("resume_mode", ["sequential", "concurrent", "async"])
+def test_split_checkpoint_resumes_without_refetching_parent(api, collector, resume_mode):
+    collector.module.SPLIT_THRESHOLD = 1500
+    progress = collector.run("sequential", max_calls=2)
+    checkpoint = saved_checkpoint(progress)
+    assert checkpoint.windows["-".join(JAN)]["split"] is True
+    assert checkpoint.windows["-".join(JAN_FIRST_HALF)]["last_page"] == 1
+
+    api.requests.clear()
+    collector.run(resume_mode, max_calls=12)
+
+    # 분할한 월 구간과 저장한 페이지는 다시 요청하지 않음
+    assert api.requested_pages(THNG, *JAN) == []
+    assert api.requested_pages(THNG, *JAN_FIRST_HALF) == [2]
+    january = [key for key in collector.keys("물품", 2014) if "-201401" in key]
+    assert sorted(january) == sorted(jan_keys(api))
+
+
+@pytest.mark.parametrize("mode", ["sequential", "concurrent"])
+def test_failing_page_retries_then_skips_month(api, collector, mode):
+    api.fail_pages[(JAN[0], 2)] = 400
+    progress = collector.run(mode, max_calls=20)
+
+    # 재시도 한도(3회)만큼 같은 실행 안에서 실패 페이지만 다시 요청하고 다음 월로
+    pages = api.requested_pages(THNG, *JAN)
+    assert pages.count(1) == 1
+    assert pages.count(2) == 3
+    assert (progress["current_job"], progress["current_month"]) != ("물품", 1)
+    checkpoint = saved_checkpoint(progress)
+    assert checkpoint is None or checkpoint.month != 1
+    local = local_checkpoint(collector)
+    assert local is None or local.month != 1
+
+    keys = jan_keys(api)
+    expected = keys[:999] + keys[1998:]
+    if mode == "sequential":
+        # 순차 수집은 실패 페이지에서 멈추므로 1페이지만 남음
+        expected = keys[:999]
+    else:
+        assert pages.count(3) == pages.count(4) == 1
+    january = [key for key in collector.keys("물품", 2014) if "-201401" in key]
+    assert sorted(january) == sorted(expected)
+
+
+def test_checkpoint_not_committed_to_progress_without_upload(api, collector):
+    collector.upload_ok = False
+    progress = collector.run("sequential", max_calls=2)
+    # Drive에 없는 데이터를 가리키는 체크포인트는 progress.json에 남기지 않음
+    assert saved_checkpoint(progress) is None
+    assert local_checkpoint(collector).pages == 2
+
+    shutil.rmtree(os.path.join(collector.root, "data"))
+    collector.upload_ok = True
+    api.requests.clear()
+    collector.run("sequential", max_calls=12)
+    assert api.requested_pages(THNG, *JAN)[0] == 1
+    january = [key for key in collector.keys("물품", 2014) if "-201401" in key]
+    assert sorted(january) == sorted(jan_keys(api))
@@ -0,0 +1,128 @@
+"""
+상세 레코드 수집 대기열 (utils.detail_fanout)
+
+API 대신 키별 응답을 정해 둔 가짜 클라이언트를 쓰고,
+매 실행은 DetailFanout을 새로 만들어 state.json과 대기열 파일에서 이어갑니다.
+"""
+import os
+
+from utils.operations import get_detail
+from utils.circuit_breaker import CIRCUIT_OPEN_ERROR
+from utils.detail_fanout import DetailFanout, parse_rules, QUEUED, DONE, FAILED
+
+CHANGE_HISTORY = get_detail("change_history")
+RULES = "totCntrctAmt>=1000000000"
+
+
+class StubClient:
+    """fetch_detail 대신 키별로 정해 둔 오류를 차례로 돌려주는 클라이언트 (없으면 성공)"""
+
+    max_workers = 1
+
+    def __init__(self, errors=None):
+        self.errors = {key: list(values) for key, values in (errors or {}).items()}
+        self.requests = []
+
+    def fetch_detail(self, operation, params, inqry_div):
+        key = params[CHANGE_HISTORY.key_param]
+        self.requests.append(key)
+        errors = self.errors.get(key)
+        error = errors.pop(0) if errors else None
+        if error == CIRCUIT_OPEN_ERROR:
+            return [], 0, error
+        if error:
+            return [], 1, error
+        return [f"<item><untyCntrctNo>{key}</untyCntrctNo></item>"], 1, None
+
+
+def contract(key, amount=0):
+    return f"<item><untyCntrctNo>{key}</untyCntrctNo><totCntrctAmt>{amount}</totCntrctAmt></item>"
+
+
+def fanout(tmp_path, **kwargs):
+    return DetailFanout(str(tmp_path / "details"), [CHANGE_HISTORY], parse_rules(RULES), **kwargs)
+
+
+def state(fanout, key):
+    return fanout.keys.get(f"{CHANGE_HISTORY.name}:{key}").get("")
+
+
+def queued(fanout, tier):
+    return os.path.exists(fanout._queue_path(tier))
+
+
+def test_enqueue_orders_tiers_and_skips_known_keys(tmp_path):
+    queue = fanout(tmp_path)
+    assert queue.enqueue("물품", [contract("S1"), contract("B1", 2_000_000_000), contract("S2")]) == 3
+    assert queue.enqueue("물품", [contract("S1"), contract("B2", 1_000_000_000)]) == 1
+    assert queue.duplicates == 1
+    assert queue.pending == {0: 2, 1: 2}
+
+    entries, _, consumed = queue._take(3)
+    assert [(tier, entry[2]) for tier, entry in entries] == [(0, "B1"), (0, "B2"), (1, "S1")]
+    assert consumed == {0: 2, 1: 1}
+
+    client = StubClient()
+    assert queue.run(client, lambda detail, job, items: None, max_calls=10) == 4
+    assert client.requests == ["B1", "B2", "S1", "S2"]
+
+
+def test_failed_key_requeued_until_max_attempts(tmp_path):
+    queue = fanout(tmp_path, max_attempts=3)
+    queue.enqueue("물품", [contract("K1"), contract("K2")])
+    client = StubClient({"K1": ["API 에러 99"] * 5})
+    stored = []
+    queue.run(client, lambda detail, job, items: stored.extend(items), max_calls=10)
+
+    # 실패한 키는 같은 단계 끝에 다시 들어가 시도 한도(3회)까지만 요청
+    assert client.requests == ["K1", "K2", "K1", "K1"]
+    assert state(queue, "K1") == FAILED
+    assert state(queue, "K2") == DONE
+    assert len(stored) == 1
+    assert (queue.fetched, queue.failed, queue.api_calls) == (1, 3, 4)
+    # 끝까지 처리한 단계 파일은 지우고 커서/대기 수도 정리
+    assert not queued(queue, 1)
+    assert queue.cursors == {} and queue.pending == {}
+
+
+def test_uncharged_error_does_not_count_as_attempt(tmp_path):
+    queue = fanout(tmp_path, max_attempts=1)
+    queue.enqueue("물품", [contract("K1")])
+    entries, cursors, consumed = queue._take(10)
+    queue._commit(cursors, consumed, [], [entries[0] + (CIRCUIT_OPEN_ERROR,)])
+
+    # 요청을 보내지 못한 실패는 시도 횟수 그대로 다시 대기
+    entries, _, _ = queue._take(10)
+    assert [entry for _, entry in entries] == [["change_history", "물품", "K1", 0]]
+    assert state(queue, "K1") == QUEUED
+
+    # 서킷이 열려 한 건도 못 보내면 같은 항목을 계속 돌지 않고 멈춤
+    client = StubClient({"K1": [CIRCUIT_OPEN_ERROR] * 5})
+    assert queue.run(client, lambda detail, job, items: None, max_calls=10) == 0
+    assert client.requests == ["K1"]
+    assert queue.api_calls == 0
+    assert state(queue, "K1") == QUEUED
+
+
+def test_restart_resumes_from_state(tmp_path):
+    queue = fanout(tmp_path)
+    queue.enqueue("물품", [contract("B1", 2_000_000_000)] + [contract(f"S{i}") for i in range(4)])
+    queue.save()
+    client = StubClient()
+    assert queue.run(client, lambda detail, job, items: None, max_calls=2, batch_size=1) == 2
+    assert client.requests == ["B1", "S0"]
+    # 다 받은 0단계 파일만 지워지고 1단계는 커서와 함께 남음
+    assert not queued(queue, 0) and queued(queue, 1)
+
+    # 다음 실행: state.json의 커서/대기 수에서 이어가 받은 키는 다시 요청하지 않음
+    restarted = fanout(tmp_path)
+    assert restarted.pending == {1: 3}
+    assert restarted.cursors[1] > 0
+    client = StubClient()
+    assert restarted.run(client, lambda detail, job, items: None, max_calls=10) == 3
+    assert client.requests == ["S1", "S2", "S3"]
+    assert not queued(restarted, 1)
+
+    # 이미 받은 키는 다시 넣어도 대기열에 추가하지 않음
+    restarted = fanout(tmp_path)
+    assert restarted.enqueue("물품", [contract("S0"), contract("B1", 2_000_000_000)]) == 0
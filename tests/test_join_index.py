@@ -0,0 +1,132 @@
+"""
+입찰공고 → 낙찰 → 계약 증분 조인 (utils.join_index)
+
+연도별 데이터 파일은 수집기처럼 <root> 아래 <item>을 나열한 XML로 만들고,
+매 실행은 JoinPipeline을 새로 만들어 state.json에서 이어갑니다.
+"""
+import os
+import json
+
+from utils.join_index import JoinPipeline, HashIndex, BID, AWARD, CONTRACT
+
+WINNER = "123-45-67890"
+OTHER = "987-65-43210"
+
+
+def item(**fields):
+    return "<item>" + "".join(f"<{name}>{value}</{name}>" for name, value in fields.items()) + "</item>"
+
+
+def contract(no, notice, bizno=WINNER, name=None):
+    return item(untyCntrctNo=no, ntceNo=f"{notice}-000", cntrctNm=name or f"계약 {no}",
+                corpList=f"[1^단독^주계약^업체 {no}^대표^{bizno}^100]")
+
+
+def award(notice, bizno=WINNER):
+    return item(bidNtceNo=notice, bidNtceOrd="000", bidClsfcNo="0", rbidNo="0", bidwinnrBizno=bizno)
+
+
+def bid(notice):
+    return item(bidNtceNo=notice, bidNtceOrd="000", bidNtceNm=f"공고 {notice}")
+
+
+def write_year(path, items):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<root>\n' + "\n".join(items) + "\n</root>\n")
+
+
+def links(root, table):
+    path = os.path.join(root, "links", f"{table}.jsonl")
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def run(root, source, path):
+    """한 번 실행 (읽은 레코드 수, 파이프라인)"""
+    pipeline = JoinPipeline(root, buckets=8)
+    count = pipeline.ingest_file(source, path)
+    pipeline.materialize()
+    pipeline.save()
+    return count, pipeline
+
+
+def test_append_reads_only_new_records(tmp_path):
+    root, path = str(tmp_path / "join"), str(tmp_path / "물품_2024.xml")
+    items = [contract(f"C{i}", f"N{i}") for i in range(3)]
+    write_year(path, items)
+    count, pipeline = run(root, CONTRACT, path)
+    assert count == 3 and pipeline.ingested[CONTRACT] == 3
+
+    # 다음 수집이 </root> 앞에 레코드를 덧붙임 → 지난번 읽은 위치 뒤만 읽음
+    write_year(path, items + [contract("C3", "N3"), contract("C4", "N4")])
+    count, pipeline = run(root, CONTRACT, path)
+    assert count == 2
+    assert pipeline.ingested[CONTRACT] == 2 and pipeline.unchanged == 0
+
+    # 바뀐 게 없으면 아무것도 읽지 않음
+    count, _ = run(root, CONTRACT, path)
+    assert count == 0
+
+
+def test_rewritten_file_rereads_with_content_dedupe(tmp_path):
+    root, path = str(tmp_path / "join"), str(tmp_path / "물품_2024.xml")
+    write_year(path, [contract(f"C{i}", f"N{i}") for i in range(3)])
+    run(root, CONTRACT, path)
+
+    # 파일을 다시 만들면서 앞쪽 레코드 내용이 바뀜 → 처음부터 다시 읽되 같은 레코드는 건너뜀
+    write_year(path, [contract("C0", "N0", name="변경 계약")] + [contract(f"C{i}", f"N{i}") for i in (1, 2)])
+    count, pipeline = run(root, CONTRACT, path)
+    assert count == 3
+    assert pipeline.ingested[CONTRACT] == 1
+    assert pipeline.unchanged == 2
+    assert pipeline.indexes[CONTRACT].get("N0")["C0"]["cntrctNm"] == "변경 계약"
+
+
+def test_hash_index_evicts_only_flushed_buckets(tmp_path):
+    index = HashIndex(str(tmp_path / "index"), buckets=16, max_cached=2)
+    keys = [f"N{i}" for i in range(40)]
+    for key in keys:
+        index.add(key, "id", {"key": key})
+    buckets = {index.bucket(key) for key in keys}
+    assert len(buckets) > 2
+    # 아직 파일에 쓰지 않은 버킷은 캐시에서 빠지지 않음
+    assert set(index._cache) == buckets
+
+    index.flush()
+    assert len(index._cache) <= 2
+    assert index.get_many(keys) == {key: {"id": {"key": key}} for key in keys}
+    assert len(index._cache) <= 2
+
+    # 새 인덱스(다음 실행)도 파일에서 같은 내용을 읽음
+    reopened = HashIndex(str(tmp_path / "index"), buckets=16, max_cached=2)
+    assert reopened.get("N7") == {"id": {"key": "N7"}}
+
+
+def test_award_contract_requires_winner_bizno(tmp_path):
+    root = str(tmp_path / "join")
+    bids, awards, contracts = (str(tmp_path / f"{name}.xml") for name in ("bid", "award", "contract"))
+    write_year(bids, [bid("N1"), bid("N2")])
+    write_year(awards, [award("N1"), award("N2")])
+    # N2 계약은 낙찰업체가 아닌 다른 업체와 맺음
+    write_year(contracts, [contract("C1", "N1"), contract("C2", "N2", bizno=OTHER)])
+
+    pipeline = JoinPipeline(root, buckets=8)
+    pipeline.ingest_file(BID, bids)
+    pipeline.ingest_file(AWARD, awards)
+    pipeline.ingest_file(CONTRACT, contracts)
+    assert pipeline.materialize() == 5
+    pipeline.save()
+
+    assert [(row["award"]["bidNtceNo"], row["contract"]["id"]) for row in links(root, "award_contract")] == [
+        ("N1", "C1")
+    ]
+    assert sorted(row["notice"] for row in links(root, "bid_award")) == ["N1", "N2"]
+    assert sorted(row["contract"]["id"] for row in links(root, "bid_contract")) == ["C1", "C2"]
+
+    # 다시 조인해도 이미 쓴 연결은 추가하지 않음
+    pipeline = JoinPipeline(root, buckets=8)
+    pipeline.dirty.update(["N1", "N2"])
+    assert pipeline.materialize() == 0
+    assert len(links(root, "award_contract")) == 1
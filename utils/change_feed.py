@@ -0,0 +1,180 @@
+import hashlib
+import threading
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+
+try:
+    from .logger import log
+    from .quota import KST, today_kst
+    from .xml_parsers import serialize_element
+except ImportError:
+    from utils.logger import log
+    from utils.quota import KST, today_kst
+    from utils.xml_parsers import serialize_element
+
+# 레코드 키 필드 (통합계약번호 + 변경차수)
+CONTRACT_NO_FIELD = "untyCntrctNo"
+CHANGE_ORDER_FIELDS = ("cntrctChgOrd", "chgOrd")
+# 같은 키가 한 번에 여러 번 오면 더 늦은 버전을 씀
+VERSION_FIELDS = ("chgDt", "rgstDt")
+
+TIMESTAMP_FORMAT = "%Y%m%d%H%M"
+
+
+def record_fields(item):
+    """item 레코드(<item>...</item>)의 필드 dict"""
+    return {child.tag: (child.text or "") for child in ET.fromstring(item)}
+
+
+def record_key(fields):
+    """저장 키 (예: R25TE0123456#2) - 계약번호가 없으면 None"""
+    contract_no = fields.get(CONTRACT_NO_FIELD)
+    if not contract_no:
+        return None
+    change_order = next((fields[name] for name in CHANGE_ORDER_FIELDS if fields.get(name)), "0")
+    return f"{contract_no}#{change_order}"
+
+
+def record_version(fields):
+    return tuple(fields.get(name, "") for name in VERSION_FIELDS)
+
+
+def contract_version(fields):
+    """같은 계약의 레코드 중 더 늦은 것을 고르는 기준 (변경차수, 변경/등록일시)"""
+    change_order = next((fields[name] for name in CHANGE_ORDER_FIELDS if fields.get(name)), "0")
+    return (int(change_order) if change_order.isdigit() else 0,) + record_version(fields)
+
+
+def read_items(path):
+    """<root> 데이터 파일의 item 레코드 목록 (파일이 없으면 빈 목록)"""
+    try:
+        root = ET.parse(path).getroot()
+    except FileNotFoundError:
+        return []
+    return [serialize_element(item) for item in root.iter("item")]
+
+
+def latest_by_contract(*item_lists):
+    """
+    계약번호(untyCntrctNo)별로 가장 늦은 레코드 1건만 남김
+
+    변경차수 → 변경/등록일시 순으로 비교하고, 같으면 나중 목록의 레코드가 이깁니다.
+    바뀐 계약은 끝으로 옮기므로 새 계약만 있으면 앞부분은 그대로입니다
+    (JoinPipeline.ingest_file이 추가된 부분만 읽음).
+    """
+    latest = {}
+    for items in item_lists:
+        for item in items:
+            fields = record_fields(item)
+            contract_no = fields.get(CONTRACT_NO_FIELD)
+            if not contract_no:
+                continue
+            version = contract_version(fields)
+            if contract_no in latest:
+                if version < latest[contract_no][0]:
+                    continue
+                del latest[contract_no]
+            latest[contract_no] = (version, item)
+    return [item for _, item in latest.values()]
+
+
+def now_kst():
+    """한국시간 현재 시각 (YYYYMMDDHHMM)"""
+    return datetime.now(KST).strftime(TIMESTAMP_FORMAT)
+
+
+class ChangeFeed:
+    """
+    변경분 수집 현황 (업무별 다음 조회 시작 시각과 레코드별 내용 해시)
+
+    변경일시 기준으로 받은 레코드 중 (계약번호, 변경차수) 키의 내용이
+    지난번과 달라진 것만 골라냅니다. 해시는 마지막으로 본 날짜와 함께 남기고
+    keep_days가 지나면 지우므로 progress.json이 계속 커지지 않습니다.
+    progress.json에 저장할 수 있도록 dict로 직렬화됩니다.
+        {"물품": {"since": "202512150900", "refreshed": "2025-12-15",
+                  "records": {"R25TE0123456#2": ["9f1c...", "2025-12-15"]}}}
+    """
+
+    def __init__(self, data=None, keep_days=90):
+        self.keep_days = keep_days
+        self._lock = threading.Lock()
+        self.jobs = {
+            job: {
+                "since": state.get("since"),
+                "refreshed": state.get("refreshed"),
+                "records": dict(state.get("records", {}))
+            }
+            for job, state in (data or {}).items()
+        }
+
+    def to_dict(self):
+        cutoff = (datetime.now(KST) - timedelta(days=self.keep_days)).strftime('%Y-%m-%d')
+        with self._lock:
+            return {
+                job: {
+                    "since": state["since"],
+                    "refreshed": state["refreshed"],
+                    "records": {
+                        key: entry for key, entry in sorted(state["records"].items())
+                        if entry[1] >= cutoff
+                    }
+                }
+                for job, state in self.jobs.items()
+            }
+
+    def _state(self, job):
+        return self.jobs.setdefault(job, {"since": None, "refreshed": None, "records": {}})
+
+    def since(self, job):
+        """다음 조회 시작 시각 (처음이면 None)"""
+        with self._lock:
+            return self._state(job)["since"]
+
+    def refreshed_today(self, job):
+        with self._lock:
+            return self._state(job)["refreshed"] == today_kst()
+
+    def diff(self, job, items):
+        """
+        지난번과 내용이 달라진 레코드만 골라냄 (기록은 commit에서)
+
+        Returns:
+            tuple: (changed_items, entries) - entries는 commit에 넘길 {키: 해시}
+        """
+        latest = {}
+        for item in items:
+            fields = record_fields(item)
+            key = record_key(fields)
+            if key is None:
+                continue
+            version = record_version(fields)
+            if key not in latest or version >= latest[key][0]:
+                latest[key] = (version, item)
+
+        with self._lock:
+            records = self._state(job)["records"]
+            changed, entries = [], {}
+            for key, (_, item) in latest.items():
+                digest = hashlib.sha256(item.encode("utf-8")).hexdigest()[:16]
+                known = records.get(key)
+                if known is None or known[0] != digest:
+                    changed.append(item)
+                entries[key] = digest
+        return changed, entries
+
+    def commit(self, job, entries, since=None):
+        """저장이 끝난 변경분 반영 (since를 넘기면 다음 조회 시작 시각도 이동)"""
+        today = today_kst()
+        with self._lock:
+            state = self._state(job)
+            for key, digest in entries.items():
+                state["records"][key] = [digest, today]
+            if since is not None:
+                state["since"] = since
+                state["refreshed"] = today
+
+    def log_status(self):
+        with self._lock:
+            for job, state in self.jobs.items():
+                log(f"🔄 [{job}] 변경분: 다음 조회 {state['since'] or '-'}부터, "
+                    f"추적 레코드 {len(state['records']):,}건")
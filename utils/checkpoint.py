@@ -0,0 +1,193 @@
+import os
+import json
+import hashlib
+
+try:
+    from .logger import log
+    from .quota import today_kst
+except ImportError:
+    from utils.logger import log
+    from utils.quota import today_kst
+
+# 연도별 데이터 파일의 닫는 태그 (커밋 시점 파일은 항상 이 태그로 끝남)
+CLOSING_TAG = b"</root>"
+
+
+def window_id(start_date, end_date):
+    """체크포인트 안의 구간 키 (예: 201401010000-201401312359)"""
+    return f"{start_date}-{end_date}"
+
+
+def committed_pages(state):
+    """구간 상태에서 저장이 끝난 페이지 번호 집합"""
+    if not state:
+        return set()
+    return set(range(1, state.get("last_page", 0) + 1)) | set(state.get("extra_pages", ()))
+
+
+class MonthCheckpoint:
+    """
+    한 업무-월의 페이지 단위 수집 체크포인트
+
+    구간별 totalCount와 저장이 끝난 페이지(연속 구간은 last_page, 실패 페이지 뒤에
+    저장된 페이지는 extra_pages), 지금까지 저장한 건수와 item 해시를 기록합니다.
+    해시는 페이지마다 sha256(이전 해시 + 페이지 데이터)로 이어지므로
+    데이터 파일 없이도 다음 실행에서 이어서 계산할 수 있습니다.
+    progress.json에 저장할 수 있도록 dict로 직렬화됩니다.
+    """
+
+    def __init__(self, data=None):
+        data = data or {}
+        self.job = data.get("job")
+        self.year = data.get("year")
+        self.month = data.get("month")
+        self.num_of_rows = data.get("num_of_rows")
+        self.windows = {key: dict(state) for key, state in data.get("windows", {}).items()}
+        self.items = data.get("items", 0)
+        self.pages = data.get("pages", 0)
+        self.hash = data.get("hash", "")
+        self.attempts = data.get("attempts", 0)
+        self.updated_at = data.get("updated_at")
+        # 로컬 데이터 파일 검증용 (마지막 페이지 위치/크기/해시, 커밋 시점 파일 크기)
+        self.file = data.get("file")
+        self.file_size = data.get("file_size")
+        self.last_offset = data.get("last_offset")
+        self.last_size = data.get("last_size")
+        self.last_hash = data.get("last_hash")
+
+    @classmethod
+    def new(cls, job, year, month, num_of_rows):
+        return cls({"job": job, "year": year, "month": month, "num_of_rows": num_of_rows})
+
+    def to_dict(self):
+        return {
+            "job": self.job,
+            "year": self.year,
+            "month": self.month,
+            "num_of_rows": self.num_of_rows,
+            "windows": {key: dict(state) for key, state in self.windows.items()},
+            "items": self.items,
+            "pages": self.pages,
+            "hash": self.hash,
+            "attempts": self.attempts,
+            "updated_at": self.updated_at,
+            "file": self.file,
+            "file_size": self.file_size,
+            "last_offset": self.last_offset,
+            "last_size": self.last_size,
+            "last_hash": self.last_hash
+        }
+
+    def matches(self, job, year, month, num_of_rows=None):
+        """같은 업무-월(그리고 같은 페이지 크기)의 체크포인트인지"""
+        if (self.job, self.year, self.month) != (job, year, month):
+            return False
+        return num_of_rows is None or self.num_of_rows in (None, num_of_rows)
+
+    @property
+    def started(self):
+        """저장된 페이지나 확인된 구간이 있는지"""
+        return bool(self.pages or self.windows)
+
+    def resume_state(self):
+        """G2BClient.iter_pages(resume=...)에 넘길 구간별 상태 사본"""
+        return {key: dict(state) for key, state in self.windows.items()}
+
+    # ------------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------------
+    def sync_windows(self, reports):
+        """window_report의 분할 여부와 totalCount 반영 (페이지 1 실패 구간은 제외)"""
+        for report in reports:
+            if report["total_count"] is None and not report["split"]:
+                continue
+            state = self.windows.setdefault(window_id(report["start"], report["end"]), {})
+            state["total_count"] = report["total_count"]
+            if report["split"]:
+                state["split"] = True
+            else:
+                state.setdefault("last_page", 0)
+
+    def commit_page(self, batch, data, file, file_size, offset):
+        """
+        파일에 추가한 페이지 기록
+
+        Args:
+            batch: G2BClient.iter_pages가 내보낸 PageBatch
+            data: 파일에 쓴 페이지 데이터 (bytes)
+            file: 데이터 파일 이름
+            file_size: 추가 후 파일 크기
+            offset: 파일 안에서 페이지 데이터 시작 위치
+        """
+        state = self.windows.setdefault(window_id(batch.start_date, batch.end_date), {})
+        state["total_count"] = batch.total_count
+        pages = committed_pages(state) | {batch.page_no}
+        last_page = state.get("last_page", 0)
+        while last_page + 1 in pages:
+            last_page += 1
+        state["last_page"] = last_page
+        state["extra_pages"] = sorted(page for page in pages if page > last_page)
+        if not state["extra_pages"]:
+            del state["extra_pages"]
+
+        self.items += len(batch.items)
+        self.pages += 1
+        self.hash = hashlib.sha256(self.hash.encode("ascii") + data).hexdigest()
+        self.updated_at = today_kst()
+        self.file = file
+        self.file_size = file_size
+        self.last_offset = offset
+        self.last_size = len(data)
+        self.last_hash = hashlib.sha256(data).hexdigest()
+
+    # ------------------------------------------------------------------
+    # 로컬 파일
+    # ------------------------------------------------------------------
+    def save(self, path):
+        """임시 파일에 쓴 뒤 교체 (중간에 죽어도 이전 체크포인트가 남음)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """로컬 체크포인트 파일 로드 (없거나 깨졌으면 None)"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(json.load(f))
+        except (OSError, ValueError):
+            return None
+
+    def verify_file(self, path):
+        """
+        데이터 파일이 체크포인트와 맞는지 확인
+
+        체크포인트 이후에 쓰였지만 커밋되지 않은 데이터는 잘라내고,
+        마지막으로 커밋한 페이지의 내용이 해시와 같은지 확인합니다.
+
+        Returns:
+            bool: 이 체크포인트에서 이어서 쓸 수 있으면 True
+        """
+        if not self.pages:
+            return True
+        if self.file_size is None or not os.path.exists(path):
+            return False
+        size = os.path.getsize(path)
+        if size < self.file_size:
+            log(f"⚠️ 체크포인트보다 작은 데이터 파일: {path} ({size:,} < {self.file_size:,} bytes)")
+            return False
+        with open(path, "r+b") as f:
+            f.seek(self.last_offset)
+            if hashlib.sha256(f.read(self.last_size)).hexdigest() != self.last_hash:
+                log(f"⚠️ 데이터 파일의 마지막 페이지가 체크포인트와 다름: {path}")
+                return False
+            if size > self.file_size:
+                # 다음 페이지를 쓸 때 닫는 태그 자리부터 덮어쓰므로 태그를 다시 씀
+                log(f"↩️ 커밋되지 않은 데이터 {size - self.file_size:,} bytes 되돌림: {path}")
+                f.seek(self.file_size - len(CLOSING_TAG))
+                f.truncate()
+                f.write(CLOSING_TAG)
+        return True
@@ -0,0 +1,161 @@
+import time
+import threading
+from collections import deque
+
+try:
+    from .logger import log
+except ImportError:
+    from utils.logger import log
+
+# 서버 장애로 보는 HTTP 상태 / 공공데이터포털 resultCode·returnReasonCode
+OUTAGE_STATUSES = {408, 429, 500, 502, 503, 504}
+OUTAGE_CODES = {"01", "02", "04", "05"}  # APPLICATION_ERROR, DB_ERROR, HTTP_ERROR, SERVICETIME_OUT
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# 서킷이 열려 요청하지 않은 페이지의 오류 문자열
+CIRCUIT_OPEN_ERROR = "API 장애 (서킷 열림)"
+
+
+def is_outage(error=None, status=None):
+    """
+    페이지 결과가 서버 장애 신호인지 판별
+
+    네트워크 오류/타임아웃은 호출하는 쪽에서 바로 실패로 기록하고,
+    여기서는 HTTP 상태와 resultCode만 봅니다. (인증/한도 오류는 키 문제라 장애가 아님)
+    """
+    if status is not None and status in OUTAGE_STATUSES:
+        return True
+    if error and error.startswith("API 에러 "):
+        return error.rsplit(" ", 1)[-1] in OUTAGE_CODES
+    return False
+
+
+class CircuitBreaker:
+    """
+    G2B 전송 구간 서킷 브레이커 (closed → open → half-open → closed)
+
+    - closed: 최근 window회 호출 중 실패 비율이 failure_rate 이상이면 (최소 min_calls회) open
+    - open: cooldown 동안 요청을 보내지 않고 바로 실패 (allow()가 False)
+    - half-open: cooldown이 지나면 probe 요청만 통과시키고, 성공하면 closed, 실패하면 다시 open
+    여러 클라이언트(병렬 모드 워커)가 하나의 브레이커를 공유할 수 있습니다.
+
+    사용 예:
+        breaker = CircuitBreaker(failure_rate=0.5, window=10, cooldown=60)
+        if breaker.allow():
+            ...요청...
+            breaker.record(success)
+    """
+
+    def __init__(self, failure_rate=0.5, window=10, min_calls=5, cooldown=60.0, probes=1):
+        """
+        Args:
+            failure_rate: open으로 바꿀 최근 호출 실패 비율 (0~1)
+            window: 실패 비율을 계산할 최근 호출 수
+            min_calls: 판단에 필요한 최소 호출 수
+            cooldown: open 상태를 유지할 시간(초), 지나면 half-open
+            probes: half-open에서 동시에 허용할 probe 요청 수
+        """
+        self.failure_rate = failure_rate
+        self.min_calls = max(1, int(min_calls))
+        self.cooldown = cooldown
+        self.probes = max(1, int(probes))
+        self.state = CLOSED
+        self._results = deque(maxlen=max(self.min_calls, int(window)))
+        self._opened_at = 0.0
+        self._probing = 0
+        self._lock = threading.Lock()
+
+        # 통계
+        self.opened = 0         # open으로 바뀐 횟수
+        self.rejected = 0       # 서킷이 열려 보내지 않은 요청 수
+        self.failures = 0
+        self.successes = 0
+        self.last_failure = None
+        self.first_opened = None    # 처음 open된 시각 (time.time)
+
+    # ------------------------------------------------------------------
+    # 요청 허용 / 결과 기록
+    # ------------------------------------------------------------------
+    def allow(self):
+        """이번 요청을 보내도 되는지 (open이면 False, half-open이면 probe만 True)"""
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.cooldown:
+                    self.rejected += 1
+                    return False
+                self.state = HALF_OPEN
+                self._probing = 0
+                log("🔌 서킷 half-open: probe 요청으로 API 상태 확인")
+            if self.state == HALF_OPEN:
+                if self._probing >= self.probes:
+                    self.rejected += 1
+                    return False
+                self._probing += 1
+            return True
+
+    def record(self, success, reason=None):
+        """허용된 요청의 결과 기록 (reason은 실패 사유 - 요약 알림에 표시)"""
+        with self._lock:
+            if success:
+                self.successes += 1
+            else:
+                self.failures += 1
+                self.last_failure = reason
+            if self.state == HALF_OPEN:
+                self._probing = max(0, self._probing - 1)
+                if success:
+                    self._close()
+                else:
+                    self._open("probe 실패")
+                return
+            if self.state == OPEN:
+                # open 직전에 출발한 요청 결과는 판단에 쓰지 않음
+                return
+            self._results.append(success)
+            failed = self._results.count(False)
+            if len(self._results) >= self.min_calls and failed / len(self._results) >= self.failure_rate:
+                self._open(f"최근 {len(self._results)}회 중 {failed}회 실패")
+
+    def _open(self, why):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self.opened += 1
+        if self.first_opened is None:
+            self.first_opened = time.time()
+        log(f"🔌 서킷 open ({why}, 마지막 오류: {self.last_failure}) - {self.cooldown:g}초 동안 요청 중단")
+
+    def _close(self):
+        self.state = CLOSED
+        self._results.clear()
+        log("🔌 서킷 closed: API 응답 회복")
+
+    # ------------------------------------------------------------------
+    # 상태
+    # ------------------------------------------------------------------
+    @property
+    def tripped(self):
+        """서킷이 열려 있거나 회복을 확인하는 중인지 (수집을 멈춰야 하는지)"""
+        with self._lock:
+            return self.state != CLOSED
+
+    def metrics(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "opened": self.opened,
+                "rejected": self.rejected,
+                "failures": self.failures,
+                "successes": self.successes,
+                "last_failure": self.last_failure
+            }
+
+    def summary(self):
+        """실행 종료 알림에 넣을 한 줄 요약"""
+        metrics = self.metrics()
+        return (
+            f"서킷 {metrics['state']} (열림 {metrics['opened']}회, 실패 {metrics['failures']}회, "
+            f"차단 {metrics['rejected']}회, 마지막 오류: {metrics['last_failure']})"
+        )
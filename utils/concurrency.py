@@ -0,0 +1,173 @@
+import time
+import asyncio
+import threading
+from collections import deque
+from contextlib import contextmanager, asynccontextmanager
+
+try:
+    from .logger import log
+except ImportError:
+    from utils.logger import log
+
+
+class AIMDController:
+    """
+    AIMD(가산 증가 / 승산 감소) 동시 요청 수 제어기
+
+    - 지연시간이 기준 이내이고 오류가 없으면 현재 한도만큼 연속 성공할 때마다 한도 +increase
+    - 타임아웃, 429/5xx, resultCode 오류, 지연 급증 시 한도 × decrease
+      (한 번의 폭주로 여러 번 깎이지 않도록 cooldown 동안은 한 번만 감소)
+
+    사용 예:
+        controller = AIMDController(initial=2, max_limit=16)
+        with controller.slot():
+            ...요청...
+            controller.record(latency, failure=None)
+    """
+
+    def __init__(self, initial=2, min_limit=1, max_limit=16, increase=1, decrease=0.5,
+                 latency_target=None, latency_tolerance=3.0, cooldown=2.0, name="g2b"):
+        """
+        Args:
+            initial: 시작 동시 요청 수
+            min_limit / max_limit: 한도 하한/상한
+            increase: 가산 증가량
+            decrease: 승산 감소 비율 (0~1)
+            latency_target: 정상 지연시간 상한(초). None이면 최근 최소 지연 × latency_tolerance
+            cooldown: 연속 감소 사이 최소 간격(초)
+        """
+        self.name = name
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.limit = min(max(int(initial), self.min_limit), self.max_limit)
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+
+        self.in_flight = 0
+        self._healthy_streak = 0
+        self._last_decrease = 0.0
+        self._latencies = deque(maxlen=50)
+        self._cond = threading.Condition()
+
+        # 메트릭
+        self.requests = 0
+        self.failures = 0
+        self.increases = 0
+        self.decreases = 0
+        self.decisions = deque(maxlen=100)
+
+    # ------------------------------------------------------------------
+    # 동시성 슬롯
+    # ------------------------------------------------------------------
+    @contextmanager
+    def slot(self):
+        """현재 한도 안에서 요청 슬롯 확보 (스레드용)"""
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+            self.in_flight += 1
+        try:
+            yield self
+        finally:
+            with self._cond:
+                self.in_flight -= 1
+                self._cond.notify_all()
+
+    @asynccontextmanager
+    async def async_slot(self):
+        """현재 한도 안에서 요청 슬롯 확보 (asyncio용)"""
+        while True:
+            with self._cond:
+                if self.in_flight < self.limit:
+                    self.in_flight += 1
+                    break
+            await asyncio.sleep(0.05)
+        try:
+            yield self
+        finally:
+            with self._cond:
+                self.in_flight -= 1
+                self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # 피드백
+    # ------------------------------------------------------------------
+    def _latency_threshold(self):
+        if self.latency_target is not None:
+            return self.latency_target
+        if not self._latencies:
+            return None
+        return min(self._latencies) * self.latency_tolerance
+
+    def record(self, latency, failure=None):
+        """
+        요청 1회 결과 반영
+
+        Args:
+            latency: 소요 시간(초)
+            failure: 실패 사유 (예: "timeout", "HTTP 429", "resultCode 22"). 성공이면 None
+        """
+        with self._cond:
+            self.requests += 1
+            threshold = self._latency_threshold()
+
+            if failure:
+                self.failures += 1
+                self._decrease(failure)
+            elif threshold is not None and latency > threshold:
+                self._decrease(f"지연 증가 {latency:.2f}s > {threshold:.2f}s")
+            else:
+                self._latencies.append(latency)
+                self._healthy_streak += 1
+                # 한도만큼 연속 성공하면(≈ 1 RTT) 가산 증가
+                if self._healthy_streak >= self.limit and self.limit < self.max_limit:
+                    old = self.limit
+                    self.limit = min(self.max_limit, self.limit + self.increase)
+                    self._healthy_streak = 0
+                    self.increases += 1
+                    self._decide(old, f"정상 {old}회 연속 (지연 {latency:.2f}s)")
+
+            self._cond.notify_all()
+
+    def _decrease(self, reason):
+        self._healthy_streak = 0
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+
+        old = self.limit
+        self.limit = max(self.min_limit, int(self.limit * self.decrease))
+        if self.limit != old:
+            self.decreases += 1
+            self._decide(old, reason)
+
+    def _decide(self, old, reason):
+        decision = {
+            "time": time.time(),
+            "from": old,
+            "to": self.limit,
+            "reason": reason
+        }
+        self.decisions.append(decision)
+        arrow = "⬆️" if self.limit > old else "⬇️"
+        log(f"{arrow} [{self.name}] 동시 요청 한도 {old} → {self.limit} ({reason})")
+
+    def metrics(self):
+        """현재 한도 및 결정 이력"""
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "requests": self.requests,
+                "failures": self.failures,
+                "increases": self.increases,
+                "decreases": self.decreases,
+                "latency_threshold": self._latency_threshold(),
+                "decisions": list(self.decisions)
+            }
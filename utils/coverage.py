@@ -0,0 +1,116 @@
+import threading
+
+try:
+    from .logger import log
+    from .quota import today_kst
+    from .g2b_client import month_window
+except ImportError:
+    from utils.logger import log
+    from utils.quota import today_kst
+    from utils.g2b_client import month_window
+
+# 수집 상태
+COMPLETE = "complete"   # totalCount만큼 모두 저장
+EMPTY = "empty"         # totalCount 0 (알려진 빈 구간)
+PARTIAL = "partial"     # 일부 페이지 실패 또는 저장 건수 부족
+FAILED = "failed"       # 수집 자체 실패
+
+
+def window_key(job, start_date, end_date):
+    """구간 키 (예: 외자:201401010000-201401312359)"""
+    return f"{job}:{start_date}-{end_date}"
+
+
+class CoverageMap:
+    """
+    구간별 수집 현황 (totalCount, 저장 건수, 페이지 수, 상태)
+
+    미완료 구간은 별도 집합으로 유지하므로 데이터 파일을 읽지 않고도
+    "어느 구간이 미완료인가"를 바로 답할 수 있습니다.
+    progress.json에 저장할 수 있도록 dict로 직렬화됩니다.
+    """
+
+    def __init__(self, data=None):
+        data = data or {}
+        self._lock = threading.Lock()
+        self.entries = dict(data.get("entries", {}))
+        self._incomplete = set(data.get("incomplete", []))
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "entries": dict(self.entries),
+                "incomplete": sorted(self._incomplete)
+            }
+
+    # ------------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------------
+    def record(self, job, start_date, end_date, total_count, items_stored, pages_fetched,
+               failed_pages=None, error=None):
+        """구간 수집 결과 기록 후 상태 반환"""
+        if error:
+            state = FAILED
+        elif total_count == 0 or (total_count is None and items_stored == 0 and not failed_pages):
+            state = EMPTY
+        elif failed_pages or (total_count is not None and items_stored < total_count):
+            state = PARTIAL
+        else:
+            state = COMPLETE
+
+        key = window_key(job, start_date, end_date)
+        with self._lock:
+            self.entries[key] = {
+                "total_count": total_count,
+                "items_stored": items_stored,
+                "pages_fetched": pages_fetched,
+                "state": state,
+                "updated_at": today_kst()
+            }
+            if state in (COMPLETE, EMPTY):
+                self._incomplete.discard(key)
+            else:
+                self._incomplete.add(key)
+        return state
+
+    def record_month(self, job, year, month, client, item_count, error=None):
+        """G2BClient.fetch_data 직후 last_window_report로 월 구간 기록"""
+        start_date, end_date = month_window(year, month)
+        reports = client.last_window_report
+        total_count = reports[0]["total_count"] if reports else None
+        pages = sum(report["pages"] for report in reports if not report["split"])
+        return self.record(
+            job, start_date, end_date, total_count, item_count, pages,
+            failed_pages=client.last_failed_pages, error=error
+        )
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def get(self, job, start_date, end_date):
+        with self._lock:
+            return self.entries.get(window_key(job, start_date, end_date))
+
+    def incomplete(self):
+        """미완료 구간 키 집합 (O(1) 조회용 사본)"""
+        with self._lock:
+            return set(self._incomplete)
+
+    def is_incomplete(self, job, start_date, end_date):
+        with self._lock:
+            return window_key(job, start_date, end_date) in self._incomplete
+
+    def can_skip_month(self, job, year, month, current_total=None):
+        """
+        이미 완료(또는 빈 구간)이고 건수가 바뀌지 않은 월이면 True
+
+        Args:
+            current_total: probe 등으로 알고 있는 현재 totalCount (없으면 기록만으로 판단)
+        """
+        entry = self.get(job, *month_window(year, month))
+        if not entry or entry["state"] not in (COMPLETE, EMPTY):
+            return False
+        if current_total is not None and current_total != entry["total_count"]:
+            log(f"🔄 {job} {year}년 {month}월 건수 변경: {entry['total_count']} → {current_total}")
+            return False
+        return True
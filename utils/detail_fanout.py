@@ -0,0 +1,341 @@
+"""
+계약 1건당 요청 1회인 상세 레코드(변경이력, 세부품목 등) 수집 대기열
+
+수집기가 저장한 목록 레코드를 넣으면 (상세 종류, 통합계약번호) 단위로
+이미 받았거나 대기 중인 키를 걸러 우선순위 단계별 대기열에 쌓고,
+run()이 앞 단계부터 공유 토큰 버킷/호출 장부/서비스키 풀 아래에서 동시에 받아옵니다.
+단계별 읽은 위치(재개 커서)와 키별 상태는 root 아래 파일에 남아 다음 실행에서 이어집니다.
+
+우선순위 규칙 (";"로 단계 구분, 단계 안의 조건은 "&"로 모두 만족):
+    "totCntrctAmt>=1000000000; cntrctCnclsDate<=30d & totCntrctAmt>=100000000"
+    - 필드>=숫자, 필드<=숫자: 금액 기준
+    - 필드<=N일(예: 30d): 날짜 필드가 오늘(한국시간) 기준 N일 이내
+    어느 단계에도 맞지 않는 키는 마지막 단계로 (include_unmatched=False면 받지 않음)
+
+사용 예:
+    fanout = DetailFanout("data/details", [get_detail("change_history")], parse_rules("totCntrctAmt>=1e9"))
+    fanout.enqueue("물품", page.items)
+    fanout.run(client, store, max_calls=200)
+"""
+import os
+import re
+import json
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from .logger import log
+    from .quota import KST
+    from .change_feed import record_fields
+    from .join_index import HashIndex
+    from .circuit_breaker import CIRCUIT_OPEN_ERROR
+except ImportError:
+    from utils.logger import log
+    from utils.quota import KST
+    from utils.change_feed import record_fields
+    from utils.join_index import HashIndex
+    from utils.circuit_breaker import CIRCUIT_OPEN_ERROR
+
+# 키에 해당하는 상세 레코드가 없음 (받은 것으로 처리)
+NO_DATA_ERROR = "API 에러 03"
+# 요청을 보내지 못한 실패 (시도 횟수를 늘리지 않고 다시 대기)
+UNCHARGED_ERRORS = {CIRCUIT_OPEN_ERROR, "사용 가능한 API 키 없음"}
+
+QUEUED = "queued"
+DONE = "done"
+FAILED = "failed"
+
+CONDITION_PATTERN = re.compile(r"^\s*(\w+)\s*(>=|<=)\s*([0-9.eE+]+)(d?)\s*$")
+
+
+def parse_rules(spec):
+    """
+    우선순위 규칙 문자열 → 단계별 조건 목록 [[(필드, 연산자, 값, 일수 여부), ...], ...]
+
+    Raises:
+        ValueError: 해석할 수 없는 조건
+    """
+    rules = []
+    for tier in (spec or "").split(";"):
+        if not tier.strip():
+            continue
+        conditions = []
+        for condition in tier.split("&"):
+            match = CONDITION_PATTERN.match(condition)
+            if not match:
+                raise ValueError(f"우선순위 조건 형식 오류: {condition.strip()} (예: totCntrctAmt>=1000000000, cntrctCnclsDate<=30d)")
+            field, op, value, days = match.groups()
+            conditions.append((field, op, float(value), bool(days)))
+        rules.append(conditions)
+    return rules
+
+
+def _number(value):
+    try:
+        return float((value or "").replace(",", ""))
+    except ValueError:
+        return None
+
+
+def _age_days(value, today):
+    digits = re.sub(r"\D", "", value or "")[:8]
+    try:
+        return (today - datetime.strptime(digits, "%Y%m%d").date()).days
+    except ValueError:
+        return None
+
+
+def _matches(conditions, fields, today):
+    for field, op, value, days in conditions:
+        actual = _age_days(fields.get(field), today) if days else _number(fields.get(field))
+        if actual is None:
+            return False
+        if op == ">=" and actual < value or op == "<=" and actual > value:
+            return False
+    return True
+
+
+class DetailFanout:
+    """
+    상세 레코드 수집 대기열 (우선순위 단계별 파일 + 키 상태 디스크 인덱스)
+
+    대기열은 root/queue/{단계}.jsonl에 [상세 종류, 업무, 키, 시도 횟수]로 추가되고,
+    state.json의 단계별 커서(바이트 위치)까지가 처리된 부분입니다. 끝까지 처리한
+    단계 파일은 비우고 커서를 0으로 돌립니다. 배치마다 키 상태를 먼저 쓰고 커서를
+    옮기므로, 중간에 죽으면 마지막 배치의 일부를 한 번 더 받을 수는 있어도 빠뜨리지 않습니다.
+    """
+
+    STATE_FILE = "state.json"
+
+    def __init__(self, root, details, rules=(), include_unmatched=True, max_attempts=3):
+        self.root = root
+        self.details = list(details)
+        self.rules = list(rules)
+        self.include_unmatched = include_unmatched
+        self.max_attempts = max_attempts
+        self.keys = HashIndex(os.path.join(root, "index"))
+        self.queue_dir = os.path.join(root, "queue")
+        os.makedirs(self.queue_dir, exist_ok=True)
+        self._lock = threading.Lock()
+
+        state = self._load_state()
+        self.cursors = {int(tier): offset for tier, offset in state.get("cursors", {}).items()}
+        self.pending = {int(tier): count for tier, count in state.get("pending", {}).items()}
+
+        # 통계 (이번 실행)
+        self.enqueued = 0
+        self.duplicates = 0
+        self.fetched = 0
+        self.failed = 0
+        self.api_calls = 0
+
+    # ------------------------------------------------------------------
+    # 상태
+    # ------------------------------------------------------------------
+    def _load_state(self):
+        try:
+            with open(os.path.join(self.root, self.STATE_FILE), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def save(self):
+        """키 상태를 파일에 쓴 뒤 커서 저장 (임시 파일 교체)"""
+        with self._lock:
+            self.keys.flush()
+            path = os.path.join(self.root, self.STATE_FILE)
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                json.dump({"cursors": self.cursors, "pending": self.pending}, f, ensure_ascii=False, indent=2)
+            os.replace(f"{path}.tmp", path)
+
+    def _queue_path(self, tier):
+        return os.path.join(self.queue_dir, f"{tier}.jsonl")
+
+    # ------------------------------------------------------------------
+    # 대기열 추가
+    # ------------------------------------------------------------------
+    def tier(self, fields, today=None):
+        """레코드의 우선순위 단계 (0이 가장 먼저, 어느 규칙에도 맞지 않으면 규칙 수 또는 None)"""
+        today = today or datetime.now(KST).date()
+        for index, conditions in enumerate(self.rules):
+            if _matches(conditions, fields, today):
+                return index
+        return len(self.rules) if self.include_unmatched else None
+
+    def enqueue(self, job, items):
+        """
+        저장한 목록 레코드에서 받을 상세 키를 대기열에 추가 (이미 받았거나 대기 중이면 건너뜀)
+
+        Returns:
+            int: 새로 추가한 (상세 종류, 키) 수
+        """
+        today = datetime.now(KST).date()
+        candidates = {}
+        for item in items:
+            fields = record_fields(item)
+            tier = None
+            for detail in self.details:
+                key = fields.get(detail.key_field)
+                if job not in detail.jobs or not key:
+                    continue
+                if tier is None:
+                    tier = self.tier(fields, today)
+                    if tier is None:
+                        break
+                candidates[f"{detail.name}:{key}"] = (tier, [detail.name, job, key, 0])
+        if not candidates:
+            return 0
+
+        with self._lock:
+            known = self.keys.get_many(candidates)
+            by_tier = {}
+            for unit, (tier, entry) in candidates.items():
+                if known[unit]:
+                    self.duplicates += 1
+                    continue
+                self.keys.add(unit, "", QUEUED)
+                by_tier.setdefault(tier, []).append(entry)
+            self._append(by_tier)
+            added = sum(len(entries) for entries in by_tier.values())
+            self.enqueued += added
+        return added
+
+    def _append(self, by_tier):
+        for tier, entries in by_tier.items():
+            with open(self._queue_path(tier), "a", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.pending[tier] = self.pending.get(tier, 0) + len(entries)
+
+    # ------------------------------------------------------------------
+    # 수집
+    # ------------------------------------------------------------------
+    def _take(self, limit):
+        """
+        앞 단계부터 아직 받지 않은 항목을 최대 limit개 (커서는 _commit에서 옮김)
+
+        Returns:
+            tuple: (entries, cursors, consumed) - entries는 [(단계, [상세 종류, 업무, 키, 시도 횟수])],
+                   consumed는 단계별로 읽은 줄 수 (이미 받은 중복 줄 포함)
+        """
+        entries, cursors, consumed = [], {}, {}
+        for tier in self._tiers():
+            path = self._queue_path(tier)
+            with open(path, "rb") as f:
+                f.seek(self.cursors.get(tier, 0))
+                while len(entries) < limit:
+                    line = f.readline()
+                    if not line.endswith(b"\n"):
+                        break
+                    entries.append((tier, json.loads(line)))
+                    consumed[tier] = consumed.get(tier, 0) + 1
+                cursors[tier] = f.tell()
+            if len(entries) >= limit:
+                break
+
+        # 대기열에 같은 키가 두 번 들어간 경우(저장 전 중단) 이미 끝난 것은 건너뜀
+        with self._lock:
+            known = self.keys.get_many(f"{name}:{key}" for _, (name, _, key, _) in entries)
+        fresh = [
+            (tier, entry) for tier, entry in entries
+            if known[f"{entry[0]}:{entry[2]}"].get("") not in (DONE, FAILED)
+        ]
+        return fresh, cursors, consumed
+
+    def _tiers(self):
+        """대기열 파일이 있는 단계 (앞 단계부터)"""
+        return sorted(
+            int(name[:-len(".jsonl")]) for name in os.listdir(self.queue_dir)
+            if name.endswith(".jsonl") and name[:-len(".jsonl")].isdigit()
+        )
+
+    def _commit(self, cursors, consumed, done, failed):
+        """
+        배치 결과 반영: 받은 키는 done, 실패는 시도 횟수를 늘려 같은 단계 끝에 다시 추가
+
+        failed는 [(단계, 항목, 오류)] - 요청을 보내지 못한 오류(서킷 열림 등)는 시도로 세지 않음
+        """
+        retry = {}
+        with self._lock:
+            for _, (name, _, key, _) in done:
+                self.keys.add(f"{name}:{key}", "", DONE)
+            for tier, (name, job, key, attempts), error in failed:
+                if error not in UNCHARGED_ERRORS:
+                    attempts += 1
+                if attempts < self.max_attempts:
+                    retry.setdefault(tier, []).append([name, job, key, attempts])
+                else:
+                    self.keys.add(f"{name}:{key}", "", FAILED)
+                    log(f"⚠️ 상세 수집 포기: {name} {key} ({attempts}회 실패, 마지막 오류: {error})")
+            for tier, offset in cursors.items():
+                self.cursors[tier] = offset
+            for tier, count in consumed.items():
+                self.pending[tier] = max(0, self.pending.get(tier, 0) - count)
+            for tier in cursors:
+                path = self._queue_path(tier)
+                if tier not in retry and self.cursors[tier] >= os.path.getsize(path):
+                    # 끝까지 처리한 단계 파일은 비움
+                    os.remove(path)
+                    self.cursors.pop(tier, None)
+                    self.pending.pop(tier, None)
+            self._append(retry)
+        self.save()
+
+    def run(self, client, store, max_calls, should_stop=None, workers=None, batch_size=50):
+        """
+        대기열을 앞 단계부터 받아 store(상세 종류, 업무, items)로 저장
+
+        배치 단위로 동시에 받고(client.max_workers 또는 workers), 배치가 끝날 때마다
+        저장 → 키 상태/커서 커밋을 하므로 중간에 멈춰도 다음 실행에서 이어집니다.
+        호출 수는 배치 크기를 남은 예산 이하로 잡아 max_calls를 크게 넘지 않습니다.
+
+        Returns:
+            int: 이번에 받은 (상세 종류, 키) 수
+        """
+        workers = max(1, int(workers or client.max_workers))
+        details = {detail.name: detail for detail in self.details}
+        fetched_before = self.fetched
+
+        def fetch(entry):
+            name, job, key, _ = entry[1]
+            detail = details[name]
+            return client.fetch_detail(detail.jobs[job], {detail.key_param: key}, detail.inqry_div)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while self.api_calls < max_calls:
+                reason = should_stop() if should_stop else None
+                if reason:
+                    log(f"⏸️ 상세 수집 중단 ({reason}) - 남은 대기열은 다음 실행에서")
+                    break
+                batch, cursors, consumed = self._take(min(batch_size, max_calls - self.api_calls))
+                if not consumed:
+                    break
+                results = list(executor.map(fetch, batch))
+
+                done, failed, outputs = [], [], {}
+                for entry, (items, calls, error) in zip(batch, results):
+                    self.api_calls += calls
+                    if error is None or error == NO_DATA_ERROR:
+                        done.append(entry)
+                        name, job = entry[1][0], entry[1][1]
+                        outputs.setdefault((name, job), []).extend(items)
+                    else:
+                        failed.append(entry + (error,))
+                for (name, job), items in outputs.items():
+                    if items:
+                        store(details[name], job, items)
+                self.fetched += len(done)
+                self.failed += len(failed)
+                self._commit(cursors, consumed, done, failed)
+                if failed and not done and not any(calls for _, calls, _ in results):
+                    # 요청을 하나도 보내지 못함 (서킷 열림/키 없음) - 같은 항목을 계속 돌지 않음
+                    log(f"⏸️ 상세 수집 중단 ({failed[0][2]}) - 남은 대기열은 다음 실행에서")
+                    break
+        return self.fetched - fetched_before
+
+    def log_stats(self):
+        """실행 결과 요약 로그"""
+        pending = ", ".join(f"{tier}단계 {count:,}" for tier, count in sorted(self.pending.items())) or "없음"
+        log(f"🧾 상세 수집: 받음 {self.fetched:,}건 (실패 {self.failed:,}, 호출 {self.api_calls:,}회), "
+            f"대기열 추가 {self.enqueued:,}건 (중복 {self.duplicates:,}) - 남은 대기열: {pending}")
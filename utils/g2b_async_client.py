@@ -0,0 +1,526 @@
+import time
+import asyncio
+import math
+from collections import deque
+from contextlib import aclosing, nullcontext
+
+# aiohttp는 비동기 수집 모드에서만 필요 (선택 의존성)
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    from .logger import log
+    from .g2b_client import (
+        G2BClient, FetchSummary, PageBatch, parse_page, month_window, items_to_xml, RESPONSE_FORMATS
+    )
+    from .checkpoint import window_id, committed_pages
+    from .windows import split_window, describe_window
+    from .rate_limiter import get_shared_limiter
+    from .xml_parsers import resolve_backend
+    from .key_pool import KeyPool
+    from .timeouts import latency_key
+    from .circuit_breaker import CIRCUIT_OPEN_ERROR, is_outage
+    from .operations import build_params, get_operation
+    from .transport import create_aiohttp_session
+except ImportError:
+    from utils.logger import log
+    from utils.g2b_client import (
+        G2BClient, FetchSummary, PageBatch, parse_page, month_window, items_to_xml, RESPONSE_FORMATS
+    )
+    from utils.checkpoint import window_id, committed_pages
+    from utils.windows import split_window, describe_window
+    from utils.rate_limiter import get_shared_limiter
+    from utils.xml_parsers import resolve_backend
+    from utils.key_pool import KeyPool
+    from utils.timeouts import latency_key
+    from utils.circuit_breaker import CIRCUIT_OPEN_ERROR, is_outage
+    from utils.operations import build_params, get_operation
+    from utils.transport import create_aiohttp_session
+
+
+class AsyncG2BClient:
+    """
+    asyncio 기반 G2B 클라이언트
+
+    G2BClient와 같은 fetch_data/test_connection 계약을 가지며,
+    하나의 커넥션 풀을 공유하고 세마포어로 동시 요청 수를 제한합니다.
+
+    사용 예:
+        async with AsyncG2BClient(api_key, max_concurrency=8) as client:
+            xml_content, item_count, api_calls_used = await client.fetch_data("물품", 2014, 1)
+    """
+
+    BASE_URL = G2BClient.BASE_URL
+    OPERATION_MAP = G2BClient.OPERATION_MAP
+    NUM_OF_ROWS = G2BClient.NUM_OF_ROWS
+    MAX_PAGES = G2BClient.MAX_PAGES
+
+    # urllib3 Retry 설정과 동일한 재시도 대상 상태 코드
+    RETRY_STATUS = {429, 500, 502, 503, 504, 408}
+    BACKOFF_FACTOR = 2
+
+    def __init__(self, api_key, max_concurrency=8, timeout=30, concurrency=None,
+                 rate_limiter=None, ledger=None, parser=None, response_format="xml",
+                 key_pool=None, timeouts=None, breaker=None, page_sizes=None,
+                 split_threshold=None, split_latency=None, archive=None):
+        if aiohttp is None:
+            raise ImportError("AsyncG2BClient를 사용하려면 aiohttp 설치가 필요합니다 (pip install aiohttp)")
+
+        # 서비스키 풀 (G2BClient와 같은 KeyPool - 키별 장부/퇴출 공유 가능)
+        if key_pool is None:
+            keys = [api_key] if isinstance(api_key, str) else list(api_key or [])
+            key_pool = KeyPool([key for key in keys if key])
+        self.key_pool = key_pool
+        self.api_key = key_pool.keys[0] if key_pool.keys else None
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.timeout = timeout
+        # 오퍼레이션/페이지 크기별 적응형 타임아웃 (AdaptiveTimeout, 선택) - 있으면 요청마다 connect/read 타임아웃 적용
+        self.timeouts = timeouts
+        # API 장애 시 요청을 바로 실패시키는 서킷 브레이커 (CircuitBreaker, 선택)
+        self.breaker = breaker
+        # 적응형 동시성 제어기 (AIMDController, 선택) - 세마포어 안에서 추가로 한도 적용
+        self.concurrency = concurrency
+        # G2BClient와 같은 공용 토큰 버킷 사용 (스레드/asyncio 모두 안전)
+        self.rate_limiter = rate_limiter or get_shared_limiter()
+        # 실제 요청 횟수 장부 (QuotaLedger, 선택) - aiohttp는 자동 재시도가 없어 시도마다 기록
+        self.ledger = ledger
+        # XML 파서 백엔드 (G2BClient와 같은 item 레코드 생성)
+        self.parser = resolve_backend(parser)
+        if response_format not in RESPONSE_FORMATS:
+            raise ValueError(f"지원하지 않는 응답 형식: {response_format} (가능: {', '.join(RESPONSE_FORMATS)})")
+        self.response_format = response_format
+        # 오퍼레이션별 numOfRows 조정 결과 (PageSizeTuner, 선택) - 없으면 NUM_OF_ROWS
+        self.page_sizes = page_sizes
+        # 조회 구간 분할 기준 (G2BClient와 같음 - 기본값은 MAX_PAGES × 페이지 크기)
+        self.split_threshold = split_threshold
+        self.split_latency = split_latency
+        # 정상 응답 원본 보관소 (ResponseArchive, 선택) - G2BClient와 같은 키로 보관
+        self.archive = archive
+        # 이어서 수집하는 월의 고정 페이지 크기 (pin_rows)
+        self._pinned_rows = {}
+        self.last_failed_pages = []
+        self.last_window_report = []
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._session = None
+
+    async def __aenter__(self):
+        self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _get_session(self):
+        """공유 커넥션 풀 세션 (최초 사용 시 생성, utils.transport 공용 설정)"""
+        if self._session is None or self._session.closed:
+            self._session = create_aiohttp_session(self.max_concurrency, self.timeout)
+        return self._session
+
+    async def close(self):
+        """세션 및 커넥션 풀 정리"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def rows_for(self, operation):
+        """오퍼레이션에 쓸 numOfRows (고정한 값 > 조정 결과 > NUM_OF_ROWS)"""
+        pinned = self._pinned_rows.get(operation)
+        if pinned:
+            return pinned
+        if self.page_sizes is not None:
+            return self.page_sizes.rows(operation, self.NUM_OF_ROWS)
+        return self.NUM_OF_ROWS
+
+    def pin_rows(self, operation, rows):
+        """오퍼레이션의 페이지 크기 고정 (rows가 None이면 해제, G2BClient.pin_rows와 같음)"""
+        if rows:
+            self._pinned_rows[operation] = rows
+        else:
+            self._pinned_rows.pop(operation, None)
+
+    async def _fetch_page(self, operation, page_no, start_date, end_date, retries=5):
+        """
+        단일 페이지 호출 (세마포어로 동시 요청 수 제한)
+
+        Returns:
+            tuple: (items, total_count, api_calls_used, error)
+        """
+        spec = get_operation(operation)
+        rows = self.rows_for(operation)
+        params = {
+            "numOfRows": rows,
+            "pageNo": page_no,
+            **build_params(spec, start_date, end_date, "1")
+        }
+        if self.response_format != "xml":
+            params["type"] = "json"
+        # 계약정보 오퍼레이션은 BASE_URL을 따르고, 다른 서비스는 레지스트리의 URL 사용
+        base_url = self.BASE_URL if operation in self.OPERATION_MAP.values() else spec.base_url
+        url = f"{base_url}/{operation}"
+        session = self._get_session()
+        timing_key = latency_key(operation, rows)
+        api_calls_used = 0
+        attempt = 0
+
+        while True:
+            key = self.key_pool.acquire()
+            if key is None:
+                log(f"❌ 사용 가능한 API 키 없음 (페이지 {page_no}) - 모든 키가 한도 소진 또는 퇴출")
+                return [], None, api_calls_used, "사용 가능한 API 키 없음"
+            try:
+                params["serviceKey"] = key
+                if self.breaker is not None and not self.breaker.allow():
+                    # API 장애 중에는 요청하지 않고 바로 실패 (재시도/백오프 대기 없음)
+                    return [], None, api_calls_used, CIRCUIT_OPEN_ERROR
+
+                failure = None
+                slot = self.concurrency.async_slot() if self.concurrency else nullcontext()
+                try:
+                    async with self._semaphore, slot:
+                        # 슬롯을 얻은 뒤에 토큰을 받아야 대기 중인 태스크가 토큰을 쌓아 두었다 한꺼번에 보내지 않음
+                        await self.rate_limiter.acquire_async()
+                        started = time.monotonic()
+                        log(f"📡 API 호출: {operation} (페이지 {page_no})")
+                        api_calls_used += 1
+                        self._record_attempt(operation, key)
+                        async with session.get(url, params=params, **self._timeout_kwargs(timing_key)) as response:
+                            status = response.status
+                            if status == 200 and self.timeouts is not None:
+                                self.timeouts.observe(timing_key, time.monotonic() - started)
+                            body = await response.read() if status == 200 else b""
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    log(f"❌ 네트워크 오류 (페이지 {page_no}): {e}")
+                    status, body = None, None
+                    failure = "timeout" if isinstance(e, asyncio.TimeoutError) else "네트워크 오류"
+                    if failure == "timeout" and self.timeouts is not None:
+                        self.timeouts.record_timeout(timing_key)
+
+                if status is None:
+                    self._record_health(False, failure)
+                elif status == 200:
+                    items, total_count, error = parse_page((body,), self.response_format, self.parser)
+                    self._record_health(not is_outage(error), error)
+                    if error is None and self.archive is not None:
+                        await asyncio.to_thread(self.archive.put, operation, dict(params), body)
+                else:
+                    self._record_health(not is_outage(status=status), f"HTTP {status}")
+
+                if status == 200:
+                    if self.key_pool.report_error(key, error):
+                        # 키 문제(한도 초과/인증 오류)는 다른 키로 바로 다시 요청
+                        continue
+                    self._record_feedback(started, error)
+                    return items, total_count, api_calls_used, error
+
+                if status is not None and self.key_pool.report_error(key, f"HTTP {status}"):
+                    continue
+            finally:
+                # 보냈든 보내지 않았든 예약 반납 (보낸 요청은 _record_attempt로 장부에 기록됨)
+                self.key_pool.release(key)
+
+            self._record_feedback(started, failure or f"HTTP {status}")
+
+            if status is not None and status not in self.RETRY_STATUS:
+                log(f"❌ HTTP 오류: {status}")
+                return [], None, api_calls_used, f"HTTP {status}"
+
+            if attempt >= retries or (self.breaker is not None and self.breaker.tripped):
+                return [], None, api_calls_used, f"HTTP {status}" if status else "네트워크 오류"
+
+            attempt += 1
+            wait = self.BACKOFF_FACTOR * (2 ** (attempt - 1))
+            log(f"⏳ 페이지 {page_no} 재시도 {attempt}/{retries} ({wait}초 후)")
+            await asyncio.sleep(wait)
+
+    def _timeout_kwargs(self, timing_key):
+        """적응형 타임아웃이 있으면 요청별 connect/read 타임아웃 (없으면 세션 기본값)"""
+        if self.timeouts is None:
+            return {}
+        connect, read = self.timeouts.timeout(timing_key)
+        return {"timeout": aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)}
+
+    def _record_attempt(self, operation, key=None):
+        """실제 전송 시도 1회를 장부(전체/키별)에 기록"""
+        if self.ledger is not None:
+            self.ledger.record(operation)
+        if key is not None:
+            self.key_pool.record(key, operation)
+
+    def _record_health(self, success, reason=None):
+        """서킷 브레이커에 요청 결과 전달 (브레이커가 없으면 무시)"""
+        if self.breaker is not None:
+            self.breaker.record(success, reason)
+
+    def _record_feedback(self, started, failure=None):
+        """동시성 제어기에 요청 결과 전달 (제어기가 없으면 무시)"""
+        if self.concurrency is not None:
+            self.concurrency.record(time.monotonic() - started, failure)
+
+    async def iter_pages(self, job_type, year, month, retries=5, stats=None):
+        """
+        월 단위 페이지를 동시에 요청하고 페이지 순서대로 yield
+
+        동시 요청 수만큼만 앞서 요청하므로 메모리에는 그만큼의 페이지만 남습니다.
+
+        Args:
+            stats: 전달하면 api_calls_used, failed_pages가 채워지는 dict
+
+        Yields:
+            tuple: (page_no, items)
+        """
+        if stats is None:
+            stats = {}
+        stats.setdefault("api_calls_used", 0)
+        stats.setdefault("failed_pages", [])
+
+        summary = FetchSummary()
+        batches = self.iter_batches(job_type, year, month, retries, summary)
+        try:
+            async for batch in batches:
+                yield batch.page_no, batch.items
+        finally:
+            await batches.aclose()
+            stats["api_calls_used"] += summary.api_calls_used
+            stats["failed_pages"].extend(page_no for _, page_no in summary.failed_pages)
+
+    async def iter_batches(self, job_type, year, month, retries=5, summary=None, resume=None):
+        """
+        월 단위 페이지를 PageBatch로 yield (MonthCheckpoint로 이어서 수집)
+
+        G2BClient.iter_pages와 같은 summary/resume 계약과 구간 분할 규칙을 따르므로
+        어느 모드에서 시작한 체크포인트든 이어서 받을 수 있습니다.
+
+        Args:
+            summary: 결과를 채울 FetchSummary (없으면 내부에서 생성)
+            resume: MonthCheckpoint.resume_state() 구간별 상태 (없으면 처음부터)
+
+        Yields:
+            PageBatch: (start_date, end_date, page_no, total_count, items)
+        """
+        summary = summary if summary is not None else FetchSummary()
+        # G2BClient와 같이 CoverageMap.record_month가 읽는 마지막 결과
+        self.last_failed_pages = summary.failed_pages
+        self.last_window_report = summary.window_report
+
+        if job_type not in self.OPERATION_MAP:
+            log(f"❌ 잘못된 업무 구분: {job_type}")
+            return
+
+        operation = self.OPERATION_MAP[job_type]
+        start_date, end_date = month_window(year, month)
+        log(f"📅 조회 기간: {start_date} ~ {end_date}")
+
+        try:
+            async with aclosing(self._iter_window(
+                operation, start_date, end_date, retries, summary, resume or {}
+            )) as pages:
+                async for batch in pages:
+                    yield batch
+            summary.completed = True
+        finally:
+            reports = summary.window_report
+            for report in reports:
+                summary.failed_pages.extend(
+                    (report["start"], page_no) for page_no in report["failed_pages"]
+                )
+            if reports:
+                summary.total_count = reports[0]["total_count"]
+            if len(reports) > 1:
+                self._log_window_report(reports)
+
+    # 분할 기준/집계는 G2BClient와 공용
+    _split_reason = G2BClient._split_reason
+    _add_calls = staticmethod(G2BClient._add_calls)
+    _emit = staticmethod(G2BClient._emit)
+    _log_window_report = staticmethod(G2BClient._log_window_report)
+
+    async def _iter_window(self, operation, start_date, end_date, retries, summary, resume):
+        """
+        한 조회 구간을 PageBatch로 yield (G2BClient._iter_window와 같은 분할/재개 규칙)
+
+        totalCount가 분할 기준을 넘으면 하위 구간으로 재귀 분할하므로 MAX_PAGES에서 잘리지 않고,
+        이전 실행에서 분할한 구간은 첫 페이지 없이 같은 하위 구간으로 이어갑니다.
+        """
+        report = {
+            "start": start_date,
+            "end": end_date,
+            "total_count": None,
+            "item_count": 0,
+            "pages": 0,
+            "api_calls_used": 0,
+            "failed_pages": [],
+            "split": False
+        }
+        summary.window_report.append(report)
+
+        state = resume.get(window_id(start_date, end_date))
+        if state and state.get("split"):
+            report["total_count"] = state.get("total_count")
+            report["split"] = True
+            for sub_start, sub_end in split_window(start_date, end_date):
+                async with aclosing(self._iter_window(
+                    operation, sub_start, sub_end, retries, summary, resume
+                )) as pages:
+                    async for batch in pages:
+                        yield batch
+            return
+
+        done = committed_pages(state)
+        if state and (1 in done or state.get("total_count") == 0):
+            total_count = report["total_count"] = state.get("total_count")
+            if total_count == 0:
+                return
+            log(f"⏩ {describe_window(start_date, end_date)}: 체크포인트에서 재개 ({len(done)}페이지 저장됨)")
+        else:
+            started = time.monotonic()
+            items, total_count, calls, error = await self._fetch_page(
+                operation, 1, start_date, end_date, retries
+            )
+            latency = time.monotonic() - started
+            report["total_count"] = total_count
+            self._add_calls(report, summary, calls)
+            if error:
+                report["failed_pages"].append(1)
+                return
+
+            reason = self._split_reason(operation, total_count, latency) if items else None
+            subwindows = split_window(start_date, end_date) if reason else []
+            if subwindows:
+                log(f"✂️ {describe_window(start_date, end_date)} 분할 ({reason}) → {len(subwindows)}개 구간")
+                report["split"] = True
+                for sub_start, sub_end in subwindows:
+                    async with aclosing(self._iter_window(
+                        operation, sub_start, sub_end, retries, summary, resume
+                    )) as pages:
+                        async for batch in pages:
+                            yield batch
+                return
+            if reason:
+                log(f"⚠️ {describe_window(start_date, end_date)}: 하루 단위라 더 나눌 수 없음 ({reason})")
+
+            if not items:
+                log("ℹ️ 페이지 1: 데이터 없음 (수집 완료)")
+                return
+            done = {1}
+            yield self._emit(report, summary, 1, items)
+
+        async with aclosing(self._iter_rest(
+            operation, start_date, end_date, total_count, done, retries, report, summary
+        )) as pages:
+            async for batch in pages:
+                yield batch
+
+    async def _iter_rest(self, operation, start_date, end_date, total_count, done, retries, report,
+                         summary):
+        """페이지 1 이후 아직 저장하지 않은 페이지를 yield (동시 요청 수만큼 앞서 요청)"""
+        if total_count is None:
+            # totalCount가 없으면 빈 페이지가 나올 때까지 순차 수집
+            for page_no in range(max(done) + 1, self.MAX_PAGES + 1):
+                items, _, calls, error = await self._fetch_page(
+                    operation, page_no, start_date, end_date, retries
+                )
+                self._add_calls(report, summary, calls)
+                if error:
+                    report["failed_pages"].append(page_no)
+                    return
+                if not items:
+                    return
+                yield self._emit(report, summary, page_no, items)
+            return
+
+        total_pages = min(math.ceil(total_count / self.rows_for(operation)), self.MAX_PAGES)
+        page_numbers = [page_no for page_no in range(2, total_pages + 1) if page_no not in done]
+        if not page_numbers:
+            return
+
+        log(f"📑 전체 {total_count:,}건 → {total_pages}페이지 "
+            f"(남은 {len(page_numbers)}페이지, 동시 {self.max_concurrency}개)")
+        remaining = iter(page_numbers)
+        pending = deque()
+
+        def schedule_next():
+            page_no = next(remaining, None)
+            if page_no is not None:
+                pending.append((page_no, asyncio.ensure_future(
+                    self._fetch_page(operation, page_no, start_date, end_date, retries)
+                )))
+
+        for _ in range(self.max_concurrency):
+            schedule_next()
+
+        try:
+            while pending:
+                page_no, task = pending.popleft()
+                items, _, calls, error = await task
+                self._add_calls(report, summary, calls)
+                schedule_next()
+                if error:
+                    report["failed_pages"].append(page_no)
+                    continue
+                yield self._emit(report, summary, page_no, items)
+        finally:
+            # 소비자가 중간에 멈추면 남은 요청 취소
+            for _, task in pending:
+                task.cancel()
+
+    async def iter_items(self, job_type, year, month, retries=5, stats=None):
+        """item 레코드를 페이지 순서대로 하나씩 yield"""
+        async for _, items in self.iter_pages(job_type, year, month, retries, stats):
+            for item in items:
+                yield item
+
+    async def fetch_data(self, job_type, year, month, retries=5):
+        """
+        G2B API 호출 및 데이터 수집 (G2BClient.fetch_data와 동일한 반환값)
+
+        Returns:
+            tuple: (xml_content, item_count, api_calls_used)
+        """
+        if not self.key_pool.keys:
+            raise ValueError("API_KEY가 설정되지 않았습니다.")
+
+        stats = {}
+        all_items = []
+        async for page_no, items in self.iter_pages(job_type, year, month, retries, stats):
+            all_items.extend(items)
+            log(f"✅ 페이지 {page_no}: {len(items)}건 수집 (총 {len(all_items)}건)")
+
+        api_calls_used = stats.get("api_calls_used", 0)
+        if stats.get("failed_pages"):
+            log(f"⚠️ 실패 페이지: {stats['failed_pages']}")
+
+        if all_items:
+            log(f"🎯 수집 완료: {len(all_items):,}건 (API 호출: {api_calls_used}회)")
+            return items_to_xml(all_items), len(all_items), api_calls_used
+
+        log(f"ℹ️ 수집 결과: 0건 (API 호출: {api_calls_used}회)")
+        return "", 0, api_calls_used
+
+    async def test_connection(self):
+        """API 연결 테스트"""
+        try:
+            params = {
+                "serviceKey": self.api_key,
+                "numOfRows": 1,
+                "pageNo": 1,
+                "inqryDiv": 1,
+                "inqryBgnDt": "202401010000",
+                "inqryEndDt": "202401012359"
+            }
+
+            url = f"{self.BASE_URL}/getCntrctInfoListThng"
+            session = self._get_session()
+            await self.rate_limiter.acquire_async()
+            self._record_attempt("getCntrctInfoListThng", self.api_key)
+            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status == 200:
+                    log("✅ G2B API 연결 테스트 성공")
+                    return True
+                log(f"❌ G2B API 연결 실패: {response.status}")
+                return False
+
+        except Exception as e:
+            log(f"❌ G2B API 테스트 오류: {e}")
+            return False
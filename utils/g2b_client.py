@@ -1,10 +1,13 @@
 import os
+import json
 import time
+import itertools
+import math
+import threading
 import requests
 import calendar
-import xml.etree.ElementTree as ET
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import random
 
 # logger 임포트 (같은 utils 폴더 내)
@@ -18,172 +21,1134 @@ except ImportError:
         def log(msg):
             print(f"[LOG] {msg}")
 
+try:
+    from .rate_limiter import get_shared_limiter
+    from .transport import create_session
+    from .windows import split_window, describe_window
+    from .xml_parsers import ParseError, create_parser, resolve_backend, serialize_mapping
+    from .checkpoint import window_id, committed_pages
+    from .key_pool import KeyPool
+    from .timeouts import latency_key
+    from .circuit_breaker import CIRCUIT_OPEN_ERROR, is_outage
+    from .operations import CONTRACT_SERVICE, build_params, get_operation, get_service
+except ImportError:
+    from utils.rate_limiter import get_shared_limiter
+    from utils.transport import create_session
+    from utils.windows import split_window, describe_window
+    from utils.xml_parsers import ParseError, create_parser, resolve_backend, serialize_mapping
+    from utils.checkpoint import window_id, committed_pages
+    from utils.key_pool import KeyPool
+    from utils.timeouts import latency_key
+    from utils.circuit_breaker import CIRCUIT_OPEN_ERROR, is_outage
+    from utils.operations import CONTRACT_SERVICE, build_params, get_operation, get_service
+
+
+def parse_response(data, parser=None):
+    """
+    G2B 응답 XML 파싱 (동기/비동기 클라이언트 공용)
+
+    Args:
+        data: 응답 본문 (bytes 권장 - XML 선언의 인코딩을 그대로 따름)
+        parser: XML 파서 백엔드 이름 (etree/expat/lxml, 기본 auto)
+
+    Returns:
+        tuple: (items, total_count, error)
+               items는 item 레코드(직렬화된 <item> 문자열) 목록,
+               error가 None이 아니면 파싱 실패 또는 API 에러
+    """
+    return parse_response_stream((data,), parser)
+
+
+def iter_response_items(chunks, header, parser=None):
+    """
+    응답 청크를 점진적으로 파싱하며 <item>이 닫히는 즉시 item 레코드를 yield
+
+    - 파싱이 끝난 item은 버리므로 메모리는 페이지 크기와 무관하게 일정
+    - header(dict)에 resultCode/resultMsg/totalCount가 채워짐
+    - resultCode가 "00"이 아니면 본문을 더 읽지 않고 즉시 종료
+
+    Raises:
+        ParseError: XML 형식 오류
+    """
+    backend = create_parser(parser, header)
+    for chunk in chunks:
+        if not chunk:
+            continue
+        yield from backend.feed(chunk)
+        if header.get("resultCode", "00") != "00" and "resultMsg" in header:
+            return
+    yield from backend.close()
+
+
+def parse_response_stream(chunks, parser=None):
+    """
+    parse_response의 스트리밍 버전 (응답 전체 문자열/트리를 만들지 않음)
+
+    Returns:
+        tuple: (items, total_count, error)
+    """
+    header = {}
+    try:
+        items = list(iter_response_items(chunks, header, parser))
+    except ParseError as e:
+        # 에러 응답 뒤의 깨진 본문은 무시하고 resultCode로 판단
+        if (header.get("resultCode") or header.get("returnReasonCode") or "00") == "00":
+            log(f"❌ XML 파싱 오류: {e}")
+            return [], None, f"XML 파싱 오류: {e}"
+        items = []
+
+    # 게이트웨이 에러(OpenAPI_ServiceResponse)는 returnReasonCode로 옴 (한도 초과, 미등록 키 등)
+    result_code = header.get("resultCode") or header.get("returnReasonCode")
+    if result_code is not None and result_code != "00":
+        message = header.get("resultMsg") or header.get("returnAuthMsg") or "Unknown error"
+        log(f"❌ API 에러: {result_code} - {message}")
+        return [], None, f"API 에러 {result_code}"
+
+    try:
+        total_count = int(header["totalCount"]) if header.get("totalCount") else None
+    except ValueError:
+        total_count = None
+
+    return items, total_count, None
+
+
+def parse_json_response(data):
+    """
+    type=json 응답 파싱 (XML과 같은 item 레코드로 정규화)
+
+    봉투 형식:
+        {"response": {"header": {"resultCode": "00", "resultMsg": ...},
+                      "body": {"items": [...] 또는 {"item": [...]}, "totalCount": 123}}}
+
+    Returns:
+        tuple: (items, total_count, error)
+    """
+    try:
+        document = json.loads(data)
+    except ValueError as e:
+        log(f"❌ JSON 파싱 오류: {e}")
+        return [], None, f"JSON 파싱 오류: {e}"
+
+    # 정상 응답은 "response", 에러 응답은 다른 이름의 최상위 키 하나로 감싸져 옴
+    envelope = document.get("response") if isinstance(document, dict) else None
+    if envelope is None and isinstance(document, dict) and len(document) == 1:
+        envelope = next(iter(document.values()))
+    if not isinstance(envelope, dict):
+        log("❌ JSON 파싱 오류: 응답 봉투 없음")
+        return [], None, "JSON 파싱 오류: 응답 봉투 없음"
+
+    header = envelope.get("header") or envelope.get("cmmMsgHeader") or {}
+    result_code = header.get("resultCode") or header.get("returnReasonCode")
+    if result_code is not None and result_code != "00":
+        message = header.get("resultMsg") or header.get("returnAuthMsg") or "Unknown error"
+        log(f"❌ API 에러: {result_code} - {message}")
+        return [], None, f"API 에러 {result_code}"
+
+    body = envelope.get("body") or {}
+    items = body.get("items") or []
+    if isinstance(items, dict):
+        items = items.get("item") or []
+    if isinstance(items, dict):
+        # 1건이면 리스트가 아닌 객체로 옴
+        items = [items]
+
+    try:
+        total_count = int(body["totalCount"]) if body.get("totalCount") not in (None, "") else None
+    except (TypeError, ValueError):
+        total_count = None
+
+    return [serialize_mapping("item", item) for item in items], total_count, None
+
+
+RESPONSE_FORMATS = ("xml", "json", "auto")
+
+# 조회구분(inqryDiv) - 월 단위 수집은 등록일시, 변경분 수집은 변경일시 기준
+INQRY_DIV_REGISTERED = "1"
+INQRY_DIV_CHANGED = "3"
+
+
+def parse_page(chunks, response_format="xml", parser=None):
+    """
+    응답 형식에 맞춰 페이지 파싱
+
+    - xml: XML 파서 백엔드로 점진 파싱
+    - json: JSON 봉투 파싱 (JSON은 전체 본문을 모은 뒤 디코딩)
+    - auto: 본문 첫 글자로 판별 (type=json 요청에도 게이트웨이 에러는 XML로 올 수 있음)
+
+    Returns:
+        tuple: (items, total_count, error)
+    """
+    if response_format == "xml":
+        return parse_response_stream(chunks, parser)
+
+    chunks = iter(chunks)
+    first = next((chunk for chunk in chunks if chunk), b"")
+    if response_format == "auto" and first.lstrip()[:1] == b"<":
+        return parse_response_stream(itertools.chain((first,), chunks), parser)
+    return parse_json_response(first + b"".join(chunks))
+
+
+def _collect_chunks(chunks, out):
+    """청크를 그대로 넘기면서 out에도 모음 (파싱과 원본 보관을 한 번의 수신으로)"""
+    for chunk in chunks:
+        out.append(chunk)
+        yield chunk
+
+
+def month_window(year, month):
+    """조회 월의 시작/종료 일시 (YYYYMMDDHHMM)"""
+    start_date = f"{year}{month:02d}010000"
+    last_day = calendar.monthrange(year, month)[1]
+    end_date = f"{year}{month:02d}{last_day}2359"
+    return start_date, end_date
+
+
+def merge_duplicate_items(items):
+    """구간 경계에서 중복 수집된 item 제거 (내용이 완전히 같은 item은 한 번만)"""
+    seen = set()
+    unique = []
+    for item in items:
+        if item in seen:
+            continue
+        seen.add(item)
+        unique.append(item)
+    if len(unique) != len(items):
+        log(f"🔁 구간 경계 중복 {len(items) - len(unique)}건 제거")
+    return unique
+
+
+def items_to_xml(items):
+    """item 레코드 목록을 연도별 파일에 붙일 XML 문자열로 변환"""
+    return "".join(item + "\n" for item in items)
+
+
+# iter_pages가 내보내는 페이지 단위 결과
+PageBatch = namedtuple("PageBatch", "start_date end_date page_no total_count items")
+
+# 요청 1회 결과 (calls는 urllib3 재시도 포함 실제 호출 수, started/finished는 monotonic 시각)
+Attempt = namedtuple("Attempt", "key response parsed error calls started finished")
+
+
+class FetchSummary:
+    """
+    iter_pages/iter_items 수집 결과 요약
+
+    수집 중에도 item_count/api_calls_used가 갱신되므로 예산 확인에 쓸 수 있고,
+    제너레이터가 끝나면(중간에 멈춘 경우 포함) 나머지 항목이 채워집니다.
+    """
+
+    def __init__(self):
+        self.item_count = 0
+        self.api_calls_used = 0
+        self.pages = 0
+        self.total_count = None     # 월 전체 totalCount (첫 페이지 기준)
+        self.failed_pages = []      # (구간 시작일시, 페이지 번호)
+        self.window_report = []     # 구간별 결과 dict
+        self.completed = False      # 소비자가 멈추지 않고 끝까지 수집했는지
+
 
 class G2BClient:
-    # ✅ 올바른 계약정보 서비스 URL
-    BASE_URL = "http://apis.data.go.kr/1230000/ao/CntrctInfoService"
+    # ✅ 올바른 계약정보 서비스 URL (다른 서비스는 utils.operations 레지스트리 참고)
+    BASE_URL = get_service(CONTRACT_SERVICE).base_url
 
     # 작업별 오퍼레이션 매핑
-    OPERATION_MAP = {
-        "물품": "getCntrctInfoListThng",
-        "공사": "getCntrctInfoListCnstwk",
-        "용역": "getCntrctInfoListServc",
-        "외자": "getCntrctInfoListFrgcpt"
-    }
-
-    def __init__(self, api_key):
-        self.api_key = api_key
+    OPERATION_MAP = dict(get_service(CONTRACT_SERVICE).jobs)
+
+    NUM_OF_ROWS = 999  # ← 1000 → 999
+    MAX_PAGES = 500    # API 한도 고려
+    STREAM_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, api_key, max_workers=1, concurrency=None, rate_limiter=None,
+                 ledger=None, split_threshold=None, split_latency=None, streaming=False,
+                 parser=None, response_format="xml", key_pool=None, hedging=None,
+                 timeouts=None, breaker=None, archive=None, replay=False,
+                 service=CONTRACT_SERVICE, page_sizes=None):
+        """
+        Args:
+            api_key: 공공데이터포털 서비스키 (여러 개면 리스트)
+            max_workers: 페이지 동시 수집 워커 수 (1이면 기존처럼 순차 수집)
+            concurrency: AIMDController 등 적응형 동시성 제어기 (선택)
+                         지정하면 동시 수집 시 제어기 한도만큼만 요청이 진행됨
+            rate_limiter: 요청마다 토큰을 소비할 TokenBucket (기본: 프로세스 공용 제한기)
+            ledger: 실제 전송 시도(urllib3 재시도 포함)를 기록할 QuotaLedger (선택)
+            split_threshold: totalCount가 이 값을 넘으면 조회 구간 분할
+                             (기본: MAX_PAGES × 페이지 크기, 즉 잘릴 수밖에 없는 구간, 0이면 사용 안 함)
+            split_latency: 첫 페이지 응답이 이 시간(초)을 넘으면 조회 구간 분할 (기본: 사용 안 함)
+            streaming: True면 응답을 받는 동안 점진적으로 파싱 (응답 전체를 메모리에 올리지 않음)
+            parser: XML 파서 백엔드 (etree/expat/lxml, 기본 auto - 설치된 것 중 가장 빠른 것)
+            response_format: 응답 형식 (xml, json, auto - JSON 요청 후 본문으로 판별)
+            key_pool: 여러 서비스키를 나눠 쓸 KeyPool (없으면 api_key로 생성)
+                      한도 초과/인증 오류 resultCode를 받은 키는 퇴출되고 다른 키로 다시 요청
+            hedging: 지연된 요청을 한 번 더 보내는 HedgePolicy (선택, 중복 요청 수는 정책이 제한)
+            timeouts: 오퍼레이션/페이지 크기별 지연 분포로 타임아웃을 정하는 AdaptiveTimeout
+                      (선택, 없으면 고정 30초)
+            breaker: API 장애 시 요청을 바로 실패시키는 CircuitBreaker (선택)
+                     서킷이 열려 있으면 페이지 오류는 CIRCUIT_OPEN_ERROR
+            archive: 정상 응답 원본을 압축해 보관할 ResponseArchive (선택)
+            replay: True면 API를 호출하지 않고 archive의 응답으로만 수집 (할당량/키 불필요)
+            service: 업무 구분(물품/공사/용역/외자)에 쓸 서비스 (utils.operations에 등록된 이름)
+                     예) BidPublicInfoService(입찰공고), ScsbidInfoService(낙찰)
+            page_sizes: 오퍼레이션별 numOfRows 조정 결과 PageSizeTuner (선택, 없으면 NUM_OF_ROWS)
+        """
+        if replay and archive is None:
+            raise ValueError("replay 모드에는 archive가 필요합니다")
+        self.service = service
+        if service != CONTRACT_SERVICE:
+            spec = get_service(service)
+            self.BASE_URL = spec.base_url
+            self.OPERATION_MAP = dict(spec.jobs)
+        if key_pool is None:
+            keys = [api_key] if isinstance(api_key, str) else list(api_key or [])
+            key_pool = KeyPool([key for key in keys if key])
+        self.key_pool = key_pool
+        self.api_key = key_pool.keys[0] if key_pool.keys else None
+        self.max_workers = max(1, int(max_workers or 1))
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter or get_shared_limiter()
+        self.ledger = ledger
+        self._wire = threading.local()
+        self.page_sizes = page_sizes
+        # 진행 중인 월 체크포인트에 맞춰 고정한 페이지 크기 (오퍼레이션 → numOfRows)
+        self._pinned_rows = {}
+        self.split_threshold = split_threshold
+        self.split_latency = split_latency
+        self.streaming = streaming
+        self.parser = resolve_backend(parser)
+        if response_format not in RESPONSE_FORMATS:
+            raise ValueError(f"지원하지 않는 응답 형식: {response_format} (가능: {', '.join(RESPONSE_FORMATS)})")
+        self.response_format = response_format
+        self.hedging = hedging
+        self.timeouts = timeouts
+        self.breaker = breaker
+        self.archive = archive
+        self.replay = replay
+        self._hedge_pool = None
+        self._hedge_lock = threading.Lock()
+        self.last_failed_pages = []
+        self.last_window_report = []
         self.session = self._create_session()
 
     def _create_session(self):
-        """강화된 세션 설정"""
-        session = requests.Session()
-
+        """강화된 세션 설정 (utils.transport 공용 전송 계층)"""
         # 재시도 전략 설정
-        retry_strategy = Retry(
+        retry_strategy = dict(
             total=3,
             status_forcelist=[429, 500, 502, 503, 504, 408],
             backoff_factor=2
         )
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+        # 동시에 나갈 수 있는 요청 수만큼 커넥션을 재사용할 수 있도록 풀 크기 지정
+        # (중복 요청을 쓰면 페이지마다 최대 2개가 동시에 나감)
+        in_flight = max(10, self.max_workers, self.concurrency.max_limit if self.concurrency else 0)
+        if self.hedging is not None:
+            in_flight *= 2
+
+        # 모든 전송 시도(재시도 포함)를 장부에 기록
+        return create_session(in_flight, self._on_wire_attempt, retry_strategy)
+
+    def _on_wire_attempt(self, operation):
+        """실제 HTTP 요청이 나갈 때마다 호출 (urllib3 재시도 포함)"""
+        self._wire.count = getattr(self._wire, "count", 0) + 1
+        if self.ledger is not None:
+            self.ledger.record(operation)
+        # 이 스레드가 지금 쓰는 서비스키의 장부에도 기록
+        key = getattr(self._wire, "key", None)
+        if key is not None:
+            self.key_pool.record(key, operation)
+
+    def _wire_attempts(self):
+        """현재 스레드에서 지금까지 전송된 요청 수"""
+        return getattr(self._wire, "count", 0)
+
+    def _wire_bytes(self):
+        """현재 스레드에서 지금까지 받은 정상 응답 바이트 (압축 해제 전)"""
+        return getattr(self._wire, "bytes", 0)
+
+    def rows_for(self, operation):
+        """오퍼레이션에 쓸 numOfRows (고정한 값 > 조정 결과 > NUM_OF_ROWS)"""
+        pinned = self._pinned_rows.get(operation)
+        if pinned:
+            return pinned
+        if self.page_sizes is not None:
+            return self.page_sizes.rows(operation, self.NUM_OF_ROWS)
+        return self.NUM_OF_ROWS
+
+    def pin_rows(self, operation, rows):
+        """
+        오퍼레이션의 페이지 크기 고정 (rows가 None이면 해제)
+
+        페이지 번호는 페이지 크기에 따라 달라지므로, 다른 크기로 시작한 월을
+        이어서 수집할 때는 그 월이 끝날 때까지 시작한 크기를 씁니다.
+        """
+        if rows:
+            self._pinned_rows[operation] = rows
+        else:
+            self._pinned_rows.pop(operation, None)
+
+    def _fetch_page(self, operation, page_no, start_date, end_date, retries=5,
+                    num_of_rows=None, inqry_div=INQRY_DIV_REGISTERED):
+        """
+        단일 페이지 호출 (네트워크 오류 시 재시도)
+
+        Args:
+            num_of_rows: 페이지 크기 (기본 rows_for(operation), 건수 확인용 probe는 1)
+            inqry_div: 조회구분 (기본 등록일시, 변경분 수집은 iter_changes 참고)
+
+        Returns:
+            tuple: (items, total_count, api_calls_used, error)
+                   error가 None이 아니면 해당 페이지는 실패
+        """
+        spec = get_operation(operation)
+        params = {
+            "numOfRows": num_of_rows or self.rows_for(operation),
+            "pageNo": page_no,
+            # 조회구분/조회 기간 파라미터 이름은 서비스 선언을 따름 (inqryDiv는 문자열 "1")
+            **build_params(spec, start_date, end_date, inqry_div)
+        }
+        return self._request(spec, params, page_no, retries)
+
+    def _request(self, spec, params, page_no, retries):
+        """
+        요청 파라미터를 정한 페이지 1개 호출 (서비스키 선택, 서킷 확인, 재시도)
+
+        Returns:
+            tuple: (items, total_count, api_calls_used, error)
+        """
+        operation = spec.operation
+        if self.response_format != "xml":
+            params["type"] = "json"
+        url = self._operation_url(spec)
+        api_calls_used = 0
+
+        if self.replay:
+            return self._replay_page(operation, params, page_no)
+
+        while True:
+            reserved = self.key_pool.acquire()
+            if reserved is None:
+                log(f"❌ 사용 가능한 API 키 없음 (페이지 {page_no}) - 모든 키가 한도 소진 또는 퇴출")
+                return [], None, api_calls_used, "사용 가능한 API 키 없음"
+            key = reserved
+            try:
+                params["serviceKey"] = key
+                if self.breaker is not None and not self.breaker.allow():
+                    # API 장애 중에는 요청하지 않고 바로 실패 (재시도/백오프 대기 없음)
+                    return [], None, api_calls_used, CIRCUIT_OPEN_ERROR
+
+                log(f"📡 API 호출: {operation} (페이지 {page_no})")
+                attempt = self._send_hedged(url, params, latency_key(operation, params["numOfRows"]), page_no)
+                key, response, parsed, started = attempt.key, attempt.response, attempt.parsed, attempt.started
+                # urllib3 내부 재시도까지 포함한 실제 요청 수
+                api_calls_used += attempt.calls
+
+                if attempt.error is not None:
+                    e = attempt.error
+                    log(f"❌ 네트워크 오류 (페이지 {page_no}): {e}")
+                    self._record_feedback(started, self._classify_exception(e))
+                    self._record_health(False, self._classify_exception(e))
+                    if retries > 0 and not (self.breaker is not None and self.breaker.tripped):
+                        log(f"⏳ {retries}회 재시도 남음...")
+                        time.sleep(2)
+                        retries -= 1
+                        continue
+                    return [], None, api_calls_used, f"네트워크 오류: {e}"
+
+                # 응답 상태 확인
+                if response.status_code != 200:
+                    self._record_health(not is_outage(status=response.status_code), f"HTTP {response.status_code}")
+                    if self.key_pool.report_error(key, f"HTTP {response.status_code}"):
+                        continue
+                    log(f"❌ HTTP 오류: {response.status_code}")
+                    self._record_feedback(started, f"HTTP {response.status_code}")
+                    return [], None, api_calls_used, f"HTTP {response.status_code}"
+
+                items, total_count, error = parsed
+                # 압축 해제 전 실제 수신 바이트 (페이지 크기 측정용, 중복 요청이면 먼저 도착한 쪽)
+                self._wire.bytes = self._wire_bytes() + (response.raw.tell() or 0)
+                self._record_health(not is_outage(error), error)
+                if self.key_pool.report_error(key, error):
+                    # 키 문제(한도 초과/인증 오류)는 다른 키로 바로 다시 요청 (재시도 횟수 차감 없음)
+                    continue
+                self._record_feedback(started, error or self._retried_status(response))
+                return items, total_count, api_calls_used, error
+            finally:
+                # 보냈든 보내지 않았든 예약 반납 (보낸 요청은 전송 시도마다 장부에 기록됨)
+                self.key_pool.release(reserved)
+
+    def _operation_url(self, spec):
+        """오퍼레이션 URL (이 클라이언트의 서비스면 BASE_URL을 따름)"""
+        base_url = self.BASE_URL if spec.service == self.service else spec.base_url
+        return f"{base_url}/{spec.operation}"
+
+    def _replay_page(self, operation, params, page_no):
+        """아카이브에 보관한 응답으로 페이지 파싱 (API 호출 0회)"""
+        body = self.archive.get(operation, params)
+        if body is None:
+            log(f"❌ 보관된 응답 없음: {operation} (페이지 {page_no})")
+            return [], None, 0, "보관된 응답 없음"
+        self._wire.bytes = self._wire_bytes() + len(body)
+        items, total_count, error = parse_page((body,), self.response_format, self.parser)
+        return items, total_count, 0, error
+
+    def _send(self, url, params, timing_key):
+        """
+        요청 1회 전송 후 본문까지 파싱 (urllib3 재시도 포함, 응답은 닫아서 반환)
+
+        timeouts가 있으면 timing_key(오퍼레이션 × 페이지 크기)의 지연 분포로
+        타임아웃을 정하고, 정상 응답의 헤더 지연을 다시 분포에 기록합니다.
+        archive가 있으면 오류 없이 파싱된 응답 원본을 보관합니다.
+
+        Returns:
+            Attempt: 네트워크 오류면 error에 예외, 아니면 response/parsed(200일 때만)
+        """
+        key = params["serviceKey"]
+        self._wire.key = key
+        self.rate_limiter.acquire()
+        started = time.monotonic()
+        wire_before = self._wire_attempts()
+        response = parsed = error = None
+        timeouts = self.timeouts
+        try:
+            response = self.session.get(
+                url, params=params, stream=self.streaming,
+                timeout=timeouts.timeout(timing_key) if timeouts is not None else 30
+            )
+            if response.status_code == 200:
+                if timeouts is not None:
+                    timeouts.observe(timing_key, response.elapsed.total_seconds())
+                # 스트리밍 모드에서는 본문 수신 중 오류도 네트워크 오류로 처리
+                parsed, body = self._read_page(response)
+                if body is not None and parsed[2] is None:
+                    self.archive.put(url.rsplit("/", 1)[-1], params, b"".join(body))
+        except requests.exceptions.RequestException as e:
+            if timeouts is not None and isinstance(e, requests.exceptions.Timeout):
+                timeouts.record_timeout(timing_key)
+            error = e
+        finally:
+            if response is not None:
+                response.close()
+        return Attempt(key, response, parsed, error, self._wire_attempts() - wire_before,
+                       started, time.monotonic())
+
+    def _send_hedged(self, url, params, timing_key, page_no):
+        """
+        hedging 정책이 있으면 응답이 분위수 지연을 넘을 때 같은 요청을 한 번 더 보냄
+
+        먼저 끝난 정상 응답을 쓰고, 늦은 쪽은 백그라운드에서 끝나면
+        호출 수와 줄인 지연만 통계에 반영합니다.
+        """
+        policy = self.hedging
+        delay = policy.delay(timing_key) if policy is not None else None
+        if delay is None:
+            attempt = self._send(url, params, timing_key)
+        else:
+            executor = self._hedge_executor()
+            primary = executor.submit(self._send, url, dict(params), timing_key)
+            done, _ = wait([primary], timeout=delay)
+            if done or not policy.try_hedge():
+                attempt = primary.result()
+            else:
+                attempt = self._race(executor, primary, url, params, timing_key, delay, page_no)
+
+        if policy is not None and attempt.error is None and attempt.response.status_code == 200:
+            policy.observe(timing_key, attempt.finished - attempt.started)
+        return attempt
+
+    def _race(self, executor, primary, url, params, timing_key, delay, page_no):
+        """
+        원 요청과 중복 요청 중 먼저 끝난 정상 응답 반환
+
+        돌려주는 Attempt의 calls는 두 요청의 호출 수 합계입니다 (둘 다 실제로 나간 요청).
+        늦은 쪽이 아직 진행 중이면 1회로 셉니다 (그 뒤 urllib3 재시도는 장부에만 기록됨).
+        """
+        policy = self.hedging
+        hedge_params = dict(params)
+        hedge_key = self.key_pool.acquire()
+        hedge_params["serviceKey"] = hedge_key or params["serviceKey"]
+        log(f"🪝 페이지 {page_no}: {delay:.1f}s 동안 응답 없음 → 중복 요청")
+        hedge = executor.submit(self._send, url, hedge_params, timing_key)
+        if hedge_key is not None:
+            # 중복 요청이 끝나면 (늦게 끝나도) 키 예약 반납
+            hedge.add_done_callback(lambda _: self.key_pool.release(hedge_key))
+
+        pending = {primary, hedge}
+        winner = None
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                attempt = future.result()
+                if attempt.error is None and attempt.response.status_code == 200:
+                    winner = future
+                    break
+        if winner is None:
+            # 둘 다 실패하면 원 요청 결과로 재시도 판단
+            hedge_calls = hedge.result().calls
+            policy.record(False, hedge_calls)
+            failed = primary.result()
+            return failed._replace(calls=failed.calls + hedge_calls)
+
+        result = winner.result()
+        hedge_won = winner is hedge
+
+        def settle(_):
+            # 늦은 쪽이 끝난 시점으로 줄인 지연 계산 (원 요청이 이겼으면 0)
+            hedge_calls = hedge.result().calls
+            saved = primary.result().finished - result.finished if hedge_won else 0.0
+            policy.record(hedge_won, hedge_calls, saved)
+
+        loser = primary if hedge_won else hedge
+        if hedge_won:
+            log(f"🪝 페이지 {page_no}: 중복 요청이 먼저 도착")
+        loser_calls = loser.result().calls if loser.done() else 1
+        loser.add_done_callback(settle)
+        return result._replace(calls=result.calls + loser_calls)
+
+    def _hedge_executor(self):
+        """hedging용 스레드 풀 (최초 사용 시 생성)"""
+        with self._hedge_lock:
+            if self._hedge_pool is None:
+                workers = max(self.max_workers,
+                              self.concurrency.max_limit if self.concurrency else 0)
+                self._hedge_pool = ThreadPoolExecutor(
+                    max_workers=workers * 2 + 2, thread_name_prefix="g2b-hedge"
+                )
+            return self._hedge_pool
+
+    def _read_page(self, response):
+        """
+        응답 본문 파싱 (스트리밍 모드면 청크 단위로 수신과 동시에 파싱)
+
+        Returns:
+            tuple: (parse_page 결과, 보관용 본문 청크 목록 - archive가 없으면 None)
+        """
+        body = [] if self.archive is not None else None
+        try:
+            if self.streaming:
+                chunks = response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE)
+            else:
+                chunks = (response.content,)
+            if body is not None:
+                chunks = _collect_chunks(chunks, body)
+            parsed = parse_page(chunks, self.response_format, self.parser)
+            if body is not None:
+                # 파서가 닫는 태그 뒤를 읽지 않았어도 원본은 끝까지 보관
+                for _ in chunks:
+                    pass
+            return parsed, body
+        finally:
+            response.close()
+
+    def _record_feedback(self, started, failure=None):
+        """동시성 제어기에 요청 결과 전달 (제어기가 없으면 무시)"""
+        if self.concurrency is not None:
+            self.concurrency.record(time.monotonic() - started, failure)
+
+    def _record_health(self, success, reason=None):
+        """서킷 브레이커에 요청 결과 전달 (브레이커가 없으면 무시)"""
+        if self.breaker is not None:
+            self.breaker.record(success, reason)
+
+    @staticmethod
+    def _classify_exception(e):
+        """네트워크 예외를 제어기용 실패 사유로 변환"""
+        if isinstance(e, requests.exceptions.Timeout):
+            return "timeout"
+        if isinstance(e, requests.exceptions.RetryError):
+            # urllib3 Retry가 429/5xx 재시도를 모두 소진한 경우
+            return "429/5xx 재시도 소진"
+        return "네트워크 오류"
 
-        return session
+    @staticmethod
+    def _retried_status(response):
+        """
+        urllib3 Retry가 조용히 재시도한 429/5xx를 혼잡 신호로 반환
+
+        최종 응답은 200이어도 그 전에 과부하 응답을 받았다면 제어기가 알아야 함
+        """
+        retries = getattr(response.raw, "retries", None)
+        for attempt in getattr(retries, "history", None) or ():
+            if attempt.status == 429 or (attempt.status or 0) >= 500:
+                return f"재시도된 HTTP {attempt.status}"
+        return None
 
-    def fetch_data(self, job_type, year, month, retries=5):
+    def fetch_data(self, job_type, year, month, retries=5, max_workers=None):
         """
-        G2B API 호출 및 데이터 수집
-        
+        G2B API 호출 및 데이터 수집 (한 달치를 메모리에 모아 XML 문자열로 반환)
+
+        큰 월은 iter_pages/iter_items로 페이지 단위로 받아 바로 저장하는 편이 낫습니다.
+        실패한 페이지는 self.last_failed_pages에 (구간 시작일시, 페이지 번호)로,
+        구간별 결과는 self.last_window_report에 남습니다.
+
         Args:
             job_type: 업무구분 (물품, 공사, 용역, 외자)
             year: 조회 년도
             month: 조회 월
-            retries: 재시도 횟수
-            
+            retries: 페이지별 재시도 횟수
+            max_workers: 동시 수집 워커 수 (None이면 생성자 설정 사용)
+
         Returns:
             tuple: (xml_content, item_count, api_calls_used)
         """
-        if not self.api_key:
+        summary = FetchSummary()
+        all_items = []
+        for page in self.iter_pages(job_type, year, month, retries, max_workers, summary):
+            all_items.extend(page.items)
+
+        if len(summary.window_report) > 1:
+            all_items = merge_duplicate_items(all_items)
+
+        if all_items:
+            return items_to_xml(all_items), len(all_items), summary.api_calls_used
+        return "", 0, summary.api_calls_used
+
+    def iter_items(self, job_type, year, month, retries=5, max_workers=None, summary=None):
+        """item 레코드를 도착 순서(구간, 페이지 순)대로 하나씩 yield"""
+        for page in self.iter_pages(job_type, year, month, retries, max_workers, summary):
+            yield from page.items
+
+    def iter_pages(self, job_type, year, month, retries=5, max_workers=None, summary=None,
+                   resume=None):
+        """
+        월 단위 수집을 페이지 단위로 yield (한 달치를 메모리에 모으지 않음)
+
+        첫 페이지 응답의 totalCount로 전체 페이지 범위를 계산한 뒤,
+        max_workers > 1이면 워커 수만큼만 앞서 요청하고 페이지 순서대로 내보내므로
+        메모리에는 최대 워커 수만큼의 페이지만 남습니다.
+        일부 페이지가 실패해도 나머지 페이지는 계속 내보내며, 실패한 페이지는
+        summary.failed_pages에 (구간 시작일시, 페이지 번호)로 남습니다.
+
+        totalCount가 split_threshold를 넘거나 첫 페이지 지연이 split_latency를 넘으면
+        월을 절반/주/일 단위로 재귀 분할해서 수집하고, 구간별 결과는
+        summary.window_report에 남습니다. 분할된 구간은 서로 겹치지 않습니다.
+
+        소비자가 중간에 멈추면(break) 남은 요청은 취소되고, 그때까지의 결과가
+        summary에 남습니다.
+
+        resume을 넘기면 이미 저장한 페이지는 호출하지 않습니다. 분할했던 구간은
+        첫 페이지 없이 바로 하위 구간으로, 페이지 1을 저장한 구간은 기록된
+        totalCount로 남은 페이지만 요청합니다.
+
+        Args:
+            summary: 결과를 채울 FetchSummary (없으면 내부에서 생성)
+            resume: MonthCheckpoint.resume_state() 구간별 상태 (없으면 처음부터)
+
+        Yields:
+            PageBatch: (start_date, end_date, page_no, total_count, items)
+        """
+        if not self.key_pool.keys and not self.replay:
             raise ValueError("API_KEY가 설정되지 않았습니다.")
 
+        summary = summary if summary is not None else FetchSummary()
+        # 기존 호출부 호환 (coverage.record_month 등)
+        self.last_failed_pages = summary.failed_pages
+        self.last_window_report = summary.window_report
+
         if job_type not in self.OPERATION_MAP:
             log(f"❌ 잘못된 업무 구분: {job_type}")
-            return "", 0, 0
+            return
 
-        operation = self.OPERATION_MAP[job_type]
-        
         # 월 시작일과 종료일 계산
-        start_date = f"{year}{month:02d}010000"  # YYYYMMDDHHMM
-        last_day = calendar.monthrange(year, month)[1]
-        end_date = f"{year}{month:02d}{last_day}2359"
-        
+        start_date, end_date = month_window(year, month)
+
         log(f"📅 조회 기간: {start_date} ~ {end_date}")
-        
-        # 페이지별 수집
-        all_items = []
-        api_calls_used = 0
-        page_no = 1
-        max_pages = 500  # API 한도 고려
-        
-        while page_no <= max_pages:
-            try:
-                # API 파라미터
-                params = {
-                    "serviceKey": self.api_key,
-                    "numOfRows": 999,     # ← 1000 → 999
-                    "pageNo": page_no,
-                    "inqryDiv": "1",      # ← 1 → "1" (문자열)
-                    "inqryBgnDt": start_date,
-                    "inqryEndDt": end_date
-                }
-                
-                # API 호출
-                url = f"{self.BASE_URL}/{operation}"
-                log(f"📡 API 호출: {operation} (페이지 {page_no})")
-                
-                response = self.session.get(
-                    url, 
-                    params=params,
-                    timeout=30
+
+        yield from self._iter_range(
+            self.OPERATION_MAP[job_type], start_date, end_date, retries, max_workers, summary,
+            resume or {}, INQRY_DIV_REGISTERED
+        )
+
+    def iter_changes(self, job_type, start_date, end_date, inqry_div=INQRY_DIV_CHANGED, retries=5,
+                     max_workers=None, summary=None):
+        """
+        임의 구간(YYYYMMDDHHMM)을 다른 조회구분으로 페이지 단위 yield (변경분 수집용)
+
+        월 단위 수집은 등록일시 기준이라 계약 체결 뒤의 변경/수정 계약을 다시 보지 않습니다.
+        변경일시(또는 다른 조회구분) 기준으로 최근 구간만 조회하면 몇 번의 호출로
+        바뀐 레코드를 받을 수 있습니다. 분할/재시도/동시 수집은 iter_pages와 같습니다.
+
+        Yields:
+            PageBatch: (start_date, end_date, page_no, total_count, items)
+        """
+        if job_type not in self.OPERATION_MAP:
+            log(f"❌ 잘못된 업무 구분: {job_type}")
+            return
+
+        log(f"🔄 변경분 조회: {start_date} ~ {end_date} (조회구분 {inqry_div})")
+
+        yield from self.iter_operation(
+            self.OPERATION_MAP[job_type], start_date, end_date, inqry_div, retries, max_workers,
+            summary
+        )
+
+    def iter_operation(self, operation, start_date, end_date, inqry_div=INQRY_DIV_REGISTERED,
+                       retries=5, max_workers=None, summary=None):
+        """
+        등록된 아무 오퍼레이션이나 구간(YYYYMMDDHHMM) 단위로 페이지 yield
+
+        서비스가 달라도 같은 세션(커넥션 풀), 토큰 버킷, 호출 장부, 스트리밍 파싱,
+        구간 분할을 씁니다. 오퍼레이션은 utils.operations 레지스트리에 있어야 합니다.
+
+        Yields:
+            PageBatch: (start_date, end_date, page_no, total_count, items)
+        """
+        if not self.key_pool.keys and not self.replay:
+            raise ValueError("API_KEY가 설정되지 않았습니다.")
+        get_operation(operation)
+
+        summary = summary if summary is not None else FetchSummary()
+        self.last_failed_pages = summary.failed_pages
+        self.last_window_report = summary.window_report
+
+        yield from self._iter_range(
+            operation, start_date, end_date, retries, max_workers, summary, {}, inqry_div
+        )
+
+    def _iter_range(self, operation, start_date, end_date, retries, max_workers, summary, resume,
+                    inqry_div):
+        """조회 구간 수집 후 summary 마무리 (iter_pages/iter_operation 공용)"""
+        workers = max(1, int(max_workers or self.max_workers))
+        try:
+            yield from self._iter_window(
+                operation, start_date, end_date, retries, workers, summary, resume, inqry_div
+            )
+            summary.completed = True
+        finally:
+            reports = summary.window_report
+            for report in reports:
+                summary.failed_pages.extend(
+                    (report["start"], page_no) for page_no in report["failed_pages"]
                 )
-                
-                api_calls_used += 1
-                
-                # 응답 상태 확인
-                if response.status_code != 200:
-                    log(f"❌ HTTP 오류: {response.status_code}")
-                    break
-                
-                # XML 파싱
-                try:
-                    root = ET.fromstring(response.text)
-                    
-                    # 에러 코드 확인
-                    result_code = root.find('.//resultCode')
-                    if result_code is not None and result_code.text != "00":
-                        result_msg = root.find('.//resultMsg')
-                        error_msg = result_msg.text if result_msg is not None else "Unknown error"
-                        log(f"❌ API 에러: {result_code.text} - {error_msg}")
-                        break
-                    
-                    # 데이터 추출
-                    items = root.findall('.//item')
-                    if not items:
-                        log(f"ℹ️ 페이지 {page_no}: 데이터 없음 (수집 완료)")
-                        break
-                    
-                    all_items.extend(items)
-                    log(f"✅ 페이지 {page_no}: {len(items)}건 수집 (총 {len(all_items)}건)")
-                    
-                    # 다음 페이지
-                    page_no += 1
-                    
-                    # 요청 간격 (API 제한 방지)
-                    time.sleep(0.1)
-                    
-                except ET.ParseError as e:
-                    log(f"❌ XML 파싱 오류: {e}")
-                    break
-                    
-            except requests.exceptions.RequestException as e:
-                log(f"❌ 네트워크 오류: {e}")
-                if retries > 0:
-                    log(f"⏳ {retries}회 재시도 남음...")
-                    time.sleep(2)
-                    retries -= 1
-                    continue
-                else:
-                    break
-        
-        # 결과 XML 생성
-        if all_items:
-            xml_content = ""
-            for item in all_items:
-                xml_content += ET.tostring(item, encoding='unicode') + "\n"
-            
-            log(f"🎯 수집 완료: {len(all_items):,}건 (API 호출: {api_calls_used}회)")
-            return xml_content, len(all_items), api_calls_used
+            if reports:
+                summary.total_count = reports[0]["total_count"]
+            if len(reports) > 1:
+                self._log_window_report(reports)
+            if summary.failed_pages:
+                log(f"⚠️ 실패 페이지: {summary.failed_pages}")
+
+            if summary.item_count:
+                log(f"🎯 수집 완료: {summary.item_count:,}건 (API 호출: {summary.api_calls_used}회)")
+            else:
+                log(f"ℹ️ 수집 결과: 0건 (API 호출: {summary.api_calls_used}회)")
+
+    def _split_reason(self, operation, total_count, latency):
+        """구간을 나눠야 하는 이유 (나눌 필요 없으면 None)"""
+        threshold = self.split_threshold
+        if threshold is None:
+            threshold = self.MAX_PAGES * self.rows_for(operation)
+        if threshold and total_count is not None and total_count > threshold:
+            return f"totalCount {total_count:,} > {threshold:,}"
+        if self.split_latency and latency > self.split_latency:
+            return f"첫 페이지 지연 {latency:.1f}s > {self.split_latency:.1f}s"
+        return None
+
+    @staticmethod
+    def _add_calls(report, summary, calls):
+        report["api_calls_used"] += calls
+        summary.api_calls_used += calls
+
+    def _iter_window(self, operation, start_date, end_date, retries, workers, summary, resume,
+                     inqry_div=INQRY_DIV_REGISTERED):
+        """
+        한 조회 구간을 페이지 단위로 yield (필요하면 하위 구간으로 재귀 분할)
+
+        구간별 결과 dict (start, end, total_count, item_count, pages, api_calls_used,
+        failed_pages, split)를 summary.window_report에 추가합니다.
+        분할된 상위 구간도 첫 페이지 호출 수를 남기기 위해 split=True로 포함됩니다.
+        """
+        report = {
+            "start": start_date,
+            "end": end_date,
+            "total_count": None,
+            "item_count": 0,
+            "pages": 0,
+            "api_calls_used": 0,
+            "failed_pages": [],
+            "split": False
+        }
+        summary.window_report.append(report)
+
+        state = resume.get(window_id(start_date, end_date))
+        if state and state.get("split"):
+            # 이전 실행에서 분할한 구간은 첫 페이지 없이 같은 하위 구간으로
+            report["total_count"] = state.get("total_count")
+            report["split"] = True
+            for sub_start, sub_end in split_window(start_date, end_date):
+                yield from self._iter_window(
+                    operation, sub_start, sub_end, retries, workers, summary, resume, inqry_div
+                )
+            return
+
+        done = committed_pages(state)
+        if state and (1 in done or state.get("total_count") == 0):
+            total_count = state.get("total_count")
+            report["total_count"] = total_count
+            if total_count == 0:
+                return
+            log(f"⏩ {describe_window(start_date, end_date)}: 체크포인트에서 재개 ({len(done)}페이지 저장됨)")
+            yield from self._iter_rest(
+                operation, start_date, end_date, total_count, done, retries, workers, report, summary,
+                inqry_div
+            )
+            return
+
+        # 첫 페이지로 전체 건수 확인
+        started = time.monotonic()
+        items, total_count, api_calls_used, error = self._fetch_page(
+            operation, 1, start_date, end_date, retries, inqry_div=inqry_div
+        )
+        latency = time.monotonic() - started
+        report["total_count"] = total_count
+        self._add_calls(report, summary, api_calls_used)
+
+        if error:
+            report["failed_pages"].append(1)
+            return
+
+        reason = self._split_reason(operation, total_count, latency) if items else None
+        subwindows = split_window(start_date, end_date) if reason else []
+        if subwindows:
+            log(f"✂️ {describe_window(start_date, end_date)} 분할 ({reason}) → {len(subwindows)}개 구간")
+            report["split"] = True
+            for sub_start, sub_end in subwindows:
+                yield from self._iter_window(
+                    operation, sub_start, sub_end, retries, workers, summary, resume, inqry_div
+                )
+            return
+        if reason:
+            log(f"⚠️ {describe_window(start_date, end_date)}: 하루 단위라 더 나눌 수 없음 ({reason})")
+
+        if not items:
+            log("ℹ️ 페이지 1: 데이터 없음 (수집 완료)")
+            return
+
+        log(f"✅ 페이지 1: {len(items)}건 수집 (전체 {total_count if total_count is not None else '?'}건)")
+        yield self._emit(report, summary, 1, items)
+
+        yield from self._iter_rest(
+            operation, start_date, end_date, total_count, {1}, retries, workers, report, summary,
+            inqry_div
+        )
+
+    def _iter_rest(self, operation, start_date, end_date, total_count, done, retries, workers,
+                   report, summary, inqry_div=INQRY_DIV_REGISTERED):
+        """페이지 1 이후 아직 저장하지 않은 페이지를 yield"""
+        if total_count is None:
+            # totalCount가 없으면 기존처럼 빈 페이지가 나올 때까지 순차 수집
+            pages = self._iter_pages_sequentially(
+                operation, range(max(done) + 1, self.MAX_PAGES + 1), start_date, end_date,
+                retries, report, summary, inqry_div
+            )
         else:
-            log(f"ℹ️ 수집 결과: 0건 (API 호출: {api_calls_used}회)")
-            return "", 0, api_calls_used
+            total_pages = min(math.ceil(total_count / self.rows_for(operation)), self.MAX_PAGES)
+            page_numbers = [page_no for page_no in range(2, total_pages + 1) if page_no not in done]
+            if not page_numbers:
+                return
+            log(f"📑 전체 {total_count:,}건 → {total_pages}페이지 (남은 {len(page_numbers)}페이지, 워커 {workers}개)")
+            if workers > 1:
+                pages = self._iter_pages_concurrently(
+                    operation, page_numbers, start_date, end_date,
+                    retries, workers, report, summary, inqry_div
+                )
+            else:
+                pages = self._iter_pages_sequentially(
+                    operation, page_numbers, start_date, end_date, retries, report, summary,
+                    inqry_div
+                )
+
+        for page_no, items in pages:
+            batch = self._emit(report, summary, page_no, items)
+            log(f"✅ 페이지 {page_no}: {len(items)}건 수집 (총 {report['item_count']}건)")
+            yield batch
+
+    @staticmethod
+    def _emit(report, summary, page_no, items):
+        """페이지 결과를 집계하고 PageBatch로 포장"""
+        report["item_count"] += len(items)
+        report["pages"] += 1
+        summary.item_count += len(items)
+        summary.pages += 1
+        return PageBatch(report["start"], report["end"], page_no, report["total_count"], items)
+
+    @staticmethod
+    def _log_window_report(reports):
+        """구간별 수집 건수 요약 로그"""
+        for report in reports:
+            if report["split"]:
+                continue
+            log(
+                f"   └─ {describe_window(report['start'], report['end'])}: "
+                f"{report['item_count']:,}건 / 전체 {report['total_count'] or 0:,}건 "
+                f"({report['pages']}페이지, API {report['api_calls_used']}회)"
+            )
+
+    def _iter_pages_sequentially(self, operation, page_numbers, start_date, end_date,
+                                 retries, report, summary, inqry_div=INQRY_DIV_REGISTERED):
+        """페이지를 하나씩 수집해 (page_no, items) yield (실패 또는 빈 페이지에서 중단)"""
+        for page_no in page_numbers:
+            items, _, calls, error = self._fetch_page(
+                operation, page_no, start_date, end_date, retries, inqry_div=inqry_div
+            )
+            self._add_calls(report, summary, calls)
+
+            if error:
+                report["failed_pages"].append(page_no)
+                break
+            if not items:
+                log(f"ℹ️ 페이지 {page_no}: 데이터 없음 (수집 완료)")
+                break
+
+            yield page_no, items
+
+    def _iter_pages_concurrently(self, operation, page_numbers, start_date, end_date,
+                                 retries, workers, report, summary, inqry_div=INQRY_DIV_REGISTERED):
+        """
+        페이지를 워커 수만큼 앞서 요청하고 페이지 순서대로 (page_no, items) yield
+
+        앞서 받은 페이지는 최대 워커 수만큼만 보관합니다.
+        실패한 페이지는 report["failed_pages"]에 기록하고 나머지는 계속 내보냅니다.
+        """
+        fetch = self._fetch_page
+        if self.concurrency is not None:
+            # 제어기 상한만큼 스레드를 두고 실제 동시 요청은 제어기 한도로 제한
+            workers = self.concurrency.max_limit
+            fetch = self._fetch_page_controlled
+
+        remaining = iter(page_numbers)
+        pending = deque()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            def submit_next():
+                page_no = next(remaining, None)
+                if page_no is not None:
+                    pending.append((page_no, executor.submit(
+                        fetch, operation, page_no, start_date, end_date, retries,
+                        inqry_div=inqry_div
+                    )))
+
+            for _ in range(workers):
+                submit_next()
+
+            try:
+                while pending:
+                    page_no, future = pending.popleft()
+                    try:
+                        items, _, calls, error = future.result()
+                    except Exception as e:
+                        # 호출 여부를 알 수 없는 예외 - 실패로만 기록
+                        log(f"❌ 페이지 {page_no} 처리 오류: {e}")
+                        report["failed_pages"].append(page_no)
+                        submit_next()
+                        continue
+
+                    self._add_calls(report, summary, calls)
+                    submit_next()
+                    if error:
+                        report["failed_pages"].append(page_no)
+                        continue
+                    yield page_no, items
+            finally:
+                # 소비자가 중간에 멈추면 대기 중인 요청은 취소, 이미 나간 요청은 호출 수만 집계
+                for page_no, future in pending:
+                    if future.cancel():
+                        continue
+                    try:
+                        self._add_calls(report, summary, future.result()[2])
+                    except Exception:
+                        pass
+
+    def _fetch_page_controlled(self, operation, page_no, start_date, end_date, retries=5,
+                               inqry_div=INQRY_DIV_REGISTERED):
+        """동시성 제어기 슬롯을 확보한 뒤 페이지 호출"""
+        with self.concurrency.slot():
+            return self._fetch_page(operation, page_no, start_date, end_date, retries,
+                                    inqry_div=inqry_div)
+
+    def fetch_detail(self, operation, key_params, inqry_div=None, retries=3):
+        """
+        키 하나(예: 통합계약번호)로 조회하는 상세 레코드 수집 (여러 페이지면 모두)
+
+        조회 기간 대신 key_params로 조회하는 상세 오퍼레이션용입니다.
+        세션, 토큰 버킷, 호출 장부, 서비스키 풀, 서킷 브레이커는 목록 수집과 같은 것을 씁니다.
+
+        Args:
+            key_params: 조회 키 파라미터 (예: {"untyCntrctNo": "R25TE0123456"})
+            inqry_div: 조회구분 (키 조회용 값, 없으면 보내지 않음)
+
+        Returns:
+            tuple: (items, api_calls_used, error)
+        """
+        spec = get_operation(operation)
+        items = []
+        api_calls_used = 0
+        rows = self.rows_for(operation)
+        page_no = 1
+        while True:
+            params = {"numOfRows": rows, "pageNo": page_no, **key_params}
+            if spec.inqry_div_param and inqry_div is not None:
+                params[spec.inqry_div_param] = inqry_div
+            if self.concurrency is not None:
+                with self.concurrency.slot():
+                    page_items, total_count, calls, error = self._request(spec, params, page_no, retries)
+            else:
+                page_items, total_count, calls, error = self._request(spec, params, page_no, retries)
+            api_calls_used += calls
+            if error is not None:
+                return items, api_calls_used, error
+            items.extend(page_items)
+            if not page_items or not total_count or page_no * rows >= total_count:
+                return items, api_calls_used, None
+            page_no += 1
+
+    def probe(self, job_type, year, month, retries=2):
+        """
+        numOfRows=1 호출로 해당 월의 totalCount만 확인 (수집 계획용)
+
+        Returns:
+            tuple: (total_count, api_calls_used, error)
+        """
+        if job_type not in self.OPERATION_MAP:
+            return None, 0, f"잘못된 업무 구분: {job_type}"
+
+        start_date, end_date = month_window(year, month)
+        _, total_count, api_calls_used, error = self._fetch_page(
+            self.OPERATION_MAP[job_type], 1, start_date, end_date, retries, num_of_rows=1
+        )
+        if error is None and total_count is None:
+            error = "totalCount 없음"
+        return total_count, api_calls_used, error
+
+    def measure_page(self, operation, num_of_rows, start_date, end_date, retries=0):
+        """
+        페이지 크기 측정용 1페이지 호출 (PageSizeTuner.sweep에서 사용)
+
+        Returns:
+            tuple: (items, total_count, api_calls_used, error, 걸린 시간(초), 수신 바이트)
+        """
+        bytes_before = self._wire_bytes()
+        started = time.monotonic()
+        items, total_count, calls, error = self._fetch_page(
+            operation, 1, start_date, end_date, retries, num_of_rows=num_of_rows
+        )
+        return (items, total_count, calls, error, time.monotonic() - started,
+                self._wire_bytes() - bytes_before)
 
     def test_connection(self):
         """API 연결 테스트"""
         try:
-            # 간단한 테스트 호출
+            # 간단한 테스트 호출 (이 클라이언트 서비스의 첫 업무 오퍼레이션)
+            spec = get_operation(next(iter(self.OPERATION_MAP.values())))
             params = {
                 "serviceKey": self.api_key,
                 "numOfRows": 1,
                 "pageNo": 1,
-                "inqryDiv": 1,
-                "inqryBgnDt": "202401010000",
-                "inqryEndDt": "202401012359"
+                **build_params(spec, "202401010000", "202401012359", 1)
             }
             
-            url = f"{self.BASE_URL}/getCntrctInfoListThng"
-            response = self.session.get(url, params=params, timeout=10)
+            url = self._operation_url(spec)
+            self._wire.key = self.api_key
+            self.rate_limiter.acquire()
+            timeout = self.timeouts.timeout(latency_key(spec.operation, 1)) if self.timeouts else 10
+            response = self.session.get(url, params=params, timeout=timeout)
             
             if response.status_code == 200:
                 log("✅ G2B API 연결 테스트 성공")
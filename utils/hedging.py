@@ -0,0 +1,117 @@
+import math
+import threading
+from collections import defaultdict, deque
+
+try:
+    from .logger import log
+except ImportError:
+    from utils.logger import log
+
+
+def percentile(values, q):
+    """값 목록의 q 분위수 (0~1, 최근접 순위 방식)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+    return ordered[index]
+
+
+class HedgePolicy:
+    """
+    지연된 페이지 요청의 중복 요청(hedging) 정책
+
+    오퍼레이션별 최근 응답 지연의 분위수(기본 p95)를 넘도록 응답이 없으면
+    같은 요청을 한 번 더 보내고 먼저 끝난 응답을 씁니다.
+    중복 요청은 실행당 max_hedges회까지만 보내므로 일일 한도 소모에 상한이 있습니다.
+    여러 클라이언트(병렬 모드 워커)가 하나의 정책과 통계를 공유할 수 있습니다.
+
+    사용 예:
+        policy = HedgePolicy(percentile=0.95, max_hedges=20)
+        client = G2BClient(api_key, hedging=policy)
+        ...
+        policy.log_stats()
+    """
+
+    def __init__(self, percentile=0.95, max_hedges=20, min_samples=20, min_delay=1.0,
+                 window=200):
+        """
+        Args:
+            percentile: 중복 요청 기준 지연 분위수 (0~1)
+            max_hedges: 실행당 중복 요청 상한 (일일 한도에서 hedging이 쓸 수 있는 양)
+            min_samples: 분위수를 믿을 수 있는 최소 표본 수 (그 전에는 hedging 안 함)
+            min_delay: 중복 요청 전 최소 대기(초)
+            window: 오퍼레이션별로 보관할 최근 지연 표본 수
+        """
+        self.percentile = percentile
+        self.max_hedges = max_hedges
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._latencies = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+        # 통계
+        self.hedges = 0         # 보낸 중복 요청 수
+        self.wins = 0           # 중복 요청이 먼저 끝난 횟수
+        self.hedge_calls = 0    # 중복 요청이 실제로 쓴 호출 수 (urllib3 재시도 포함)
+        self.saved = 0.0        # 중복 요청으로 줄인 지연 합계(초)
+        self.skipped = 0        # 상한 때문에 보내지 못한 횟수
+
+    def observe(self, operation, latency):
+        """정상 응답 지연 표본 추가"""
+        with self._lock:
+            self._latencies[operation].append(latency)
+
+    def delay(self, operation):
+        """중복 요청까지 기다릴 시간(초) - 표본이 부족하면 None"""
+        with self._lock:
+            samples = list(self._latencies[operation])
+        if len(samples) < self.min_samples:
+            return None
+        return max(self.min_delay, percentile(samples, self.percentile))
+
+    def try_hedge(self):
+        """실행당 상한 안이면 중복 요청 1회 예약"""
+        with self._lock:
+            if self.hedges >= self.max_hedges:
+                self.skipped += 1
+                return False
+            self.hedges += 1
+            return True
+
+    def record(self, hedge_won, calls=0, saved=0.0):
+        """중복 요청 결과 반영 (calls는 중복 요청 쪽 실제 호출 수)"""
+        with self._lock:
+            if hedge_won:
+                self.wins += 1
+            self.hedge_calls += calls
+            self.saved += max(0.0, saved)
+
+    def metrics(self):
+        with self._lock:
+            thresholds = {
+                operation: percentile(list(samples), self.percentile)
+                for operation, samples in self._latencies.items()
+            }
+            return {
+                "hedges": self.hedges,
+                "wins": self.wins,
+                "hedge_calls": self.hedge_calls,
+                "saved": self.saved,
+                "skipped": self.skipped,
+                "max_hedges": self.max_hedges,
+                "thresholds": thresholds
+            }
+
+    def log_stats(self):
+        """실행 결과 요약 로그"""
+        metrics = self.metrics()
+        thresholds = ", ".join(
+            f"{operation} p{self.percentile * 100:g} {value:.2f}s"
+            for operation, value in sorted(metrics["thresholds"].items()) if value is not None
+        ) or "표본 없음"
+        log(
+            f"🪝 중복 요청: {metrics['hedges']}/{metrics['max_hedges']}회 "
+            f"(먼저 도착 {metrics['wins']}회, 호출 {metrics['hedge_calls']}회, "
+            f"줄인 지연 {metrics['saved']:.1f}s, 상한으로 생략 {metrics['skipped']}회) - {thresholds}"
+        )
@@ -0,0 +1,432 @@
+"""
+입찰공고 → 낙찰 → 계약 연결 테이블 (디스크 해시 인덱스 기반 증분 조인)
+
+서비스별 데이터를 전부 메모리에 올려 조인하지 않고, 들어오는 레코드를
+공고번호(조인 키) 기준 디스크 해시 인덱스에 쌓은 뒤 이번에 새로 들어오거나
+바뀐 레코드가 걸린 공고번호만 다시 조인해 연결 테이블에 추가합니다.
+
+디렉토리 구성 (root 아래):
+    index/{bid,award,contract}/  공고번호 → 레코드 요약
+    index/records/               레코드 ID → 내용 해시 (같은 레코드를 다시 받으면 건너뜀)
+    index/edges/                 이미 기록한 연결 ID
+    links/bid_award.jsonl        입찰공고 → 낙찰
+    links/award_contract.jsonl   낙찰 → 계약 (낙찰업체 사업자번호가 계약업체에 있을 때)
+    links/bid_contract.jsonl     입찰공고 → 계약
+    state.json                   파일별 읽은 위치, 아직 조인하지 않은 공고번호
+
+사용 예:
+    pipeline = JoinPipeline("data/join")
+    pipeline.ingest_file(CONTRACT, "data/물품_2024.xml")   # 지난번 읽은 위치 뒤의 레코드만
+    pipeline.ingest(AWARD, page.items)                      # 수집한 페이지를 바로 넣어도 됨
+    pipeline.materialize()                                  # 바뀐 공고번호만 조인
+    pipeline.save()
+"""
+import os
+import re
+import json
+import hashlib
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+
+try:
+    from .logger import log
+    from .change_feed import record_fields
+except ImportError:
+    from utils.logger import log
+    from utils.change_feed import record_fields
+
+BID = "bid"
+AWARD = "award"
+CONTRACT = "contract"
+SOURCES = (BID, AWARD, CONTRACT)
+
+# 서비스 → 조인 소스 (utils.operations 서비스 이름)
+SERVICE_SOURCES = {
+    "BidPublicInfoService": BID,
+    "ScsbidInfoService": AWARD,
+    "CntrctInfoService": CONTRACT
+}
+
+# 소스별 조인 키(공고번호) 필드와 연결 테이블에 남길 요약 필드
+NOTICE_FIELDS = {BID: "bidNtceNo", AWARD: "bidNtceNo", CONTRACT: "ntceNo"}
+SUMMARY_FIELDS = {
+    BID: ("bidNtceNo", "bidNtceOrd", "bidNtceNm", "ntceInsttNm", "dminsttNm", "presmptPrce", "bidNtceDt"),
+    AWARD: ("bidNtceNo", "bidNtceOrd", "bidClsfcNo", "rbidNo", "bidwinnrNm", "bidwinnrBizno",
+            "sucsfbidAmt", "sucsfbidRate", "fnlSucsfDate"),
+    CONTRACT: ("untyCntrctNo", "ntceNo", "cntrctNm", "cntrctInsttNm", "totCntrctAmt", "cntrctCnclsDate")
+}
+
+# 연결 테이블: (이름, 왼쪽 소스, 오른쪽 소스)
+LINK_TABLES = (
+    ("bid_award", BID, AWARD),
+    ("award_contract", AWARD, CONTRACT),
+    ("bid_contract", BID, CONTRACT)
+)
+
+# 계약업체 목록(corpList)에서 사업자번호를 뽑는 패턴
+BIZNO_PATTERN = re.compile(r"\d{3}-?\d{2}-?\d{5}")
+
+
+def notice_key(value):
+    """공고번호 정규화 (예: "R25BK00123456-000" → "R25BK00123456") - 없으면 None"""
+    value = (value or "").strip().upper()
+    if not value:
+        return None
+    return value.split("-", 1)[0] or None
+
+
+def record_id(source, fields):
+    """소스 안에서 레코드를 구별하는 ID (같은 ID가 다시 오면 요약을 교체)"""
+    if source == BID:
+        return f"{fields.get('bidNtceNo', '')}-{fields.get('bidNtceOrd', '')}"
+    if source == AWARD:
+        return "-".join(fields.get(name, "") for name in ("bidNtceNo", "bidNtceOrd", "bidClsfcNo", "rbidNo"))
+    return fields.get("untyCntrctNo", "")
+
+
+def summarize(source, fields):
+    """연결 테이블에 남길 레코드 요약 (계약은 계약업체 사업자번호 목록 포함)"""
+    summary = {name: fields.get(name, "") for name in SUMMARY_FIELDS[source]}
+    if source == CONTRACT:
+        summary["biznos"] = sorted({
+            bizno.replace("-", "") for bizno in BIZNO_PATTERN.findall(fields.get("corpList", ""))
+        })
+    return summary
+
+
+def _digest(value):
+    payload = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class HashIndex:
+    """
+    키 → {값 ID: 값} 디스크 해시 인덱스
+
+    키의 해시로 나눈 버킷 파일(jsonl)에 [키, 값 ID, 값]을 한 줄씩 추가하고,
+    같은 (키, 값 ID)는 나중 줄이 앞 줄을 덮어씁니다. 조회할 때는 필요한 버킷만
+    읽어 최근 max_cached개를 메모리에 유지하므로 전체 데이터가 메모리보다 커도 됩니다.
+    """
+
+    def __init__(self, root, buckets=256, max_cached=64):
+        self.root = root
+        self.buckets = buckets
+        self.max_cached = max_cached
+        self._cache = OrderedDict()     # 버킷 → {키: {값 ID: 값}}
+        self._pending = {}              # 버킷 → 아직 파일에 쓰지 않은 [키, 값 ID, 값] (flush에서 추가)
+        os.makedirs(root, exist_ok=True)
+
+    def bucket(self, key):
+        return int(hashlib.sha1(key.encode("utf-8")).hexdigest()[:8], 16) % self.buckets
+
+    def _path(self, bucket):
+        return os.path.join(self.root, f"{bucket:02x}.jsonl")
+
+    def _load(self, bucket):
+        entries = self._cache.get(bucket)
+        if entries is not None:
+            self._cache.move_to_end(bucket)
+            return entries
+        entries = {}
+        try:
+            with open(self._path(bucket), encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        key, value_id, value = json.loads(line)
+                    except ValueError:
+                        # 중간에 끊긴 마지막 줄
+                        continue
+                    entries.setdefault(key, {})[value_id] = value
+        except FileNotFoundError:
+            pass
+        self._cache[bucket] = entries
+        self._evict()
+        return entries
+
+    def _evict(self):
+        """오래 안 쓴 버킷부터 캐시에서 뺌 (아직 쓰지 않은 줄이 있는 버킷은 flush까지 유지)"""
+        clean = [bucket for bucket in self._cache if bucket not in self._pending]
+        for bucket in clean[:max(0, len(self._cache) - self.max_cached)]:
+            del self._cache[bucket]
+
+    def get(self, key):
+        return dict(self._load(self.bucket(key)).get(key, {}))
+
+    def get_many(self, keys):
+        """여러 키 조회 (버킷별로 묶어 버킷 파일을 한 번씩만 읽음)"""
+        by_bucket = {}
+        for key in set(keys):
+            by_bucket.setdefault(self.bucket(key), []).append(key)
+        result = {}
+        for bucket, bucket_keys in sorted(by_bucket.items()):
+            entries = self._load(bucket)
+            for key in bucket_keys:
+                result[key] = dict(entries.get(key, {}))
+        return result
+
+    def add(self, key, value_id, value):
+        bucket = self.bucket(key)
+        # 먼저 _pending에 넣어 두어야 이 버킷이 flush 전에 캐시에서 빠지지 않음
+        self._pending.setdefault(bucket, []).append((key, value_id, value))
+        self._load(bucket).setdefault(key, {})[value_id] = value
+
+    def _flush_bucket(self, bucket):
+        entries = self._pending.pop(bucket, None)
+        if entries:
+            with open(self._path(bucket), "a", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def flush(self):
+        for bucket in list(self._pending):
+            self._flush_bucket(bucket)
+        self._evict()
+
+
+class JoinPipeline:
+    """
+    입찰공고/낙찰/계약 레코드를 공고번호 인덱스에 쌓고 연결 테이블을 증분으로 만드는 단계
+
+    ingest/ingest_file은 인덱스만 갱신하고 바뀐 공고번호를 기록하며,
+    materialize가 그 공고번호만 다시 조인해 아직 기록하지 않은 연결을 테이블 끝에 추가합니다.
+    연결은 테이블에 먼저 쓰고 나서 기록하므로 중간에 죽으면 같은 연결이 한 번 더
+    쓰일 수는 있어도 빠지지는 않습니다.
+    """
+
+    STATE_FILE = "state.json"
+    BATCH_SIZE = 5000
+
+    def __init__(self, root, buckets=256):
+        self.root = root
+        index_root = os.path.join(root, "index")
+        self.indexes = {
+            name: HashIndex(os.path.join(index_root, name), buckets)
+            for name in SOURCES + ("records", "edges")
+        }
+        self.links_dir = os.path.join(root, "links")
+        os.makedirs(self.links_dir, exist_ok=True)
+
+        state = self._load_state()
+        self.files = state.get("files", {})
+        self._saved_files = dict(self.files)
+        self.dirty = set(state.get("dirty", []))
+
+        # 통계 (이번 실행)
+        self.ingested = {source: 0 for source in SOURCES}
+        self.unchanged = 0
+        self.unjoinable = 0
+        self.linked = {name: 0 for name, _, _ in LINK_TABLES}
+
+    # ------------------------------------------------------------------
+    # 상태
+    # ------------------------------------------------------------------
+    def _load_state(self):
+        try:
+            with open(os.path.join(self.root, self.STATE_FILE), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def save(self):
+        """
+        인덱스를 파일에 쓰고 상태 저장
+
+        바뀐 공고번호를 먼저 저장한 뒤 인덱스를 쓰고, 마지막에 파일별 읽은 위치를 옮깁니다.
+        중간에 죽으면 다음 실행에서 같은 구간을 다시 읽지만 (내용 해시로 건너뜀)
+        조인해야 할 공고번호는 남아 있습니다.
+        """
+        self._write_state(self._saved_files)
+        for index in self.indexes.values():
+            index.flush()
+        self._write_state(self.files)
+        self._saved_files = dict(self.files)
+
+    def _write_state(self, files):
+        path = os.path.join(self.root, self.STATE_FILE)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump({"files": files, "dirty": sorted(self.dirty)}, f, ensure_ascii=False, indent=2)
+        os.replace(f"{path}.tmp", path)
+
+    # ------------------------------------------------------------------
+    # 인덱싱
+    # ------------------------------------------------------------------
+    def ingest(self, source, items):
+        """item 레코드(<item>...</item>) 목록을 인덱스에 추가"""
+        self._ingest_records(source, (record_fields(item) for item in items))
+
+    def ingest_file(self, source, path):
+        """
+        연도별 데이터 파일(<root> 아래 <item> 나열)에서 지난번 읽은 위치 뒤의 레코드만 인덱스에 추가
+
+        읽은 위치 바로 앞 64바이트의 해시를 같이 남겨 두고, 파일이 다시 만들어져
+        내용이 달라졌으면 처음부터 다시 읽습니다 (이미 본 레코드는 내용 해시로 건너뜀).
+
+        Returns:
+            int: 읽은 레코드 수
+        """
+        if not os.path.exists(path):
+            return 0
+        key = os.path.abspath(path)
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - 64))
+            tail = f.read()
+            closing = tail.rfind(b"</root>")
+            end = size - len(tail) + closing if closing >= 0 else size
+
+            start = self._resume_offset(f, self.files.get(key), end)
+            if start >= end:
+                return 0
+            if start == 0:
+                f.seek(0)
+                head = f.read(256)
+                opening = head.find(b"<root>")
+                start = opening + len(b"<root>") if opening >= 0 else 0
+
+            count = self._ingest_records(source, self._scan(f, start, end))
+            f.seek(max(0, end - 64))
+            self.files[key] = {"offset": end, "tail": hashlib.sha256(f.read(end - f.tell())).hexdigest()}
+        log(f"🔗 [{source}] {os.path.basename(path)}: 레코드 {count:,}건 읽음")
+        return count
+
+    @staticmethod
+    def _resume_offset(f, saved, end):
+        if not saved or saved["offset"] > end:
+            return 0
+        offset = saved["offset"]
+        f.seek(max(0, offset - 64))
+        if hashlib.sha256(f.read(offset - f.tell())).hexdigest() != saved["tail"]:
+            return 0
+        return offset
+
+    @staticmethod
+    def _scan(f, start, end, chunk_size=1 << 20):
+        """[start, end) 구간의 <item>을 하나씩 필드 dict로 (구간 전체를 메모리에 올리지 않음)"""
+        parser = ET.XMLPullParser(events=("start", "end"))
+        parser.feed(b"<root>")
+        f.seek(start)
+        remaining = end - start
+        root = None
+        while True:
+            chunk = f.read(min(chunk_size, remaining)) if remaining > 0 else b""
+            remaining -= len(chunk)
+            parser.feed(chunk or b"</root>")
+            for event, element in parser.read_events():
+                if root is None:
+                    root = element
+                elif event == "end" and element.tag == "item":
+                    yield {child.tag: (child.text or "") for child in element}
+                    # 읽은 item은 트리에서 떼어 메모리를 돌려줌
+                    root.clear()
+            if not chunk:
+                break
+
+    def _ingest_records(self, source, records):
+        if source not in SOURCES:
+            raise ValueError(f"알 수 없는 조인 소스: {source} (가능: {', '.join(SOURCES)})")
+        count = 0
+        batch = []
+        for fields in records:
+            count += 1
+            batch.append(fields)
+            if len(batch) >= self.BATCH_SIZE:
+                self._ingest_batch(source, batch)
+                batch = []
+        if batch:
+            self._ingest_batch(source, batch)
+        return count
+
+    def _ingest_batch(self, source, batch):
+        latest = {}
+        for fields in batch:
+            notice = notice_key(fields.get(NOTICE_FIELDS[source]))
+            rid = record_id(source, fields)
+            if notice is None or not rid.strip("-"):
+                self.unjoinable += 1
+                continue
+            summary = summarize(source, fields)
+            latest[f"{source}:{rid}"] = (notice, rid, summary)
+
+        known = self.indexes["records"].get_many(latest)
+        index = self.indexes[source]
+        for record_key, (notice, rid, summary) in latest.items():
+            digest = _digest([notice, summary])
+            if known[record_key].get("") == digest:
+                self.unchanged += 1
+                continue
+            index.add(notice, rid, summary)
+            self.indexes["records"].add(record_key, "", digest)
+            self.dirty.add(notice)
+            self.ingested[source] += 1
+
+    # ------------------------------------------------------------------
+    # 연결 테이블
+    # ------------------------------------------------------------------
+    def materialize(self):
+        """
+        바뀐 공고번호만 다시 조인해 새 연결을 테이블에 추가
+
+        Returns:
+            int: 이번에 추가한 연결 수
+        """
+        pending = sorted(self.dirty)
+        total = 0
+        for i in range(0, len(pending), self.BATCH_SIZE):
+            notices = pending[i:i + self.BATCH_SIZE]
+            total += self._materialize_batch(notices)
+            self.dirty.difference_update(notices)
+        return total
+
+    def _materialize_batch(self, notices):
+        records = {source: self.indexes[source].get_many(notices) for source in SOURCES}
+        candidates = {}
+        for notice in notices:
+            for table, left, right in LINK_TABLES:
+                for left_id, left_record in records[left][notice].items():
+                    for right_id, right_record in records[right][notice].items():
+                        if not self._matches(left, left_record, right, right_record):
+                            continue
+                        edge = f"{table}:{left_id}>{right_id}"
+                        candidates[edge] = (table, {
+                            "notice": notice,
+                            left: dict(left_record, id=left_id),
+                            right: dict(right_record, id=right_id)
+                        })
+
+        known = self.indexes["edges"].get_many(candidates)
+        rows = {}
+        for edge, (table, row) in candidates.items():
+            if not known[edge]:
+                rows.setdefault(table, []).append((edge, row))
+
+        added = 0
+        for table, table_rows in rows.items():
+            with open(os.path.join(self.links_dir, f"{table}.jsonl"), "a", encoding="utf-8") as f:
+                for _, row in table_rows:
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            for edge, _ in table_rows:
+                self.indexes["edges"].add(edge, "", 1)
+            self.linked[table] += len(table_rows)
+            added += len(table_rows)
+        return added
+
+    @staticmethod
+    def _matches(left, left_record, right, right_record):
+        """같은 공고번호 안에서 낙찰 → 계약은 낙찰업체가 계약업체에 있을 때만 연결"""
+        if left == AWARD and right == CONTRACT:
+            bizno = left_record.get("bidwinnrBizno", "").replace("-", "")
+            biznos = right_record.get("biznos") or []
+            return not bizno or not biznos or bizno in biznos
+        return True
+
+    def log_stats(self):
+        """실행 결과 요약 로그"""
+        ingested = ", ".join(f"{source} {count:,}" for source, count in self.ingested.items())
+        linked = ", ".join(f"{table} +{count:,}" for table, count in self.linked.items())
+        log(f"🔗 조인 인덱스: 새/바뀐 레코드 {ingested} (변경 없음 {self.unchanged:,}, "
+            f"공고번호 없음 {self.unjoinable:,})")
+        log(f"🔗 연결 테이블: {linked}" + (f" (미처리 공고 {len(self.dirty):,}건)" if self.dirty else "")
+            + f" - {self.links_dir}")
@@ -0,0 +1,187 @@
+import hashlib
+import threading
+
+try:
+    from .logger import log
+    from .quota import QuotaLedger, today_kst
+except ImportError:
+    from utils.logger import log
+    from utils.quota import QuotaLedger, today_kst
+
+# 키를 바꿔야 하는 공공데이터포털 resultCode / returnReasonCode
+QUOTA_CODES = {"22"}                    # LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR
+AUTH_CODES = {"20", "30", "31", "32"}   # 접근 거부, 미등록 키, 활용기간 만료, 미등록 IP
+AUTH_STATUSES = {401, 403}
+
+STRATEGIES = ("round_robin", "least_used")
+
+
+def key_id(key):
+    """progress.json/로그에 남길 서비스키 지문 (키 자체는 저장하지 않음)"""
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:10]
+
+
+def parse_keys(*values):
+    """쉼표/줄바꿈으로 구분된 서비스키 목록 (순서 유지, 중복 제거)"""
+    keys = []
+    for value in values:
+        for key in (value or "").replace("\n", ",").split(","):
+            key = key.strip()
+            if key and key not in keys:
+                keys.append(key)
+    return keys
+
+
+def eviction_reason(error):
+    """
+    페이지 오류가 키 문제인지 판별
+
+    Returns:
+        str: "quota" (오늘 한도 소진), "auth" (인증 실패), 키 문제가 아니면 None
+    """
+    if not error:
+        return None
+    if error.startswith("API 에러 "):
+        code = error.rsplit(" ", 1)[-1]
+        if code in QUOTA_CODES:
+            return "quota"
+        if code in AUTH_CODES:
+            return "auth"
+    elif error.startswith("HTTP ") and error[5:].isdigit() and int(error[5:]) in AUTH_STATUSES:
+        return "auth"
+    return None
+
+
+class KeyPool:
+    """
+    여러 서비스키의 요청 분배와 키별 일일 사용량 (KST 기준)
+
+    키마다 QuotaLedger를 따로 두고, 한도(daily_limit)에 닿았거나 퇴출된 키는
+    건너뜁니다. acquire()는 키를 고르면서 같은 잠금 안에서 1회를 예약하므로
+    여러 스레드/태스크가 마지막 남은 1회를 동시에 가져갈 수 없고, 예약은 요청이
+    끝나거나 보내지 않게 되면 release()로 반납합니다. 퇴출은 한국시간 날짜 단위라 다음 날 자동으로 풀립니다.
+    progress.json에 저장할 수 있도록 키 지문 기준 dict로 직렬화됩니다.
+        {"ledgers": {"3f2a...": {"2025-12-15": {...}}},
+         "evicted": {"3f2a...": {"date": "2025-12-15", "reason": "quota"}}}
+    """
+
+    def __init__(self, keys, daily_limit=None, data=None, strategy="round_robin"):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"지원하지 않는 키 분배 방식: {strategy} (가능: {', '.join(STRATEGIES)})")
+        data = data or {}
+        self.keys = list(keys)
+        self.daily_limit = daily_limit
+        self.strategy = strategy
+        self._lock = threading.Lock()
+        self._next = 0
+        # 키별 진행 중(acquire 후 release 전) 요청 수 - 한도 판단에 사용량과 함께 셈
+        self._reserved = {key: 0 for key in self.keys}
+        ledgers = data.get("ledgers", {})
+        self._ids = {key: key_id(key) for key in self.keys}
+        self._ledgers = {key: QuotaLedger(ledgers.get(self._ids[key])) for key in self.keys}
+        self._evicted = {
+            kid: dict(entry) for kid, entry in data.get("evicted", {}).items()
+            if kid in self._ids.values()
+        }
+
+    def __len__(self):
+        return len(self.keys)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "ledgers": {self._ids[key]: ledger.to_dict() for key, ledger in self._ledgers.items()},
+                "evicted": {kid: dict(entry) for kid, entry in self._evicted.items()}
+            }
+
+    # ------------------------------------------------------------------
+    # 분배
+    # ------------------------------------------------------------------
+    def _is_available(self, key, today):
+        entry = self._evicted.get(self._ids[key])
+        if entry and entry.get("date") == today:
+            return False
+        if self.daily_limit is None:
+            return True
+        return self._ledgers[key].used(today) + self._reserved[key] < self.daily_limit
+
+    def acquire(self):
+        """
+        이번 요청에 쓸 키를 골라 1회 예약 (쓸 수 있는 키가 없으면 None)
+
+        받은 키는 요청이 끝나면(보내지 않았어도) 반드시 release()로 반납합니다.
+        """
+        today = today_kst()
+        with self._lock:
+            available = [key for key in self.keys if self._is_available(key, today)]
+            if not available:
+                return None
+            if self.strategy == "least_used":
+                key = min(available, key=lambda key: self._ledgers[key].used(today) + self._reserved[key])
+            else:
+                # round_robin: 마지막으로 쓴 키 다음부터
+                for offset in range(len(self.keys)):
+                    key = self.keys[(self._next + offset) % len(self.keys)]
+                    if key in available:
+                        self._next = (self.keys.index(key) + 1) % len(self.keys)
+                        break
+            self._reserved[key] += 1
+            return key
+
+    def release(self, key):
+        """acquire()로 예약한 1회 반납 (실제 요청은 record()로 장부에 남음)"""
+        with self._lock:
+            if self._reserved.get(key):
+                self._reserved[key] -= 1
+
+    def available(self):
+        """오늘 쓸 수 있는 키가 남아 있는지"""
+        today = today_kst()
+        with self._lock:
+            return any(self._is_available(key, today) for key in self.keys)
+
+    # ------------------------------------------------------------------
+    # 기록
+    # ------------------------------------------------------------------
+    def record(self, key, operation, count=1):
+        """키별 장부에 실제 요청 기록"""
+        ledger = self._ledgers.get(key)
+        if ledger is not None:
+            ledger.record(operation, count)
+
+    def used(self, key):
+        """키의 오늘 사용량"""
+        return self._ledgers[key].used()
+
+    def evict(self, key, reason):
+        """오늘 남은 시간 동안 키를 분배에서 제외"""
+        kid = self._ids[key]
+        with self._lock:
+            if self._evicted.get(kid, {}).get("date") == today_kst():
+                return
+            self._evicted[kid] = {"date": today_kst(), "reason": reason}
+            active = sum(1 for k in self.keys if self._is_available(k, today_kst()))
+        log(f"🔑 API 키 {kid} 퇴출 ({reason}, 사용 {self.used(key)}회) - 남은 키 {active}개")
+
+    def report_error(self, key, error):
+        """
+        페이지 오류가 키 문제면 키를 퇴출
+
+        Returns:
+            bool: 퇴출했으면 True (다른 키로 바로 다시 요청하면 됨)
+        """
+        reason = eviction_reason(error)
+        if reason is None:
+            return False
+        self.evict(key, reason)
+        return True
+
+    def log_usage(self):
+        """키별 오늘 사용량 로그"""
+        today = today_kst()
+        for key in self.keys:
+            kid = self._ids[key]
+            entry = self._evicted.get(kid)
+            state = f" (퇴출: {entry['reason']})" if entry and entry.get("date") == today else ""
+            limit = f"/{self.daily_limit}" if self.daily_limit is not None else ""
+            log(f"🔑 API 키 {kid}: {self._ledgers[key].used(today)}{limit}회{state}")
@@ -0,0 +1,211 @@
+"""
+G2B(조달청 나라장터) OpenAPI 오퍼레이션 레지스트리
+
+서비스마다 기본 URL, 업무별 오퍼레이션, 조회 기간/조회구분 파라미터 이름,
+item 위치만 선언하면 G2BClient의 같은 페이지 수집 엔진(커넥션 풀, 토큰 버킷,
+호출 장부, 스트리밍 파싱, 구간 분할)으로 수집할 수 있습니다.
+
+사용 예:
+    client = G2BClient(api_key, service="BidPublicInfoService")
+    xml_content, count, calls = client.fetch_data("용역", 2024, 1)
+
+    # 등록되지 않은 서비스 추가
+    register_service(ServiceSpec(
+        name="MyService", label="...", base_url="http://apis.data.go.kr/1230000/.../MyService",
+        jobs={"물품": "getSomethingThng"}
+    ))
+"""
+from collections import namedtuple
+
+# 공공데이터포털 공통 봉투 (response/body/items/item) - XML 파서 백엔드가 이 위치의 <item>을 읽음
+STANDARD_ITEM_PATH = "response.body.items.item"
+
+ServiceSpec = namedtuple(
+    "ServiceSpec",
+    "name label base_url jobs begin_param end_param inqry_div_param item_path",
+    defaults=("inqryBgnDt", "inqryEndDt", "inqryDiv", STANDARD_ITEM_PATH)
+)
+
+# 오퍼레이션 하나의 요청 규칙 (서비스 선언에서 만들어짐)
+OperationSpec = namedtuple(
+    "OperationSpec",
+    "service job operation base_url begin_param end_param inqry_div_param item_path"
+)
+
+# 키 하나(예: 통합계약번호)로 조회하는 상세 오퍼레이션 묶음 (업무별 오퍼레이션)
+DetailSpec = namedtuple(
+    "DetailSpec",
+    "name label service jobs key_field key_param inqry_div"
+)
+
+SERVICES = {}
+OPERATIONS = {}
+DETAILS = {}
+
+
+def register_service(spec):
+    """
+    서비스 선언 등록 (업무별 오퍼레이션이 OPERATIONS에 추가됨)
+
+    Raises:
+        ValueError: 지원하지 않는 item 위치이거나 다른 서비스와 오퍼레이션 이름이 겹칠 때
+    """
+    if spec.item_path != STANDARD_ITEM_PATH:
+        raise ValueError(
+            f"{spec.name}: 지원하지 않는 item 위치 {spec.item_path} (가능: {STANDARD_ITEM_PATH})"
+        )
+    for job, operation in spec.jobs.items():
+        existing = OPERATIONS.get(operation)
+        if existing is not None and existing.service != spec.name:
+            raise ValueError(f"오퍼레이션 이름 중복: {operation} ({existing.service}, {spec.name})")
+        OPERATIONS[operation] = OperationSpec(
+            spec.name, job, operation, spec.base_url,
+            spec.begin_param, spec.end_param, spec.inqry_div_param, spec.item_path
+        )
+    SERVICES[spec.name] = spec
+    return spec
+
+
+def register_detail(spec):
+    """
+    상세 오퍼레이션 선언 등록 (오퍼레이션은 소속 서비스의 URL/파라미터 규칙으로 OPERATIONS에 추가됨)
+
+    Raises:
+        ValueError: 등록되지 않은 서비스이거나 다른 서비스와 오퍼레이션 이름이 겹칠 때
+    """
+    service = get_service(spec.service)
+    for job, operation in spec.jobs.items():
+        existing = OPERATIONS.get(operation)
+        if existing is not None and existing.service != service.name:
+            raise ValueError(f"오퍼레이션 이름 중복: {operation} ({existing.service}, {service.name})")
+        OPERATIONS[operation] = OperationSpec(
+            service.name, job, operation, service.base_url,
+            service.begin_param, service.end_param, service.inqry_div_param, service.item_path
+        )
+    DETAILS[spec.name] = spec
+    return spec
+
+
+def get_detail(name):
+    """
+    Raises:
+        ValueError: 등록되지 않은 상세 오퍼레이션
+    """
+    if name not in DETAILS:
+        raise ValueError(f"등록되지 않은 상세 수집: {name} (가능: {', '.join(DETAILS)})")
+    return DETAILS[name]
+
+
+def get_service(name):
+    """
+    Raises:
+        ValueError: 등록되지 않은 서비스
+    """
+    if name not in SERVICES:
+        raise ValueError(f"등록되지 않은 서비스: {name} (가능: {', '.join(SERVICES)})")
+    return SERVICES[name]
+
+
+def get_operation(operation):
+    """
+    Raises:
+        ValueError: 등록되지 않은 오퍼레이션
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"등록되지 않은 오퍼레이션: {operation}")
+    return OPERATIONS[operation]
+
+
+def build_params(spec, start_date, end_date, inqry_div=None):
+    """오퍼레이션 선언에 맞춘 조회 기간/조회구분 파라미터"""
+    params = {}
+    if spec.inqry_div_param and inqry_div is not None:
+        params[spec.inqry_div_param] = inqry_div
+    params[spec.begin_param] = start_date
+    params[spec.end_param] = end_date
+    return params
+
+
+# ----------------------------------------------------------------------
+# 등록된 서비스
+# ----------------------------------------------------------------------
+CONTRACT_SERVICE = "CntrctInfoService"
+
+register_service(ServiceSpec(
+    name=CONTRACT_SERVICE,
+    label="계약정보",
+    base_url="http://apis.data.go.kr/1230000/ao/CntrctInfoService",
+    jobs={
+        "물품": "getCntrctInfoListThng",
+        "공사": "getCntrctInfoListCnstwk",
+        "용역": "getCntrctInfoListServc",
+        "외자": "getCntrctInfoListFrgcpt"
+    }
+))
+
+register_service(ServiceSpec(
+    name="BidPublicInfoService",
+    label="입찰공고정보",
+    base_url="http://apis.data.go.kr/1230000/ad/BidPublicInfoService",
+    jobs={
+        "물품": "getBidPblancListInfoThng",
+        "공사": "getBidPblancListInfoCnstwk",
+        "용역": "getBidPblancListInfoServc",
+        "외자": "getBidPblancListInfoFrgcpt"
+    }
+))
+
+register_service(ServiceSpec(
+    name="ScsbidInfoService",
+    label="낙찰정보",
+    base_url="http://apis.data.go.kr/1230000/as/ScsbidInfoService",
+    jobs={
+        "물품": "getScsbidListSttusThng",
+        "공사": "getScsbidListSttusCnstwk",
+        "용역": "getScsbidListSttusServc",
+        "외자": "getScsbidListSttusFrgcpt"
+    }
+))
+
+register_service(ServiceSpec(
+    name="HrcspSsstndrdInfoService",
+    label="사전규격정보",
+    base_url="http://apis.data.go.kr/1230000/ao/HrcspSsstndrdInfoService",
+    jobs={
+        "물품": "getPublicPrcureThngInfoThng",
+        "공사": "getPublicPrcureThngInfoCnstwk",
+        "용역": "getPublicPrcureThngInfoServc",
+        "외자": "getPublicPrcureThngInfoFrgcpt"
+    }
+))
+
+# ----------------------------------------------------------------------
+# 등록된 상세 오퍼레이션 (통합계약번호 1건당 요청 1회)
+# ----------------------------------------------------------------------
+register_detail(DetailSpec(
+    name="change_history",
+    label="변경이력",
+    service=CONTRACT_SERVICE,
+    jobs={
+        "물품": "getCntrctInfoListThngChgHstry",
+        "공사": "getCntrctInfoListCnstwkChgHstry",
+        "용역": "getCntrctInfoListServcChgHstry",
+        "외자": "getCntrctInfoListFrgcptChgHstry"
+    },
+    key_field="untyCntrctNo",
+    key_param="untyCntrctNo",
+    inqry_div="2"
+))
+
+register_detail(DetailSpec(
+    name="items",
+    label="세부품목",
+    service=CONTRACT_SERVICE,
+    jobs={
+        "물품": "getCntrctInfoListThngDetail",
+        "외자": "getCntrctInfoListFrgcptDetail"
+    },
+    key_field="untyCntrctNo",
+    key_param="untyCntrctNo",
+    inqry_div="2"
+))
@@ -0,0 +1,222 @@
+"""
+오퍼레이션별 페이지 크기(numOfRows) 자동 조정
+
+같은 조회 구간의 1페이지를 여러 numOfRows로 요청해 보고
+호출당 item 수 / 응답 바이트 / 지연 / 오류율을 오퍼레이션별로 기록한 뒤,
+호출당 가장 많은 item을 주는 크기를 고릅니다 (하루 호출 한도가 병목이므로).
+
+- 요청한 것보다 적게 돌려주면(전체 건수는 더 많은데) 서버 상한으로 보고 그 크기는 제외
+  (그 크기로 페이지를 넘기면 페이지 사이의 item을 건너뛸 수 있음)
+- 오류율이 max_error_rate를 넘거나 지연 중앙값이 max_latency를 넘는 크기는 제외
+- 남은 크기 중 가장 큰 크기의 min_fill 이상인 크기 중 가장 작은 크기를 선택
+  (호출당 item 수가 거의 같으면 작은 요청이 빠르고 덜 실패함)
+- 구간 전체 건수가 요청 크기보다 적은 측정은 상한을 확인할 수 없어 선택에 쓰지 않음
+
+결과는 progress.json에 저장되고 G2BClient(page_sizes=...)가 오퍼레이션별로 사용합니다.
+    {"getCntrctInfoListThng": {"rows": 999, "tuned_at": "2026-10-17",
+                               "sizes": {"999": {"calls": 2, "errors": 0, "items": 1998,
+                                                 "bytes": 1532211, "short": 0, "cap": null,
+                                                 "ms": [3120, 2980]}}}}
+"""
+import statistics
+import threading
+
+try:
+    from .logger import log
+    from .quota import today_kst
+except ImportError:
+    from utils.logger import log
+    from utils.quota import today_kst
+
+# 기본 측정 크기 (999는 기존 값, 1000은 기존에 실패했던 값)
+DEFAULT_SIZES = (100, 500, 999, 1000, 2000, 5000)
+# 크기별로 보관할 최근 지연 표본 수
+LATENCY_WINDOW = 20
+
+
+def parse_sizes(value):
+    """'500,999,1000' → (500, 999, 1000) (비어 있으면 DEFAULT_SIZES)"""
+    sizes = sorted({int(part) for part in str(value or "").replace(" ", "").split(",") if part})
+    return tuple(size for size in sizes if size > 0) or DEFAULT_SIZES
+
+
+class PageSizeTuner:
+    """
+    오퍼레이션별 numOfRows 측정 결과와 최적 페이지 크기
+
+    조정 결과가 없는 오퍼레이션은 rows()에 넘긴 기본값(G2BClient.NUM_OF_ROWS)을 씁니다.
+    """
+
+    def __init__(self, data=None, max_error_rate=0.0, max_latency=60.0, min_fill=0.99):
+        """
+        Args:
+            data: to_dict()로 저장한 측정 결과 (이전 실행에서 이어서 사용)
+            max_error_rate: 허용할 오류율 (기본 0 - 한 번이라도 실패한 크기는 제외)
+            max_latency: 허용할 지연 중앙값(초)
+            min_fill: 최대 호출당 item 수 대비 이 비율 이상이면 같은 효율로 봄
+        """
+        self.max_error_rate = max_error_rate
+        self.max_latency = max_latency
+        self.min_fill = min_fill
+        self._lock = threading.Lock()
+        self.entries = {
+            operation: {
+                "rows": entry.get("rows"),
+                "tuned_at": entry.get("tuned_at"),
+                "sizes": {int(size): dict(stats) for size, stats in entry.get("sizes", {}).items()}
+            }
+            for operation, entry in (data or {}).items() if isinstance(entry, dict)
+        }
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                operation: {
+                    "rows": entry["rows"],
+                    "tuned_at": entry["tuned_at"],
+                    "sizes": {str(size): dict(stats) for size, stats in sorted(entry["sizes"].items())}
+                }
+                for operation, entry in sorted(self.entries.items())
+            }
+
+    def rows(self, operation, default):
+        """오퍼레이션에 쓸 numOfRows (조정 결과가 없으면 default)"""
+        with self._lock:
+            entry = self.entries.get(operation)
+            return entry["rows"] if entry and entry["rows"] else default
+
+    def _entry(self, operation):
+        return self.entries.setdefault(operation, {"rows": None, "tuned_at": None, "sizes": {}})
+
+    def observe(self, operation, rows, items, total_count, nbytes, seconds, error=None):
+        """
+        1페이지 측정 결과 1건 기록
+
+        Args:
+            items: 받은 item 수
+            total_count: 응답의 totalCount (없으면 None)
+            nbytes: 수신 바이트 (압축 해제 전)
+            seconds: 요청부터 파싱까지 걸린 시간
+            error: 실패면 오류 메시지
+        """
+        with self._lock:
+            stats = self._entry(operation)["sizes"].setdefault(rows, {
+                "calls": 0, "errors": 0, "items": 0, "bytes": 0, "short": 0, "cap": None, "ms": []
+            })
+            stats["calls"] += 1
+            if error is not None:
+                stats["errors"] += 1
+                return
+            stats["items"] += items
+            stats["bytes"] += nbytes
+            stats["ms"] = (stats["ms"] + [round(seconds * 1000)])[-LATENCY_WINDOW:]
+            if total_count is None or total_count < rows:
+                # 구간 전체가 요청 크기보다 작으면 서버 상한을 확인할 수 없음
+                stats["short"] += 1
+            elif items < rows:
+                # 더 있는데 덜 줬으면 서버 상한
+                stats["cap"] = items if stats["cap"] is None else min(stats["cap"], items)
+
+    def _usable(self, stats):
+        """선택에 쓸 수 있는 크기인지 (상한 확인됨, 서버 상한 아님, 오류율/지연 기준 통과)"""
+        successes = stats["calls"] - stats["errors"]
+        if not successes or successes <= stats["short"] or stats["cap"] is not None:
+            return False
+        if stats["errors"] / stats["calls"] > self.max_error_rate:
+            return False
+        return not stats["ms"] or statistics.median(stats["ms"]) / 1000 <= self.max_latency
+
+    def choose(self, operation):
+        """
+        측정 결과로 최적 크기를 정해 저장 (쓸 수 있는 측정이 없으면 기존 값 유지)
+
+        Returns:
+            int 또는 None: 선택한 numOfRows
+        """
+        with self._lock:
+            entry = self.entries.get(operation)
+            if not entry:
+                return None
+            usable = [rows for rows, stats in entry["sizes"].items() if self._usable(stats)]
+            if not usable:
+                return entry["rows"]
+            best = max(usable)
+            rows = min(size for size in usable if size >= best * self.min_fill)
+            entry["rows"] = rows
+            entry["tuned_at"] = today_kst()
+            return rows
+
+    def sweep(self, client, operation, start_date, end_date, sizes=DEFAULT_SIZES, repeat=1,
+              should_stop=None):
+        """
+        같은 구간의 1페이지를 크기별로 repeat번씩 요청해 측정하고 최적 크기 선택
+
+        작은 크기부터 측정하고, 서버 상한에 걸렸거나 구간 전체 건수를 넘었거나
+        모든 요청이 실패한 크기보다 큰 크기는 호출하지 않습니다 (더 나을 수 없으므로).
+        client.replay이면 보관한 응답으로 측정합니다 (보관 당시 크기별 응답이 있어야 함).
+
+        Returns:
+            tuple: (선택한 numOfRows 또는 None, api_calls_used)
+        """
+        api_calls_used = 0
+        for size in sorted(sizes):
+            for _ in range(repeat):
+                if should_stop is not None and should_stop():
+                    log("⏸️ 페이지 크기 측정 중단 (호출 한도)")
+                    return self.choose(operation), api_calls_used
+                items, total_count, calls, error, seconds, nbytes = client.measure_page(
+                    operation, size, start_date, end_date
+                )
+                api_calls_used += calls
+                self.observe(operation, size, len(items), total_count, nbytes, seconds, error)
+                if error is not None:
+                    log(f"📏 {operation} numOfRows={size}: 실패 ({error})")
+                    continue
+                log(f"📏 {operation} numOfRows={size}: {len(items):,}건 / {nbytes / 1024:,.0f}KB / "
+                    f"{seconds:.2f}s (전체 {total_count if total_count is not None else '?'}건)")
+            reason = self._stop_reason(operation, size)
+            if reason:
+                log(f"📏 {operation} numOfRows={size}: {reason} - 더 큰 크기는 측정 생략")
+                break
+        rows = self.choose(operation)
+        if rows is not None:
+            log(f"📏 {operation}: numOfRows {rows} 선택")
+        return rows, api_calls_used
+
+    def _stop_reason(self, operation, rows):
+        """이 크기보다 큰 크기를 측정할 필요가 없는 이유 (계속 측정하면 None)"""
+        with self._lock:
+            stats = self.entries.get(operation, {}).get("sizes", {}).get(rows)
+        if not stats:
+            return None
+        if stats["cap"] is not None:
+            return f"서버 상한 {stats['cap']:,}건"
+        if stats["errors"] == stats["calls"]:
+            return "모든 요청 실패"
+        if stats["short"] == stats["calls"] - stats["errors"]:
+            return "구간 전체 건수가 더 적어 상한을 확인할 수 없음"
+        return None
+
+    def report(self, operation):
+        """크기별 요약 [(numOfRows, 호출, 오류율, 호출당 item, KB/호출, 지연 중앙값 초)]"""
+        with self._lock:
+            entry = self.entries.get(operation) or {"sizes": {}}
+            rows = []
+            for size, stats in sorted(entry["sizes"].items()):
+                successes = stats["calls"] - stats["errors"]
+                rows.append((
+                    size,
+                    stats["calls"],
+                    stats["errors"] / stats["calls"] if stats["calls"] else 0.0,
+                    stats["items"] / successes if successes else 0.0,
+                    stats["bytes"] / successes / 1024 if successes else 0.0,
+                    statistics.median(stats["ms"]) / 1000 if stats["ms"] else None
+                ))
+            return rows
+
+    def log_stats(self):
+        """오퍼레이션별 사용 중인 페이지 크기 로그 (조정 결과가 없으면 생략)"""
+        with self._lock:
+            tuned = {operation: entry for operation, entry in self.entries.items() if entry["rows"]}
+        for operation, entry in sorted(tuned.items()):
+            log(f"📏 {operation}: numOfRows {entry['rows']} (측정 {entry['tuned_at']})")
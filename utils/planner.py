@@ -0,0 +1,180 @@
+import os
+import json
+import math
+from datetime import datetime, timedelta
+
+try:
+    from .logger import log
+    from .quota import today_kst
+except ImportError:
+    from utils.logger import log
+    from utils.quota import today_kst
+
+
+def period_key(job, year, month):
+    """계획 항목 키 (예: 물품:2014-05)"""
+    return f"{job}:{year}-{month:02d}"
+
+
+class CollectionPlanner:
+    """
+    numOfRows=1 probe로 (업무, 연, 월)별 totalCount와 필요한 페이지 수를 미리 계산
+
+    계획은 dict로 직렬화되어 progress.json(또는 별도 파일)에 저장되며,
+    max_age_days가 지난 항목만 다시 probe합니다. 다시 probe한 결과가
+    이전과 같으면 기존 항목(수집 여부 등)을 유지하고, 바뀐 항목만 갱신합니다.
+
+    항목 예:
+        "물품:2014-05": {"total_count": 48211, "pages": 49, "rows": 999,
+                         "probed_at": "2025-12-15", "fetched_count": null}
+    페이지 크기(rows)가 조정되면 다시 probe하지 않고 pages만 다시 계산합니다.
+    """
+
+    def __init__(self, client, data=None, max_age_days=30):
+        self.client = client
+        self.max_age_days = max_age_days
+        self.entries = dict(data or {})
+        self.api_calls_used = 0
+
+    # ------------------------------------------------------------------
+    # 저장/로드
+    # ------------------------------------------------------------------
+    @classmethod
+    def load(cls, client, path, max_age_days=30):
+        """계획 파일 로드 (없거나 깨졌으면 빈 계획)"""
+        data = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                log(f"⚠️ 수집 계획 파일 로드 실패, 새로 작성: {e}")
+        return cls(client, data, max_age_days)
+
+    def save(self, path):
+        """계획 파일 저장 (임시 파일에 쓴 뒤 교체)"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, path)
+
+    def to_dict(self):
+        return dict(self.entries)
+
+    # ------------------------------------------------------------------
+    # 계획
+    # ------------------------------------------------------------------
+    def entry(self, job, year, month):
+        return self.entries.get(period_key(job, year, month))
+
+    def _is_stale(self, entry):
+        if not entry or not entry.get("probed_at"):
+            return True
+        probed = datetime.strptime(entry["probed_at"], "%Y-%m-%d")
+        return datetime.strptime(today_kst(), "%Y-%m-%d") - probed > timedelta(days=self.max_age_days)
+
+    def probe(self, job, year, month):
+        """
+        해당 월을 probe하고 계획 갱신
+
+        Returns:
+            tuple: (entry 또는 None, api_calls_used)
+        """
+        total_count, calls, error = self.client.probe(job, year, month)
+        self.api_calls_used += calls
+
+        key = period_key(job, year, month)
+        if error:
+            log(f"⚠️ probe 실패: {key} - {error}")
+            return self.entries.get(key), calls
+
+        previous = self.entries.get(key)
+        if previous and previous.get("total_count") == total_count:
+            # 결과가 같으면 기존 항목 유지 (probe 날짜만 갱신)
+            previous["probed_at"] = today_kst()
+            self._update_pages(job, previous)
+            return previous, calls
+
+        if previous:
+            log(f"🔄 계획 변경: {key} totalCount {previous.get('total_count')} → {total_count}")
+
+        rows = self._rows(job)
+        entry = {
+            "total_count": total_count,
+            "pages": math.ceil(total_count / rows),
+            "rows": rows,
+            "probed_at": today_kst(),
+            "fetched_count": None
+        }
+        self.entries[key] = entry
+        log(f"🔎 probe: {key} → {total_count:,}건 ({entry['pages']}페이지)")
+        return entry, calls
+
+    def ensure(self, job, year, month):
+        """계획이 없거나 오래됐으면 probe, 아니면 캐시 사용"""
+        entry = self.entry(job, year, month)
+        if not self._is_stale(entry):
+            self._update_pages(job, entry)
+            return entry, 0
+        return self.probe(job, year, month)
+
+    def _rows(self, job):
+        """업무의 현재 페이지 크기 (오퍼레이션별 조정 결과 반영)"""
+        return self.client.rows_for(self.client.OPERATION_MAP[job])
+
+    def _update_pages(self, job, entry):
+        """페이지 크기가 바뀌었으면 pages 다시 계산 (rows가 없는 예전 항목은 NUM_OF_ROWS 기준)"""
+        rows = self._rows(job)
+        if entry.get("rows", self.client.NUM_OF_ROWS) != rows:
+            entry["pages"] = math.ceil((entry.get("total_count") or 0) / rows)
+        entry["rows"] = rows
+
+    def estimated_calls(self, entry, committed_pages=0):
+        """
+        해당 월을 수집하는 데 필요한 호출 수 추정
+
+        빈 월은 0회(수집 생략). 구간 분할 기준을 넘으면 분할용 첫 페이지 호출을 더합니다.
+        committed_pages: 체크포인트에 이미 저장한 페이지 수 (남은 페이지만 셈)
+        """
+        total_count = entry.get("total_count") or 0
+        if total_count == 0:
+            return 0
+        calls = max(1, entry["pages"] - committed_pages)
+        threshold = getattr(self.client, "split_threshold", None)
+        if threshold is None:
+            # 기본 분할 기준은 잘릴 수밖에 없는 건수 (MAX_PAGES × 페이지 크기)
+            threshold = self.client.MAX_PAGES * entry.get("rows", self.client.NUM_OF_ROWS)
+        if threshold and total_count > threshold:
+            # 상위 구간 첫 페이지 + 하위 구간 수에 비례하는 추가 호출
+            calls += 2 * math.ceil(total_count / threshold)
+        return calls
+
+    def mark_fetched(self, job, year, month, item_count):
+        """수집 완료 기록"""
+        entry = self.entry(job, year, month)
+        if entry is not None:
+            entry["fetched_count"] = item_count
+
+    def prefetch(self, periods, budget):
+        """
+        남은 예산으로 앞으로 수집할 월을 미리 probe (다음 실행 계획 준비)
+
+        Args:
+            periods: (job, year, month) 이터러블 (수집 순서대로)
+            budget: 사용할 수 있는 최대 호출 수
+
+        Returns:
+            int: 사용한 호출 수
+        """
+        used = 0
+        for job, year, month in periods:
+            if used >= budget:
+                break
+            if not self._is_stale(self.entry(job, year, month)):
+                continue
+            _, calls = self.probe(job, year, month)
+            used += calls
+        if used:
+            log(f"🗺️ 다음 실행용 계획 probe: {used}회")
+        return used
@@ -0,0 +1,125 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
+
+try:
+    from .logger import log
+except ImportError:
+    from utils.logger import log
+
+# 공공데이터포털 일일 트래픽은 한국시간 자정에 리셋
+KST = timezone(timedelta(hours=9))
+
+
+def today_kst():
+    """한국시간 기준 오늘 날짜 (YYYY-MM-DD)"""
+    return datetime.now(KST).strftime('%Y-%m-%d')
+
+
+def operation_from_url(url):
+    """요청 URL(또는 경로)에서 오퍼레이션 이름 추출"""
+    path = urlparse(url or "").path
+    return path.rstrip("/").rsplit("/", 1)[-1] or "unknown"
+
+
+class QuotaLedger:
+    """
+    실제 HTTP 요청 횟수 장부 (KST 날짜 → 오퍼레이션 → 횟수)
+
+    progress.json에 그대로 저장할 수 있도록 dict로 직렬화됩니다.
+        {"2025-12-15": {"getCntrctInfoListThng": 498, "getCntrctInfoListServc": 2}}
+    """
+
+    def __init__(self, data=None, keep_days=7):
+        self._lock = threading.Lock()
+        self.keep_days = keep_days
+        self._data = {
+            date: dict(ops) for date, ops in (data or {}).items()
+            if isinstance(ops, dict)
+        }
+
+    def record(self, operation, count=1, date=None):
+        """요청 count회 기록"""
+        date = date or today_kst()
+        with self._lock:
+            ops = self._data.setdefault(date, {})
+            ops[operation] = ops.get(operation, 0) + count
+
+    def used(self, date=None, operation=None):
+        """해당 날짜(기본 오늘)의 사용량. operation을 주면 해당 오퍼레이션만"""
+        date = date or today_kst()
+        with self._lock:
+            ops = self._data.get(date, {})
+            if operation is not None:
+                return ops.get(operation, 0)
+            return sum(ops.values())
+
+    def by_operation(self, date=None):
+        """해당 날짜의 오퍼레이션별 사용량"""
+        date = date or today_kst()
+        with self._lock:
+            return dict(self._data.get(date, {}))
+
+    def to_dict(self):
+        """최근 keep_days일만 남긴 직렬화용 dict"""
+        cutoff = (datetime.now(KST) - timedelta(days=self.keep_days)).strftime('%Y-%m-%d')
+        with self._lock:
+            return {
+                date: dict(ops) for date, ops in sorted(self._data.items())
+                if date >= cutoff
+            }
+
+
+class CountingRetry(Retry):
+    """
+    재시도마다 콜백을 호출하는 urllib3 Retry
+
+    increment()가 새 Retry를 반환하면 같은 요청이 한 번 더 전송되므로,
+    그 시점에 on_retry(url)로 추가 시도를 알립니다.
+    """
+
+    def __init__(self, *args, on_retry=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_retry = on_retry
+
+    def new(self, **kw):
+        retry = super().new(**kw)
+        retry.on_retry = self.on_retry
+        return retry
+
+    def increment(self, method=None, url=None, *args, **kwargs):
+        retry = super().increment(method, url, *args, **kwargs)
+        if self.on_retry is not None:
+            self.on_retry(url)
+        return retry
+
+
+class InstrumentedAdapter(HTTPAdapter):
+    """
+    실제 전송 시도를 모두 세는 HTTPAdapter
+
+    최초 전송은 send()에서, urllib3 내부 재시도는 CountingRetry에서
+    on_attempt(operation)을 호출합니다.
+    """
+
+    def __init__(self, on_attempt, retry_kwargs=None, **kwargs):
+        self.on_attempt = on_attempt
+        retry = CountingRetry(
+            on_retry=lambda url: self.on_attempt(operation_from_url(url)),
+            **(retry_kwargs or {})
+        )
+        super().__init__(max_retries=retry, **kwargs)
+
+    def send(self, request, **kwargs):
+        self.on_attempt(operation_from_url(request.url))
+        return super().send(request, **kwargs)
+
+
+def log_quota_usage(ledger, limit):
+    """오늘 오퍼레이션별 사용량 로그"""
+    usage = ledger.by_operation()
+    detail = ", ".join(f"{op} {count}" for op, count in sorted(usage.items())) or "없음"
+    log(f"📒 오늘 실제 API 요청: {ledger.used()}/{limit} ({detail})")
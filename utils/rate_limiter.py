@@ -0,0 +1,183 @@
+import os
+import json
+import time
+import asyncio
+import functools
+import threading
+
+# 프로세스 간 공유(파일 잠금)는 POSIX에서만 지원
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    from .logger import log
+except ImportError:
+    from utils.logger import log
+
+
+class TokenBucket:
+    """
+    토큰 버킷 속도 제한기
+
+    - rate: 초당 토큰 보충 속도 (0 이하이면 제한 없음)
+    - burst: 버킷 최대 크기 (순간적으로 연속 허용되는 요청 수)
+    - state_path: 지정하면 버킷 상태를 파일에 두고 flock으로 잠가
+      같은 러너의 여러 프로세스가 하나의 예산을 공유
+
+    스레드/asyncio 모두에서 안전하며, 컨텍스트 매니저와 데코레이터로 사용할 수 있습니다.
+
+    사용 예:
+        limiter = TokenBucket(rate=5, burst=10)
+
+        with limiter:
+            session.get(...)
+
+        async with limiter:
+            await session.get(...)
+
+        @limiter
+        def call_api(): ...
+    """
+
+    def __init__(self, rate, burst=None, state_path=None, name="g2b"):
+        self.rate = float(rate or 0)
+        self.burst = float(burst if burst else max(1.0, self.rate))
+        self.name = name
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self.waited = 0.0
+
+        if self.state_path and fcntl is None:
+            log(f"⚠️ [{name}] 파일 잠금 미지원 환경 - 프로세스 간 속도 제한 공유 비활성화")
+            self.state_path = None
+
+    # ------------------------------------------------------------------
+    # 토큰 계산
+    # ------------------------------------------------------------------
+    def _refill(self, tokens, elapsed):
+        return min(self.burst, tokens + elapsed * self.rate)
+
+    def _take_local(self, tokens):
+        now = time.monotonic()
+        self._tokens = self._refill(self._tokens, now - self._updated)
+        self._updated = now
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return 0.0
+        return (tokens - self._tokens) / self.rate
+
+    def _take_shared(self, tokens):
+        """상태 파일을 잠근 채로 토큰 차감 (프로세스 간 공유)"""
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        with open(self.state_path, "a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or "{}")
+                except ValueError:
+                    state = {}
+
+                now = time.time()
+                current = self._refill(
+                    float(state.get("tokens", self.burst)),
+                    max(0.0, now - float(state.get("updated", now)))
+                )
+                wait = 0.0
+                if current >= tokens:
+                    current -= tokens
+                else:
+                    wait = (tokens - current) / self.rate
+
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps({"tokens": current, "updated": now}))
+                return wait
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _take(self, tokens):
+        """토큰을 차감하고 0을 반환하거나, 부족하면 기다려야 할 시간(초) 반환"""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            if self.state_path:
+                return self._take_shared(tokens)
+            return self._take_local(tokens)
+
+    # ------------------------------------------------------------------
+    # 획득
+    # ------------------------------------------------------------------
+    def acquire(self, tokens=1):
+        """토큰을 얻을 때까지 대기 (스레드용)"""
+        while True:
+            wait = self._take(tokens)
+            if wait <= 0:
+                return
+            self.waited += wait
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens=1):
+        """토큰을 얻을 때까지 대기 (asyncio용, 이벤트 루프를 막지 않음)"""
+        while True:
+            wait = self._take(tokens)
+            if wait <= 0:
+                return
+            self.waited += wait
+            await asyncio.sleep(wait)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    async def __aenter__(self):
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+    def __call__(self, func):
+        """데코레이터: 호출마다 토큰 1개 소비"""
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                await self.acquire_async()
+                return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            self.acquire()
+            return func(*args, **kwargs)
+        return wrapper
+
+
+# 모든 G2B 서비스 클라이언트가 공유하는 기본 속도 제한기
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_limiter():
+    """
+    프로세스 공용 속도 제한기
+
+    환경변수:
+        G2B_RATE_LIMIT: 초당 요청 수 (기본 10, 0이면 제한 없음)
+        G2B_RATE_BURST: 버스트 크기 (기본 G2B_RATE_LIMIT)
+        G2B_RATE_STATE: 상태 파일 경로 (지정 시 프로세스 간 공유)
+    """
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            rate = float(os.getenv("G2B_RATE_LIMIT", "10"))
+            burst = float(os.getenv("G2B_RATE_BURST", "0")) or None
+            _shared_limiter = TokenBucket(rate, burst, os.getenv("G2B_RATE_STATE") or None)
+        return _shared_limiter
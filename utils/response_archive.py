@@ -0,0 +1,120 @@
+import os
+import gzip
+import json
+import hashlib
+import threading
+
+try:
+    from .logger import log
+    from .quota import today_kst
+except ImportError:
+    from utils.logger import log
+    from utils.quota import today_kst
+
+# 아카이브 키에서 빼는 파라미터 (요청마다 달라도 응답은 같음)
+EXCLUDED_PARAMS = {"serviceKey"}
+
+
+def archive_key(operation, params):
+    """
+    (오퍼레이션, 정규화한 파라미터)의 sha256
+
+    서비스키는 빼고, 값은 문자열로 바꿔 이름순으로 정렬하므로
+    pageNo=1과 pageNo="1"은 같은 키가 됩니다.
+    """
+    normalized = sorted(
+        (name, str(value)) for name, value in params.items() if name not in EXCLUDED_PARAMS
+    )
+    payload = json.dumps([operation, normalized], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseArchive:
+    """
+    원본 응답 본문의 내용 주소(content-addressed) 압축 보관소
+
+    응답 본문은 root/{오퍼레이션}/{키 앞 2자리}/{키}.gz에 gzip으로 저장되고,
+    index.jsonl에 키별 요청 파라미터(서비스키 제외)가 한 줄씩 남습니다.
+    같은 요청을 다시 저장하면 파일만 교체되므로 몇 번을 받아도 한 벌만 남습니다.
+
+    사용 예:
+        archive = ResponseArchive("data/raw")
+        client = G2BClient(api_key, archive=archive)                 # 받으면서 보관
+        replay = G2BClient(None, archive=archive, replay=True)       # API 호출 없이 재처리
+        xml_content, count, _ = replay.fetch_data("물품", 2024, 1)
+    """
+
+    INDEX_FILE = "index.jsonl"
+
+    def __init__(self, root, compresslevel=6):
+        self.root = root
+        self.compresslevel = compresslevel
+        self._lock = threading.Lock()
+
+        # 통계
+        self.writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.raw_bytes = 0      # 보관한 원본 크기
+        self.stored_bytes = 0   # 압축 후 크기
+
+    def path(self, operation, key):
+        return os.path.join(self.root, operation, key[:2], f"{key}.gz")
+
+    def __contains__(self, request):
+        operation, params = request
+        return os.path.exists(self.path(operation, archive_key(operation, params)))
+
+    def put(self, operation, params, body):
+        """응답 본문 보관 (임시 파일에 쓴 뒤 교체 - 중간에 죽어도 깨진 파일이 남지 않음)"""
+        key = archive_key(operation, params)
+        path = self.path(operation, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        existed = os.path.exists(path)
+        data = gzip.compress(body, compresslevel=self.compresslevel, mtime=0)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self.writes += 1
+            self.raw_bytes += len(body)
+            self.stored_bytes += len(data)
+            if not existed:
+                entry = {
+                    "key": key,
+                    "operation": operation,
+                    "params": {
+                        name: str(value) for name, value in sorted(params.items())
+                        if name not in EXCLUDED_PARAMS
+                    },
+                    "size": len(body),
+                    "archived_at": today_kst()
+                }
+                with open(os.path.join(self.root, self.INDEX_FILE), "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return key
+
+    def get(self, operation, params):
+        """보관한 응답 본문 (없으면 None)"""
+        path = self.path(operation, archive_key(operation, params))
+        try:
+            with open(path, "rb") as f:
+                body = gzip.decompress(f.read())
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return body
+
+    def log_stats(self):
+        """실행 결과 요약 로그"""
+        if self.writes:
+            ratio = self.stored_bytes / self.raw_bytes if self.raw_bytes else 0
+            log(f"🗄️ 응답 보관: {self.writes}건, 원본 {self.raw_bytes / 1024 / 1024:.1f}MB → "
+                f"{self.stored_bytes / 1024 / 1024:.1f}MB ({ratio:.0%}) - {self.root}")
+        if self.hits or self.misses:
+            log(f"🗄️ 응답 재생: {self.hits}건 (없음 {self.misses}건) - {self.root}")
@@ -0,0 +1,117 @@
+import threading
+from collections import deque
+
+try:
+    from .logger import log
+    from .hedging import percentile
+except ImportError:
+    from utils.logger import log
+    from utils.hedging import percentile
+
+
+def latency_key(operation, num_of_rows):
+    """지연 분포 키 (오퍼레이션 × 페이지 크기)"""
+    return f"{operation}×{num_of_rows}"
+
+
+class AdaptiveTimeout:
+    """
+    오퍼레이션/페이지 크기별 응답 지연 분포로 connect/read 타임아웃 계산
+
+    표본은 응답 헤더까지 걸린 시간(requests의 response.elapsed)이고,
+    read 타임아웃은 p99 × 배수 + 여유, connect 타임아웃은 p99 + 여유를
+    각각 하한/상한 안으로 자릅니다. 연결 시간은 헤더 도착 시간을 넘을 수 없으므로
+    헤더 지연의 p99는 connect 타임아웃의 안전한 상한입니다.
+    표본이 부족한 키는 default 값을 씁니다.
+    progress.json에 저장할 수 있도록 dict로 직렬화됩니다 (키별 최근 표본, ms 단위).
+        {"getCntrctInfoListThng×999": [812, 790, 1430, ...]}
+    """
+
+    def __init__(self, data=None, quantile=0.99, margin=2.0, read_multiplier=1.5,
+                 connect_bounds=(3.05, 10.0), read_bounds=(5.0, 120.0),
+                 default=(10.0, 30.0), min_samples=20, window=300):
+        """
+        Args:
+            data: to_dict()로 저장한 표본 (이전 실행에서 이어서 사용)
+            quantile: 기준 분위수 (기본 p99)
+            margin: 분위수에 더할 여유(초)
+            read_multiplier: read 타임아웃에 곱할 배수
+            connect_bounds / read_bounds: (하한, 상한) 초
+            default: 표본이 부족할 때 (connect, read)
+            min_samples: 분포를 믿을 수 있는 최소 표본 수
+            window: 키별로 보관할 최근 표본 수
+        """
+        self.quantile = quantile
+        self.margin = margin
+        self.read_multiplier = read_multiplier
+        self.connect_bounds = connect_bounds
+        self.read_bounds = read_bounds
+        self.default = default
+        self.min_samples = min_samples
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = {
+            key: deque((ms / 1000 for ms in values), maxlen=window)
+            for key, values in (data or {}).items() if isinstance(values, list)
+        }
+        # 실행 중 타임아웃 발생 횟수 (키별)
+        self.timeouts = {}
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                key: [round(value * 1000) for value in samples]
+                for key, samples in sorted(self._samples.items())
+            }
+
+    def observe(self, key, latency):
+        """정상 응답의 헤더 지연(초) 기록"""
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(latency)
+
+    def record_timeout(self, key):
+        """타임아웃 발생 기록 (이번 실행 동안 해당 키의 read 타임아웃을 늘림)"""
+        with self._lock:
+            self.timeouts[key] = self.timeouts.get(key, 0) + 1
+
+    def timeout(self, key):
+        """
+        요청에 쓸 (connect, read) 타임아웃(초)
+
+        이번 실행에서 타임아웃이 난 키는 난 횟수만큼 read 타임아웃을 두 배씩 늘립니다 (상한까지).
+        """
+        with self._lock:
+            samples = list(self._samples.get(key, ()))
+            misses = self.timeouts.get(key, 0)
+        if len(samples) < self.min_samples:
+            connect, read = self.default
+        else:
+            p = percentile(samples, self.quantile)
+            connect = _clamp(p + self.margin, self.connect_bounds)
+            read = _clamp(p * self.read_multiplier + self.margin, self.read_bounds)
+        if misses:
+            read = min(self.read_bounds[1], read * 2 ** misses)
+        return connect, read
+
+    def log_profile(self):
+        """키별 분포와 현재 타임아웃 로그"""
+        with self._lock:
+            keys = sorted(self._samples)
+        for key in keys:
+            with self._lock:
+                samples = list(self._samples[key])
+            connect, read = self.timeout(key)
+            log(
+                f"⏱️ {key}: 표본 {len(samples)}개, p50 {percentile(samples, 0.5):.2f}s / "
+                f"p{self.quantile * 100:g} {percentile(samples, self.quantile):.2f}s "
+                f"→ 타임아웃 connect {connect:.1f}s / read {read:.1f}s"
+                + (f" (타임아웃 {self.timeouts[key]}회)" if self.timeouts.get(key) else "")
+            )
+
+
+def _clamp(value, bounds):
+    low, high = bounds
+    return min(high, max(low, value))
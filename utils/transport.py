@@ -0,0 +1,292 @@
+"""
+G2B 요청 공용 HTTP 전송 계층
+
+모든 G2B 요청(수집기, 비동기 수집기, 벤치마크, 진단 스크립트)이 같은 설정의
+세션을 쓰도록 세션/커넥터를 만드는 곳입니다.
+
+- 커넥션 풀 크기를 동시 요청 수(워커/AIMD 상한, 중복 요청 포함)에 맞춤
+  (풀보다 동시 요청이 많으면 쓰고 난 커넥션을 버리고 매번 새로 연결함)
+- keep-alive와 압축(gzip/deflate, 설치되어 있으면 br/zstd) 협상 헤더
+- 프로세스 공용 DNS 캐시 (새 커넥션마다 이름을 다시 찾지 않음)
+- 호스트별 요청 수/새 커넥션 수 통계 (재사용률 = 1 - 새 커넥션 / 요청)
+
+사용 예:
+    session = create_session(pool_size=8)
+    session.get(url, params=params, timeout=30)
+    session.transport_stats.log_stats()
+"""
+import os
+import time
+import socket
+import threading
+from urllib.parse import urlparse
+
+import requests
+from urllib3.util import make_headers
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+try:
+    from .logger import log
+    from .quota import InstrumentedAdapter
+except ImportError:
+    from utils.logger import log
+    from utils.quota import InstrumentedAdapter
+
+# 서버가 먼저 끊지 않는 한 커넥션을 유지할 시간(초, aiohttp 커넥터)
+KEEPALIVE_SECONDS = 30
+# 이름 풀이 결과를 재사용할 시간(초)
+DNS_TTL = float(os.getenv("G2B_DNS_TTL", "300"))
+
+DEFAULT_HEADERS = {
+    "Connection": "keep-alive",
+    # urllib3가 풀 수 있는 압축 방식만 (brotli/zstandard가 설치되어 있으면 포함)
+    "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"]
+}
+
+
+class TransportStats:
+    """
+    호스트별 요청 수 / 새 커넥션 수 / DNS 캐시 적중 통계
+
+    여러 세션(병렬 모드 워커마다 클라이언트)이 하나를 공유할 수 있습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hosts = {}         # 호스트 → {"requests", "connections"}
+        self.dns_hits = 0
+        self.dns_misses = 0
+
+    def _host(self, host):
+        return self.hosts.setdefault(host, {"requests": 0, "connections": 0})
+
+    def record_request(self, host):
+        with self._lock:
+            self._host(host)["requests"] += 1
+
+    def record_connection(self, host):
+        with self._lock:
+            self._host(host)["connections"] += 1
+
+    def record_dns(self, hit):
+        with self._lock:
+            if hit:
+                self.dns_hits += 1
+            else:
+                self.dns_misses += 1
+
+    def reuse_rate(self, host=None):
+        """커넥션 재사용률 (요청 중 기존 커넥션으로 보낸 비율, 요청이 없으면 None)"""
+        with self._lock:
+            if host is None:
+                hosts = list(self.hosts.values())
+            else:
+                hosts = [self.hosts[host]] if host in self.hosts else []
+            requests_ = sum(h["requests"] for h in hosts)
+            connections = sum(h["connections"] for h in hosts)
+        if not requests_:
+            return None
+        return max(0.0, 1 - connections / requests_)
+
+    def metrics(self):
+        with self._lock:
+            return {
+                "hosts": {host: dict(counts) for host, counts in self.hosts.items()},
+                "dns_hits": self.dns_hits,
+                "dns_misses": self.dns_misses
+            }
+
+    def log_stats(self):
+        """실행 결과 요약 로그 (요청이 없으면 생략)"""
+        metrics = self.metrics()
+        for host, counts in sorted(metrics["hosts"].items()):
+            if not counts["requests"]:
+                continue
+            log(f"🔌 {host}: 요청 {counts['requests']:,}회 / 새 커넥션 {counts['connections']:,}개 "
+                f"(재사용률 {self.reuse_rate(host):.0%})")
+        if metrics["dns_hits"] or metrics["dns_misses"]:
+            log(f"🔌 DNS 캐시: 적중 {metrics['dns_hits']:,}회 / 조회 {metrics['dns_misses']:,}회")
+
+
+class DNSCache:
+    """
+    호스트 이름 → IP 캐시 (ttl초 동안 재사용, 연결 실패 시 해당 항목 폐기)
+
+    IP로만 연결 주소를 바꾸므로 Host 헤더와 TLS SNI/인증서 확인은 원래 이름 그대로입니다.
+    """
+
+    def __init__(self, ttl=DNS_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}      # (호스트, 포트) → (IP, 만료 시각)
+
+    def resolve(self, host, port, stats=None):
+        """캐시된 IP (이름 풀이에 실패하면 원래 이름을 돌려줘 urllib3가 오류를 내게 함)"""
+        if self.ttl <= 0 or _is_ip(host):
+            return host
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((host, port))
+        if entry is not None and entry[1] > now:
+            if stats is not None:
+                stats.record_dns(True)
+            return entry[0]
+        try:
+            infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError:
+            return host
+        if stats is not None:
+            stats.record_dns(False)
+        address = infos[0][4][0]
+        with self._lock:
+            self._entries[(host, port)] = (address, now + self.ttl)
+        return address
+
+    def invalidate(self, host, port):
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+
+def _is_ip(host):
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, host)
+            return True
+        except OSError:
+            continue
+    return False
+
+
+def _connection_class(base, dns_cache, stats):
+    """DNS 캐시를 쓰고 새 커넥션을 세는 urllib3 커넥션 클래스"""
+
+    class TransportConnection(base):
+        def _new_conn(self):
+            host = self._dns_host
+            if dns_cache is not None:
+                self._dns_host = dns_cache.resolve(host, self.port, stats)
+            try:
+                sock = super()._new_conn()
+            except Exception:
+                if dns_cache is not None:
+                    dns_cache.invalidate(host, self.port)
+                raise
+            finally:
+                self._dns_host = host
+            if stats is not None:
+                stats.record_connection(host)
+            return sock
+
+    return TransportConnection
+
+
+class TransportAdapter(InstrumentedAdapter):
+    """
+    공용 전송 어댑터 (전송 시도 콜백 + DNS 캐시 + 호스트별 커넥션 통계)
+
+    on_attempt를 넘기지 않으면 전송 시도를 세지 않습니다 (진단/벤치마크용).
+    """
+
+    def __init__(self, on_attempt=None, retry_kwargs=None, dns_cache=None, stats=None, **kwargs):
+        self.dns_cache = dns_cache
+        self.stats = stats
+        super().__init__(on_attempt or (lambda operation: None), retry_kwargs, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        pool_classes = {}
+        for scheme, pool_base in (("http", HTTPConnectionPool), ("https", HTTPSConnectionPool)):
+            pool_classes[scheme] = type(f"Transport{pool_base.__name__}", (pool_base,), {
+                "ConnectionCls": _connection_class(pool_base.ConnectionCls, self.dns_cache, self.stats)
+            })
+        self.poolmanager.pool_classes_by_scheme = pool_classes
+
+    def send(self, request, **kwargs):
+        if self.stats is not None:
+            self.stats.record_request(urlparse(request.url).hostname or "unknown")
+        return super().send(request, **kwargs)
+
+
+# 프로세스 공용 DNS 캐시 / 전송 통계
+_shared_dns_cache = DNSCache()
+_shared_stats = TransportStats()
+
+
+def get_shared_stats():
+    """모든 G2B 세션이 기본으로 기록하는 프로세스 공용 전송 통계"""
+    return _shared_stats
+
+
+def create_session(pool_size=10, on_attempt=None, retry_kwargs=None, stats=None, pool_hosts=4):
+    """
+    공용 설정의 requests 세션
+
+    Args:
+        pool_size: 호스트별 커넥션 풀 크기 (동시에 보낼 수 있는 요청 수 이상으로)
+        on_attempt: 실제 전송 시도마다 호출할 콜백 (urllib3 재시도 포함, 호출 장부용)
+        retry_kwargs: urllib3 Retry 설정 (기본: requests와 같이 재시도 없음)
+        stats: 기록할 TransportStats (기본: 프로세스 공용)
+        pool_hosts: 풀을 유지할 호스트 수
+
+    Returns:
+        requests.Session: transport_stats 속성에 통계 객체가 붙어 있음
+    """
+    stats = stats if stats is not None else _shared_stats
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    adapter = TransportAdapter(
+        on_attempt,
+        retry_kwargs=retry_kwargs if retry_kwargs is not None else {"total": 0, "read": False},
+        dns_cache=_shared_dns_cache,
+        stats=stats,
+        pool_connections=pool_hosts,
+        pool_maxsize=max(1, int(pool_size))
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.transport_stats = stats
+    return session
+
+
+def create_aiohttp_session(limit, timeout, stats=None):
+    """
+    공용 설정의 aiohttp 세션 (AsyncG2BClient용)
+
+    커넥터 한도를 동시 요청 수에 맞추고, aiohttp 자체 DNS 캐시와 keep-alive를 쓰며,
+    요청/새 커넥션/DNS 캐시 적중을 TransportStats(기본: 프로세스 공용)에 기록합니다.
+    aiohttp는 기본으로 압축을 협상하고 풀어 줍니다.
+    """
+    import aiohttp
+
+    stats = stats if stats is not None else _shared_stats
+    trace = aiohttp.TraceConfig()
+
+    async def on_request_start(session, context, params):
+        context.host = params.url.host or "unknown"
+        stats.record_request(context.host)
+
+    async def on_connection_create_end(session, context, params):
+        stats.record_connection(getattr(context, "host", "unknown"))
+
+    async def on_dns_cache_hit(session, context, params):
+        stats.record_dns(True)
+
+    async def on_dns_cache_miss(session, context, params):
+        stats.record_dns(False)
+
+    trace.on_request_start.append(on_request_start)
+    trace.on_connection_create_end.append(on_connection_create_end)
+    trace.on_dns_cache_hit.append(on_dns_cache_hit)
+    trace.on_dns_cache_miss.append(on_dns_cache_miss)
+
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit,
+        ttl_dns_cache=int(DNS_TTL),
+        keepalive_timeout=KEEPALIVE_SECONDS
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+        trace_configs=[trace]
+    )
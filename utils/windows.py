@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+
+
+def _day(value):
+    return datetime.strptime(value[:8], "%Y%m%d")
+
+
+def window_days(start_date, end_date):
+    """구간에 포함된 날짜 수"""
+    return (_day(end_date) - _day(start_date)).days + 1
+
+
+def _make_window(first_day, last_day):
+    return first_day.strftime("%Y%m%d") + "0000", last_day.strftime("%Y%m%d") + "2359"
+
+
+def split_window(start_date, end_date):
+    """
+    조회 구간을 더 작은 구간으로 분할
+
+    - 15일 이상: 절반 (예: 1~15일 / 16~31일)
+    - 8~14일: 7일 단위 주
+    - 2~7일: 하루 단위
+    - 하루: 더 이상 분할하지 않음 (빈 리스트)
+
+    Returns:
+        list: [(start_date, end_date), ...] 시간 순서대로, 서로 겹치지 않음
+    """
+    first_day, last_day = _day(start_date), _day(end_date)
+    days = (last_day - first_day).days + 1
+
+    if days <= 1:
+        return []
+
+    if days >= 15:
+        middle = first_day + timedelta(days=days // 2 - 1)
+        return [
+            _make_window(first_day, middle),
+            _make_window(middle + timedelta(days=1), last_day)
+        ]
+
+    step = 7 if days >= 8 else 1
+    windows = []
+    current = first_day
+    while current <= last_day:
+        chunk_end = min(current + timedelta(days=step - 1), last_day)
+        windows.append(_make_window(current, chunk_end))
+        current = chunk_end + timedelta(days=1)
+    return windows
+
+
+def describe_window(start_date, end_date):
+    """로그용 구간 표기 (예: 2014-01-01~2014-01-15)"""
+    return f"{_day(start_date):%Y-%m-%d}~{_day(end_date):%Y-%m-%d}"
@@ -0,0 +1,344 @@
+"""
+G2B 응답 XML 파서 백엔드
+
+모든 백엔드는 같은 인터페이스(feed/close)를 가지며, <item>을 같은 규칙으로
+직렬화한 문자열(item 레코드)을 돌려줍니다. 어떤 백엔드를 쓰든 저장되는
+데이터는 바이트 단위로 같습니다.
+
+    - etree: xml.etree.ElementTree (표준 라이브러리)
+    - expat: xml.parsers.expat 콜백으로 트리 없이 바로 문자열 생성 (표준 라이브러리)
+    - lxml: lxml.etree (설치된 경우에만, 선택 의존성)
+
+사용 예:
+    parser = create_parser("auto")
+    for chunk in chunks:
+        for item in parser.feed(chunk):
+            ...
+    items = parser.close()
+    parser.header  # {"resultCode": "00", "resultMsg": ..., "totalCount": "123"}
+"""
+import xml.etree.ElementTree as ET
+from xml.parsers import expat
+
+# lxml은 설치된 경우에만 사용 (선택 의존성)
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+# item 바깥에서 읽어 둘 헤더 필드 (returnReasonCode/returnAuthMsg는 게이트웨이 에러 응답)
+HEADER_FIELDS = ("resultCode", "resultMsg", "totalCount", "returnReasonCode", "returnAuthMsg")
+
+
+class ParseError(ValueError):
+    """백엔드와 무관한 XML 파싱 오류"""
+
+
+# ----------------------------------------------------------------------
+# item 직렬화 (ElementTree.tostring과 같은 형식, item 자신의 tail은 제외)
+# ----------------------------------------------------------------------
+def escape_text(text):
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text:
+        text = text.replace("<", "&lt;")
+    if ">" in text:
+        text = text.replace(">", "&gt;")
+    return text
+
+
+def escape_attrib(value):
+    value = escape_text(value)
+    if '"' in value:
+        value = value.replace('"', "&quot;")
+    if "\r" in value:
+        value = value.replace("\r", "&#13;")
+    if "\n" in value:
+        value = value.replace("\n", "&#10;")
+    if "\t" in value:
+        value = value.replace("\t", "&#09;")
+    return value
+
+
+def _format_attribs(attrs):
+    return "".join(f' {key}="{escape_attrib(value)}"' for key, value in attrs)
+
+
+def serialize_element(elem):
+    """Element(ElementTree/lxml 공용)를 item 레코드 문자열로 변환"""
+    parts = []
+    _write_element(elem, parts)
+    return "".join(parts)
+
+
+def _write_element(elem, parts):
+    tag = elem.tag
+    parts.append("<" + tag + _format_attribs(elem.items()))
+    text = elem.text
+    if text or len(elem):
+        parts.append(">")
+        if text:
+            parts.append(escape_text(text))
+        for child in elem:
+            # lxml의 주석/처리 명령은 tag가 문자열이 아님
+            if isinstance(child.tag, str):
+                _write_element(child, parts)
+            if child.tail:
+                parts.append(escape_text(child.tail))
+        parts.append("</" + tag + ">")
+    else:
+        parts.append(" />")
+
+
+def serialize_mapping(tag, mapping):
+    """
+    JSON 응답의 item(dict)을 같은 형식의 item 레코드 문자열로 변환
+
+    빈 값(None, "")은 XML의 빈 요소와 같이 "<필드 />"로 씁니다.
+    """
+    parts = []
+    _write_value(tag, mapping, parts)
+    return "".join(parts)
+
+
+def _write_value(tag, value, parts):
+    if isinstance(value, list):
+        for element in value:
+            _write_value(tag, element, parts)
+        return
+    if value is None or value == "" or value == {}:
+        parts.append("<" + tag + " />")
+        return
+    parts.append("<" + tag + ">")
+    if isinstance(value, dict):
+        for key, child in value.items():
+            _write_value(key, child, parts)
+    else:
+        parts.append(escape_text(value if isinstance(value, str) else str(value)))
+    parts.append("</" + tag + ">")
+
+
+# ----------------------------------------------------------------------
+# 백엔드
+# ----------------------------------------------------------------------
+class EtreeItemParser:
+    """
+    ElementTree 풀 파서 백엔드
+
+    <item>이 닫히면 직렬화한 뒤 부모에서 떼어내므로,
+    응답 크기와 무관하게 트리에는 처리 중인 item 하나만 남습니다.
+    """
+
+    name = "etree"
+
+    def __init__(self, header=None):
+        self.header = {} if header is None else header
+        self._parser = self._create_parser()
+        self._stack = []
+        self._item_depth = 0
+
+    def _create_parser(self):
+        return ET.XMLPullParser(events=("start", "end"))
+
+    def _errors(self):
+        return (ET.ParseError,)
+
+    def feed(self, data):
+        """데이터 조각을 넣고 완성된 item 레코드 목록 반환"""
+        try:
+            self._parser.feed(data)
+            return self._drain()
+        except self._errors() as e:
+            raise ParseError(str(e)) from e
+
+    def close(self):
+        """입력 종료 후 남은 item 레코드 목록 반환"""
+        try:
+            self._parser.close()
+            return self._drain()
+        except self._errors() as e:
+            raise ParseError(str(e)) from e
+
+    def _drain(self):
+        items = []
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                self._stack.append(elem)
+                if elem.tag == "item":
+                    self._item_depth += 1
+                continue
+
+            self._stack.pop()
+            if elem.tag == "item":
+                self._item_depth -= 1
+                if self._item_depth == 0:
+                    items.append(self._serialize(elem))
+                    if self._stack:
+                        self._stack[-1].remove(elem)
+            elif self._item_depth == 0 and elem.tag in HEADER_FIELDS:
+                self.header[elem.tag] = elem.text
+        return items
+
+    def _serialize(self, elem):
+        return serialize_element(elem)
+
+
+class LxmlItemParser(EtreeItemParser):
+    """
+    lxml 풀 파서 백엔드 (C 구현 트리/직렬화)
+
+    item과 헤더 필드의 end 이벤트만 받고, 처리한 item과 앞선 형제를 지워 트리를 비웁니다.
+    lxml.etree.tostring 결과는 빈 요소 표기("<a/>")와 문자 참조("&#9;" 등)만
+    ElementTree와 다르므로, 빈 요소는 치환하고 문자 참조가 있으면 공용 직렬화를 씁니다.
+    """
+
+    name = "lxml"
+
+    def _create_parser(self):
+        return lxml_etree.XMLPullParser(
+            events=("end",), tag=("item",) + HEADER_FIELDS,
+            resolve_entities=False, huge_tree=True, remove_comments=True, remove_pis=True
+        )
+
+    def _errors(self):
+        return (lxml_etree.XMLSyntaxError,)
+
+    def _drain(self):
+        items = []
+        for _, elem in self._parser.read_events():
+            in_item = next(elem.iterancestors("item"), None) is not None
+            if elem.tag != "item":
+                if not in_item:
+                    self.header[elem.tag] = elem.text
+                continue
+            if in_item:
+                continue
+            items.append(self._serialize(elem))
+            elem.clear(keep_tail=False)
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+        return items
+
+    def _serialize(self, elem):
+        record = lxml_etree.tostring(elem, encoding="unicode", with_tail=False)
+        if "&#" in record:
+            return serialize_element(elem)
+        return record.replace("/>", " />")
+
+
+class ExpatItemParser:
+    """
+    expat 콜백 백엔드
+
+    트리를 만들지 않고 시작/문자/종료 콜백에서 item 레코드 문자열을 바로 조립합니다.
+    """
+
+    name = "expat"
+
+    def __init__(self, header=None):
+        self.header = {} if header is None else header
+        self._items = []
+        self._parts = None      # item 내부일 때만 리스트
+        self._depth = 0         # item 내부 깊이
+        self._pending = False   # 시작 태그의 ">"를 아직 쓰지 않음 (빈 요소 판별용)
+        self._field = None      # 읽는 중인 헤더 필드
+        self._field_text = []
+
+        parser = expat.ParserCreate()
+        parser.buffer_text = True
+        parser.ordered_attributes = True
+        parser.StartElementHandler = self._start
+        parser.EndElementHandler = self._end
+        parser.CharacterDataHandler = self._data
+        self._parser = parser
+
+    def feed(self, data):
+        return self._parse(data, False)
+
+    def close(self):
+        return self._parse(b"", True)
+
+    def _parse(self, data, final):
+        try:
+            self._parser.Parse(data, final)
+        except expat.ExpatError as e:
+            raise ParseError(str(e)) from e
+        items, self._items = self._items, []
+        return items
+
+    def _start(self, tag, attrs):
+        parts = self._parts
+        attribs = _format_attribs(zip(attrs[::2], attrs[1::2])) if attrs else ""
+        if parts is not None:
+            if self._pending:
+                parts.append(">")
+            parts.append("<" + tag + attribs)
+            self._pending = True
+            self._depth += 1
+        elif tag == "item":
+            self._parts = ["<item" + attribs]
+            self._pending = True
+            self._depth = 1
+        elif tag in HEADER_FIELDS:
+            self._field = tag
+            self._field_text = []
+
+    def _data(self, data):
+        parts = self._parts
+        if parts is not None:
+            if self._pending:
+                parts.append(">")
+                self._pending = False
+            parts.append(escape_text(data))
+        elif self._field is not None:
+            self._field_text.append(data)
+
+    def _end(self, tag):
+        parts = self._parts
+        if parts is not None:
+            if self._pending:
+                parts.append(" />")
+                self._pending = False
+            else:
+                parts.append("</" + tag + ">")
+            self._depth -= 1
+            if self._depth == 0:
+                self._items.append("".join(parts))
+                self._parts = None
+        elif tag == self._field:
+            self.header[tag] = "".join(self._field_text) or None
+            self._field = None
+
+
+BACKENDS = {
+    "etree": EtreeItemParser,
+    "expat": ExpatItemParser,
+}
+if lxml_etree is not None:
+    BACKENDS["lxml"] = LxmlItemParser
+
+# auto 선택 순서 (설치된 것 중 가장 빠른 백엔드)
+AUTO_ORDER = ("lxml", "expat", "etree")
+
+
+def resolve_backend(name=None):
+    """
+    백엔드 이름 확인 ("auto"/None이면 사용 가능한 가장 빠른 백엔드)
+
+    Raises:
+        ValueError: 알 수 없거나 설치되지 않은 백엔드
+    """
+    if not name or name == "auto":
+        return next(backend for backend in AUTO_ORDER if backend in BACKENDS)
+    if name not in BACKENDS:
+        raise ValueError(
+            f"사용할 수 없는 XML 파서: {name} (가능: {', '.join(sorted(BACKENDS))})"
+        )
+    return name
+
+
+def create_parser(name=None, header=None):
+    """백엔드 파서 인스턴스 생성 (header dict에 resultCode/resultMsg/totalCount 기록)"""
+    return BACKENDS[resolve_backend(name)](header)